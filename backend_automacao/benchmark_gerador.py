@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+benchmark_gerador.py — Sacristia Digital
+Mede o desempenho das rotinas de `gerador_datas.py` (sem rede, sem banco).
+
+Uso:
+    python benchmark_gerador.py
+    python benchmark_suite.py          # suíte com baseline e detecção de regressão
+"""
+
+import json
+import logging
+import os
+import tempfile
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+import formatos_saida as fs
+import gerador_datas as gd
+from calendario_colunar import CalendarioColunar
+
+logging.getLogger(gd.__name__).setLevel(logging.WARNING)
+
+
+# =============================================================================
+# UTILITÁRIOS
+# =============================================================================
+
+def _cronometrar(func, repeticoes: int = 5) -> float:
+    """Melhor tempo (s) entre `repeticoes` execuções de `func()`."""
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        func()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor
+
+
+def _linha(nome: str, segundos: float, n: int) -> None:
+    print(f"  {nome:<34} {segundos * 1e3:9.2f} ms  {n / segundos:14,.0f} ops/s")
+
+
+# =============================================================================
+# PÁSCOA — ESCALAR × VETORIZADO × TABELA
+# =============================================================================
+
+def benchmark_pascoa(repeticoes_intervalo: int = 3) -> None:
+    anos = list(range(gd.PASCOA_TABELA_INICIO, gd.PASCOA_TABELA_FIM + 1)) * repeticoes_intervalo
+    n = len(anos)
+    print(f"\nPáscoa — {n:,} anos")
+
+    _linha("escalar (Meeus)", _cronometrar(
+        lambda: [gd._calcular_pascoa_meeus(a) for a in anos]), n)
+    _linha("tabela pré-calculada", _cronometrar(
+        lambda: [gd.calcular_pascoa(a) for a in anos]), n)
+
+    if gd.np is None:
+        print("  vetorizado (NumPy)                 — NumPy não instalado")
+        return
+
+    arr = gd.np.array(anos)
+    _linha("vetorizado (NumPy)", _cronometrar(
+        lambda: gd.calcular_pascoa_vetorizado(arr)), n)
+
+    esperado = [gd._calcular_pascoa_meeus(a) for a in anos]
+    assert gd.calcular_pascoa_vetorizado(arr).astype(object).tolist() == esperado
+
+
+# =============================================================================
+# CONSULTA PONTUAL — liturgia_do_dia
+# =============================================================================
+
+def benchmark_liturgia_do_dia(ano: int = 2026) -> None:
+    datas = [date(ano, 1, 1) + timedelta(days=i) for i in range(365)] * 20
+    n = len(datas)
+    print(f"\nliturgia_do_dia — {n:,} consultas em {ano}")
+
+    gd._tabela_tempos.cache_clear()
+    inicio = time.perf_counter()
+    gd._tabela_tempos(ano)
+    print(f"  {'montagem da tabela (cache frio)':<34} {(time.perf_counter() - inicio) * 1e3:9.2f} ms")
+
+    consultar = gd.liturgia_do_dia
+    segundos = _cronometrar(lambda: [consultar(d) for d in datas])
+    _linha("consulta (cache quente)", segundos, n)
+    ns = segundos / n * 1e9
+    print(f"  {'por consulta':<34} {ns:9.0f} ns  {'OK (< 1 µs)' if ns < 1000 else 'ACIMA DE 1 µs'}")
+
+    segundos = _cronometrar(lambda: gd.gerar_calendario_liturgico(ano), repeticoes=3)
+    print(f"  {'referência: gerar o ano inteiro':<34} {segundos * 1e3:9.2f} ms")
+
+
+# =============================================================================
+# GERAÇÃO DO ANO — DOMINGOS × TODOS OS DIAS
+# =============================================================================
+
+def benchmark_gerar_ano(anos: range = range(2000, 2100)) -> None:
+    n = len(anos)
+    print(f"\ngerar_calendario_liturgico — {n} anos")
+
+    def todos_os_dias():
+        gd._tabela_tempos.cache_clear()        # sem aproveitar cache entre rodadas
+        for ano in anos:
+            gd.gerar_calendario_liturgico(ano, todos_os_dias=True)
+
+    domingos = _cronometrar(lambda: [gd.gerar_calendario_liturgico(a) for a in anos], 3)
+    completo = _cronometrar(todos_os_dias, 3)
+    _linha("domingos e festas", domingos, n)
+    _linha("todos os dias (férias incluídas)", completo, n)
+    print(f"  {'razão todos os dias / domingos':<34} {completo / domingos:9.2f}x")
+
+
+# =============================================================================
+# MEMÓRIA — LISTA DE DICTS × CALENDÁRIO COLUNAR
+# =============================================================================
+
+def _memoria_retida(construir) -> tuple[object, int]:
+    """(objeto, bytes alocados que continuam vivos após construir())."""
+    tracemalloc.start()
+    obj = construir()
+    atual, _pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return obj, atual
+
+
+def benchmark_memoria(anos: range = range(2000, 2100)) -> None:
+    print(f"\nMemória — {len(anos)} anos, todos os dias")
+
+    eventos = [e for a in anos for e in gd.gerar_calendario_liturgico(a, todos_os_dias=True)]
+    # Recarrega via JSON para que cada string seja um objeto próprio, como
+    # acontece ao ler o calendário de disco ou do banco.
+    texto = json.dumps(eventos, ensure_ascii=False)
+    del eventos
+
+    lista, bytes_lista = _memoria_retida(lambda: json.loads(texto))
+    cal, bytes_colunar = _memoria_retida(lambda: CalendarioColunar.de_eventos(lista))
+    assert cal.para_dicts() == lista
+
+    print(f"  {'lista de dicts':<34} {bytes_lista / 2**20:9.2f} MiB  ({len(lista):,} linhas)")
+    print(f"  {'CalendarioColunar':<34} {bytes_colunar / 2**20:9.2f} MiB  "
+          f"(colunas: {cal.tamanho_bytes() / 2**10:.0f} KiB)")
+    print(f"  {'redução':<34} {bytes_lista / bytes_colunar:9.1f}x")
+
+
+# =============================================================================
+# FORMATOS DE SAÍDA — TEMPO DE ESCRITA E TAMANHO
+# =============================================================================
+
+def benchmark_formatos(anos: range = range(2000, 2100)) -> None:
+    eventos = [e for a in anos for e in gd.gerar_calendario_liturgico(a, todos_os_dias=True)]
+    print(f"\nFormatos de saída — {len(eventos):,} eventos "
+          f"(JSON via {'orjson' if fs.orjson else 'msgspec' if fs.msgspec else 'json'})")
+
+    def json_original(caminho):
+        with open(caminho, "w", encoding="utf-8") as f:
+            json.dump(eventos, f, ensure_ascii=False, indent=2)
+
+    variantes = [
+        ("json.dump indent=2 (original)", "json", json_original),
+        ("json indent=2", "json", lambda c: _gravar(c, "json")),
+        ("json streaming", "json", lambda c: _gravar(c, "json", indent=False)),
+        ("ndjson", "ndjson", lambda c: _gravar(c, "ndjson")),
+        ("msgpack", "msgpack", lambda c: _gravar(c, "msgpack")),
+    ]
+
+    def _gravar(caminho, formato, **opcoes):
+        with fs.abrir_escritor(caminho, formato, **opcoes) as escritor:
+            escritor.escrever_varios(eventos)
+
+    with tempfile.TemporaryDirectory() as pasta:
+        for nome, formato, gravar in variantes:
+            if formato == "msgpack" and fs.msgpack is None:
+                print(f"  {nome:<34} — msgpack não instalado")
+                continue
+            caminho = os.path.join(pasta, "calendario" + fs.FORMATOS[formato])
+            segundos = _cronometrar(lambda: gravar(caminho), 3)
+            assert fs.carregar(caminho) == eventos
+            print(f"  {nome:<34} {segundos * 1e3:9.2f} ms  {os.path.getsize(caminho) / 2**20:8.2f} MiB")
+
+
+# =============================================================================
+# EXECUÇÃO
+# =============================================================================
+
+if __name__ == "__main__":
+    benchmark_pascoa()
+    benchmark_liturgia_do_dia()
+    benchmark_gerar_ano()
+    benchmark_memoria()
+    benchmark_formatos()
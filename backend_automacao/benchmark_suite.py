@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+benchmark_suite.py — Sacristia Digital
+Suíte de benchmarks com entradas fixas para `gerador_datas.py`, com baseline
+em JSON e detecção de regressão. Roda offline: o cliente do Supabase é
+substituído por um mock antes de importar o gerador.
+
+Entradas fixas: 1 ano, 100 anos, 8000 anos e anos de pior caso (Páscoa mais
+cedo possível, 22/mar, e mais tarde possível, 25/abr).
+
+Uso:
+    python benchmark_suite.py                    # compara com a baseline (cria se não existir)
+    python benchmark_suite.py --gravar-baseline  # sobrescreve a baseline
+    python benchmark_suite.py --limite=0.30      # tolerância de regressão (padrão 25%)
+
+Sai com código 1 se algum caso ficar mais lento (ops/s) ou usar mais memória
+(pico) do que a baseline além da tolerância.
+"""
+
+import json
+import logging
+import os
+import sys
+import time
+import tracemalloc
+import types
+from collections import deque
+from unittest import mock
+
+# -----------------------------------------------------------------------------
+# Supabase mockado: a suíte nunca abre conexão, mesmo sem o pacote instalado
+# -----------------------------------------------------------------------------
+for _modulo, _atributos in {
+    "supabase": {"create_client": None},
+    "dotenv": {"load_dotenv": lambda *a, **k: False},
+    "postgrest.types": {"ReturnMethod": mock.MagicMock(name="ReturnMethod")},
+}.items():
+    try:
+        __import__(_modulo)
+    except ImportError:
+        sys.modules[_modulo] = types.ModuleType(_modulo)
+        vars(sys.modules[_modulo]).update(_atributos)
+
+import gerador_datas as gd
+
+gd.create_client = mock.MagicMock(name="create_client")
+logging.getLogger(gd.__name__).setLevel(logging.WARNING)
+
+CAMINHO_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                "benchmark_baseline.json")
+LIMITE_PADRAO = 0.25
+
+
+# =============================================================================
+# ENTRADAS FIXAS
+# =============================================================================
+
+PASCOA_MAIS_CEDO = [1598, 1693, 1761, 1818, 2285]       # Páscoa em 22/mar
+PASCOA_MAIS_TARDE = [1666, 1734, 1886, 1943, 2038]      # Páscoa em 25/abr
+
+ENTRADAS = {
+    "1_ano":      [2026],
+    "100_anos":   list(range(2000, 2100)),
+    "8000_anos":  list(range(1583, 9583)),
+    "pior_caso":  PASCOA_MAIS_CEDO + PASCOA_MAIS_TARDE,
+}
+
+
+def _consumir(func, entradas) -> None:
+    """Aplica `func` a cada entrada descartando o resultado (o pico medido é por chamada)."""
+    deque(map(func, entradas), maxlen=0)
+
+
+def _titulos(anos: list[int]) -> list[str]:
+    return [e["santo_festa"] for a in anos for e in gd.gerar_calendario_liturgico(a)]
+
+
+def _casos() -> list[tuple[str, object, int, int]]:
+    """(nome, função sem argumentos, nº de operações, repetições)."""
+    casos = []
+    for rotulo, anos in ENTRADAS.items():
+        grande = len(anos) > 1000
+        casos += [
+            (f"calcular_pascoa/{rotulo}",
+             lambda anos=anos: _consumir(gd.calcular_pascoa, anos), len(anos), 5),
+            (f"calcular_marcos/{rotulo}",
+             lambda anos=anos: _consumir(gd.calcular_marcos, anos), len(anos), 3 if grande else 5),
+            (f"gerar_calendario_liturgico/{rotulo}",
+             lambda anos=anos: _consumir(gd.gerar_calendario_liturgico, anos),
+             len(anos), 1 if grande else 5),
+        ]
+        titulos = _titulos(anos)
+        casos.append((f"_extrair_semana_ordinal/{rotulo}",
+                      lambda t=titulos: _consumir(gd._extrair_semana_ordinal, t),
+                      len(titulos), 3 if grande else 5))
+    return casos
+
+
+# =============================================================================
+# MEDIÇÃO
+# =============================================================================
+
+def _medir(func, n: int, repeticoes: int) -> dict:
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        func()
+        melhor = min(melhor, time.perf_counter() - inicio)
+
+    # Pico de memória numa execução separada (tracemalloc distorce o tempo)
+    tracemalloc.start()
+    func()
+    _atual, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {"ops_por_s": n / melhor, "pico_bytes": pico, "n": n}
+
+
+def executar() -> dict[str, dict]:
+    resultados = {}
+    for nome, func, n, repeticoes in _casos():
+        resultados[nome] = r = _medir(func, n, repeticoes)
+        print(f"  {nome:<46} {r['ops_por_s']:14,.0f} ops/s  {r['pico_bytes'] / 1024:10,.1f} KiB")
+    return resultados
+
+
+def comparar(resultados: dict, baseline: dict, limite: float) -> list[str]:
+    """Lista as regressões em relação à baseline."""
+    regressoes = []
+    for nome, r in resultados.items():
+        base = baseline.get(nome)
+        if not base:
+            continue
+        if r["ops_por_s"] < base["ops_por_s"] * (1 - limite):
+            regressoes.append(f"{nome}: {r['ops_por_s']:,.0f} ops/s "
+                              f"(baseline {base['ops_por_s']:,.0f})")
+        if r["pico_bytes"] > base["pico_bytes"] * (1 + limite) + 4096:
+            regressoes.append(f"{nome}: pico {r['pico_bytes']:,} B "
+                              f"(baseline {base['pico_bytes']:,} B)")
+    return regressoes
+
+
+# =============================================================================
+# EXECUÇÃO
+# =============================================================================
+
+def main() -> int:
+    args = sys.argv[1:]
+    gravar = "--gravar-baseline" in args
+    limite = LIMITE_PADRAO
+    for arg in args:
+        if arg.startswith("--limite="):
+            limite = float(arg.split("=", 1)[1])
+
+    print("Suíte de benchmarks — gerador_datas")
+    resultados = executar()
+
+    if gravar or not os.path.exists(CAMINHO_BASELINE):
+        with open(CAMINHO_BASELINE, "w", encoding="utf-8") as f:
+            json.dump(resultados, f, indent=2)
+        print(f"\nBaseline gravada: {CAMINHO_BASELINE}")
+        return 0
+
+    with open(CAMINHO_BASELINE, encoding="utf-8") as f:
+        baseline = json.load(f)
+
+    regressoes = comparar(resultados, baseline, limite)
+    if regressoes:
+        print(f"\nREGRESSÃO (tolerância {limite:.0%}):")
+        for linha in regressoes:
+            print(f"  - {linha}")
+        return 1
+
+    print(f"\nSem regressões (tolerância {limite:.0%}).")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,207 @@
+"""
+calendario_colunar.py — Sacristia Digital
+Representação compacta (colunar) do calendário litúrgico para gerações em
+escala de séculos.
+
+Em vez de um dict de 7 chaves por evento, cada campo vira uma coluna:
+a data é um ordinal inteiro num `array('i')` e os textos repetidos (tempo,
+cor, grau, título) viram códigos categóricos apontando para um vocabulário
+único. As linhas só são materializadas sob demanda (visão preguiçosa) e a
+exportação devolve exatamente o formato de `gerar_calendario_liturgico()`.
+
+Os buffers aceitam o protocolo de buffer: `numpy.frombuffer(cal.ordinais,
+dtype="i4")` dá uma visão NumPy sem cópia.
+"""
+
+import json
+from array import array
+from datetime import date
+from typing import Iterable, Iterator
+
+from gerador_datas import gerar_calendario_liturgico, nome_dia
+from regras_liturgicas import REGRAS_PADRAO
+
+_SEM_SEMANA = -1          # semana_ordinal None
+
+
+# =============================================================================
+# VOCABULÁRIO CATEGÓRICO
+# =============================================================================
+
+class _Categoria:
+    """Mapeia textos repetidos para códigos inteiros pequenos."""
+
+    __slots__ = ("valores", "_indices")
+
+    def __init__(self):
+        self.valores: list = []
+        self._indices: dict = {}
+
+    def codificar(self, valor) -> int:
+        codigo = self._indices.get(valor)
+        if codigo is None:
+            codigo = self._indices[valor] = len(self.valores)
+            self.valores.append(valor)
+        return codigo
+
+
+# =============================================================================
+# CONTAINER COLUNAR
+# =============================================================================
+
+class CalendarioColunar:
+    """
+    Eventos litúrgicos em colunas (struct-of-arrays).
+
+        cal = CalendarioColunar.de_eventos(gerar_calendario_liturgico(2026))
+        cal[0].santo_festa          # visão preguiçosa da linha 0
+        cal.para_dicts()            # formato original (lista de dicts)
+    """
+
+    __slots__ = ("ordinais", "semanas", "cod_tempo", "cod_cor", "cod_grau",
+                 "cod_titulo", "tempos", "cores", "graus", "titulos")
+
+    def __init__(self):
+        self.ordinais = array("i")          # date.toordinal()
+        self.semanas = array("b")           # semana_ordinal, -1 = None
+        self.cod_tempo = array("B")
+        self.cod_cor = array("B")
+        self.cod_grau = array("B")
+        self.cod_titulo = array("H")
+        self.tempos = _Categoria()
+        self.cores = _Categoria()
+        self.graus = _Categoria()
+        self.titulos = _Categoria()
+
+    @classmethod
+    def de_eventos(cls, eventos: Iterable[dict]) -> "CalendarioColunar":
+        cal = cls()
+        cal.estender(eventos)
+        return cal
+
+    @classmethod
+    def gerar(cls, anos: Iterable[int], todos_os_dias: bool = False,
+              regras: str = REGRAS_PADRAO) -> "CalendarioColunar":
+        """Gera vários anos direto no formato colunar, um ano por vez."""
+        cal = cls()
+        for ano in anos:
+            cal.estender(gerar_calendario_liturgico(ano, todos_os_dias, regras))
+        return cal
+
+    def estender(self, eventos: Iterable[dict]) -> None:
+        for evento in eventos:
+            self.adicionar(evento)
+
+    def adicionar(self, evento: dict) -> None:
+        semana = evento["semana_ordinal"]
+        self.ordinais.append(date.fromisoformat(evento["data_calendario"]).toordinal())
+        self.semanas.append(_SEM_SEMANA if semana is None else semana)
+        self.cod_tempo.append(self.tempos.codificar(evento["tempo_liturgico"]))
+        self.cod_cor.append(self.cores.codificar(evento["cor"]))
+        self.cod_grau.append(self.graus.codificar(evento["grau"]))
+        self.cod_titulo.append(self.titulos.codificar(evento["santo_festa"]))
+
+    # -------------------------------------------------------------------------
+    # Acesso
+    # -------------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self.ordinais)
+
+    def __getitem__(self, i: int) -> "LinhaCalendario":
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("índice fora do calendário")
+        return LinhaCalendario(self, i)
+
+    def __iter__(self) -> Iterator["LinhaCalendario"]:
+        return (LinhaCalendario(self, i) for i in range(len(self)))
+
+    def tamanho_bytes(self) -> int:
+        """Bytes ocupados pelos buffers das colunas (sem o vocabulário)."""
+        return sum(col.itemsize * len(col) for col in (
+            self.ordinais, self.semanas, self.cod_tempo,
+            self.cod_cor, self.cod_grau, self.cod_titulo))
+
+    # -------------------------------------------------------------------------
+    # Exportação (formato de gerar_calendario_liturgico)
+    # -------------------------------------------------------------------------
+
+    def iter_dicts(self) -> Iterator[dict]:
+        for i in range(len(self)):
+            yield self._dict(i)
+
+    def para_dicts(self) -> list[dict]:
+        return list(self.iter_dicts())
+
+    def salvar_json(self, caminho: str) -> str:
+        with open(caminho, "w", encoding="utf-8") as f:
+            json.dump(self.para_dicts(), f, ensure_ascii=False, indent=2)
+        return caminho
+
+    def _dict(self, i: int) -> dict:
+        data_obj = date.fromordinal(self.ordinais[i])
+        semana = self.semanas[i]
+        return {
+            "data_calendario": data_obj.isoformat(),
+            "dia_semana":      nome_dia(data_obj),
+            "santo_festa":     self.titulos.valores[self.cod_titulo[i]],
+            "grau":            self.graus.valores[self.cod_grau[i]],
+            "cor":             self.cores.valores[self.cod_cor[i]],
+            "tempo_liturgico": self.tempos.valores[self.cod_tempo[i]],
+            "semana_ordinal":  None if semana == _SEM_SEMANA else semana,
+        }
+
+
+# =============================================================================
+# VISÃO PREGUIÇOSA DE UMA LINHA
+# =============================================================================
+
+class LinhaCalendario:
+    """Linha `i` do calendário; cada campo é decodificado só quando lido."""
+
+    __slots__ = ("_cal", "_i")
+
+    def __init__(self, cal: CalendarioColunar, i: int):
+        self._cal = cal
+        self._i = i
+
+    @property
+    def data(self) -> date:
+        return date.fromordinal(self._cal.ordinais[self._i])
+
+    @property
+    def data_calendario(self) -> str:
+        return self.data.isoformat()
+
+    @property
+    def dia_semana(self) -> str:
+        return nome_dia(self.data)
+
+    @property
+    def santo_festa(self) -> str:
+        return self._cal.titulos.valores[self._cal.cod_titulo[self._i]]
+
+    @property
+    def grau(self) -> str:
+        return self._cal.graus.valores[self._cal.cod_grau[self._i]]
+
+    @property
+    def cor(self) -> str:
+        return self._cal.cores.valores[self._cal.cod_cor[self._i]]
+
+    @property
+    def tempo_liturgico(self) -> str:
+        return self._cal.tempos.valores[self._cal.cod_tempo[self._i]]
+
+    @property
+    def semana_ordinal(self) -> int | None:
+        semana = self._cal.semanas[self._i]
+        return None if semana == _SEM_SEMANA else semana
+
+    def para_dict(self) -> dict:
+        return self._cal._dict(self._i)
+
+    def __repr__(self) -> str:
+        return f"LinhaCalendario({self.data_calendario}, {self.santo_festa!r})"
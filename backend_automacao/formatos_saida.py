@@ -0,0 +1,175 @@
+"""
+formatos_saida.py — Sacristia Digital
+Escritores plugáveis para a saída local do calendário litúrgico e um
+carregador comum que lê qualquer um deles de volta.
+
+Formatos:
+    json     lista JSON (indent=2 por padrão, compatível com a saída original)
+    ndjson   um evento por linha, gravado à medida que é produzido
+    msgpack  sequência binária MessagePack (requer `pip install msgpack`)
+
+A serialização JSON usa orjson ou msgspec quando instalados e cai no módulo
+`json` da biblioteca padrão caso contrário.
+"""
+
+import json
+import os
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+FORMATOS = {"json": ".json", "ndjson": ".ndjson", "msgpack": ".msgpack"}
+
+
+# =============================================================================
+# SERIALIZAÇÃO JSON (CAMINHO RÁPIDO OPCIONAL)
+# =============================================================================
+
+def _json_bytes(obj, indent: bool = False) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    if msgspec is not None:
+        dados = msgspec.json.encode(obj)
+        return msgspec.json.format(dados, indent=2) if indent else dados
+    if indent:
+        return json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _json_carregar(dados: bytes):
+    if orjson is not None:
+        return orjson.loads(dados)
+    if msgspec is not None:
+        return msgspec.json.decode(dados)
+    return json.loads(dados)
+
+
+# =============================================================================
+# ESCRITORES
+# =============================================================================
+
+class _Escritor:
+    """Base: `with Escritor(caminho) as w: w.escrever(evento)`."""
+
+    def __init__(self, caminho: str):
+        self.caminho = caminho
+        self.total = 0
+        self._arquivo = open(caminho, "wb")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.fechar()
+
+    def escrever_varios(self, eventos) -> None:
+        for evento in eventos:
+            self.escrever(evento)
+
+    def escrever(self, evento: dict) -> None:
+        raise NotImplementedError
+
+    def fechar(self) -> None:
+        self._arquivo.close()
+
+
+class EscritorJSON(_Escritor):
+    """
+    Lista JSON. Com `indent=True` acumula e grava no fechamento (mesmo layout
+    de `json.dump(..., indent=2)`); com `indent=False` grava em streaming,
+    um evento por linha dentro do array.
+    """
+
+    def __init__(self, caminho: str, indent: bool = True):
+        super().__init__(caminho)
+        self.indent = indent
+        self._eventos: list[dict] = []
+        if not indent:
+            self._arquivo.write(b"[")
+
+    def escrever(self, evento: dict) -> None:
+        if self.indent:
+            self._eventos.append(evento)
+        else:
+            self._arquivo.write(b",\n" if self.total else b"\n")
+            self._arquivo.write(_json_bytes(evento))
+        self.total += 1
+
+    def fechar(self) -> None:
+        if self._arquivo.closed:
+            return
+        if self.indent:
+            self._arquivo.write(_json_bytes(self._eventos, indent=True))
+        else:
+            self._arquivo.write(b"\n]\n")
+        super().fechar()
+
+
+class EscritorNDJSON(_Escritor):
+    """Um objeto JSON por linha, gravado assim que o evento chega."""
+
+    def escrever(self, evento: dict) -> None:
+        self._arquivo.write(_json_bytes(evento))
+        self._arquivo.write(b"\n")
+        self.total += 1
+
+
+class EscritorMsgPack(_Escritor):
+    """Sequência de mapas MessagePack concatenados (lida com `msgpack.Unpacker`)."""
+
+    def __init__(self, caminho: str):
+        if msgpack is None:
+            raise ImportError("O formato msgpack requer o pacote msgpack (pip install msgpack)")
+        super().__init__(caminho)
+        self._packer = msgpack.Packer()
+
+    def escrever(self, evento: dict) -> None:
+        self._arquivo.write(self._packer.pack(evento))
+        self.total += 1
+
+
+def abrir_escritor(caminho: str, formato: str = "json", **opcoes) -> _Escritor:
+    if formato == "json":
+        return EscritorJSON(caminho, **opcoes)
+    if formato == "ndjson":
+        return EscritorNDJSON(caminho)
+    if formato == "msgpack":
+        return EscritorMsgPack(caminho)
+    raise ValueError(f"Formato desconhecido: {formato!r} (use {', '.join(FORMATOS)})")
+
+
+# =============================================================================
+# CARREGADOR COMUM
+# =============================================================================
+
+def formato_do_arquivo(caminho: str) -> str:
+    extensao = os.path.splitext(caminho)[1].lower()
+    for formato, ext in FORMATOS.items():
+        if ext == extensao:
+            return formato
+    raise ValueError(f"Extensão não reconhecida: {caminho}")
+
+
+def carregar(caminho: str) -> list[dict]:
+    """Lê de volta qualquer arquivo gravado pelos escritores acima."""
+    formato = formato_do_arquivo(caminho)
+    with open(caminho, "rb") as f:
+        if formato == "json":
+            return _json_carregar(f.read())
+        if formato == "ndjson":
+            return [_json_carregar(linha) for linha in f if linha.strip()]
+        if msgpack is None:
+            raise ImportError("O formato msgpack requer o pacote msgpack (pip install msgpack)")
+        return list(msgpack.Unpacker(f, raw=False))
@@ -8,39 +8,64 @@ Uso:
     python gerador_datas.py              # gera para o ANO SEGUINTE (padrão)
     python gerador_datas.py 2027         # gera para o ano especificado
     python gerador_datas.py 2027 --dry-run  # só gera JSON, não insere no banco
+    python gerador_datas.py 2025-2100 --dry-run  # intervalo em paralelo (todos os núcleos)
+    python gerador_datas.py 2027 --todos-os-dias # um registro por dia, férias incluídas
+    python gerador_datas.py 2027 --diff          # envia só linhas novas/alteradas
+    python gerador_datas.py 2025-2100 --formato=ndjson  # json | ndjson | msgpack
+    python gerador_datas.py 2027 --regras=romano_geral  # variante de regras_liturgicas.json
 """
 
+import hashlib
 import json
 import sys
 import re
 import os
+import time
 import logging
+from bisect import bisect_right
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
 from datetime import date, timedelta, datetime
+from functools import lru_cache, partial
+from typing import Iterator, NamedTuple
 
 from dotenv import load_dotenv
+from formatos_saida import FORMATOS, abrir_escritor
+from postgrest.types import ReturnMethod
+from regras_liturgicas import REGRAS_PADRAO, carregar_regras, festas_do_ano, variantes_disponiveis
 from supabase import create_client
 
+try:
+    import numpy as np
+except ImportError:          # NumPy é opcional: só o cálculo em lote depende dele
+    np = None
+
 # =============================================================================
 # CONFIGURAÇÃO
 # =============================================================================
 
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s [%(levelname)s] %(message)s",
-    handlers=[
-        logging.FileHandler("gerador_datas.log", encoding="utf-8"),
-        logging.StreamHandler(),
-    ],
-)
 log = logging.getLogger(__name__)
 
-load_dotenv()
+
+def _configurar_ambiente() -> None:
+    """
+    Configura logging e carrega o .env — uma única vez, no processo principal.
+    Os workers do modo intervalo não repetem esse custo por ano.
+    """
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(message)s",
+        handlers=[
+            logging.FileHandler("gerador_datas.log", encoding="utf-8"),
+            logging.StreamHandler(),
+        ],
+    )
+    load_dotenv()
 
 # =============================================================================
 # ALGORITMO DE COMPUTUS — PÁSCOA (Meeus/Jones/Butcher)
 # =============================================================================
 
-def calcular_pascoa(ano: int) -> date:
+def _calcular_pascoa_meeus(ano: int) -> date:
     """Calcula a data da Páscoa pelo algoritmo de Meeus/Jones/Butcher."""
     a = ano % 19
     b = ano // 100
@@ -59,23 +84,100 @@ def calcular_pascoa(ano: int) -> date:
     return date(ano, month, day)
 
 
+def calcular_pascoa_vetorizado(anos) -> "np.ndarray":
+    """
+    Mesmo algoritmo de `_calcular_pascoa_meeus`, aplicado a um array inteiro
+    de anos numa única passada de aritmética inteira NumPy.
+    Retorna um array `datetime64[D]` com a Páscoa de cada ano.
+    """
+    if np is None:
+        raise ImportError("calcular_pascoa_vetorizado requer NumPy (pip install numpy)")
+
+    ano = np.asarray(anos, dtype=np.int64)
+    a = ano % 19
+    b = ano // 100
+    c = ano % 100
+    d = b // 4
+    e = b % 4
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i = c // 4
+    k = c % 4
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    # Dias após 22/mar: 22/mar + n cobre todo o intervalo possível (22/mar–25/abr)
+    n = h + l - 7 * m
+    marco22 = (ano - 1970).astype("datetime64[Y]").astype("datetime64[D]") + 80
+    bissexto = (ano % 4 == 0) & ((ano % 100 != 0) | (ano % 400 == 0))
+    return marco22 + bissexto + n
+
+
+# -----------------------------------------------------------------------------
+# Tabela pré-calculada (1583–9999): um byte por ano com o deslocamento da
+# Páscoa em dias após 22 de março. Regenerar com gerar_tabela_pascoa().
+# -----------------------------------------------------------------------------
+
+PASCOA_TABELA_INICIO = 1583
+PASCOA_TABELA_FIM = 9999
+_CAMINHO_TABELA_PASCOA = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                      "tabela_pascoa.bin")
+
+
+def gerar_tabela_pascoa(caminho: str = _CAMINHO_TABELA_PASCOA) -> str:
+    """Grava a tabela de Páscoa 1583–9999 que acompanha o módulo."""
+    anos = range(PASCOA_TABELA_INICIO, PASCOA_TABELA_FIM + 1)
+    deslocamentos = bytes((_calcular_pascoa_meeus(ano) - date(ano, 3, 22)).days
+                          for ano in anos)
+    with open(caminho, "wb") as f:
+        f.write(deslocamentos)
+    return caminho
+
+
+@lru_cache(maxsize=1)
+def _tabela_pascoa() -> bytes:
+    try:
+        with open(_CAMINHO_TABELA_PASCOA, "rb") as f:
+            tabela = f.read()
+    except OSError:
+        return b""
+    return tabela if len(tabela) == PASCOA_TABELA_FIM - PASCOA_TABELA_INICIO + 1 else b""
+
+
+def calcular_pascoa(ano: int) -> date:
+    """
+    Data da Páscoa. Dentro de 1583–9999 é uma consulta à tabela pré-calculada;
+    fora dela (ou sem o arquivo) cai no cálculo de Meeus/Jones/Butcher.
+    """
+    tabela = _tabela_pascoa()
+    if tabela and PASCOA_TABELA_INICIO <= ano <= PASCOA_TABELA_FIM:
+        n = tabela[ano - PASCOA_TABELA_INICIO]
+        return date(ano, 3, 22 + n) if n < 10 else date(ano, 4, n - 9)
+    return _calcular_pascoa_meeus(ano)
+
+
 # =============================================================================
 # DATAS LITÚRGICAS DINÂMICAS
 # =============================================================================
 
-def calcular_marcos(ano: int) -> dict:
+def calcular_marcos(ano: int, regras: str = REGRAS_PADRAO) -> dict:
     """
     Calcula todos os marcos litúrgicos variáveis do ano.
     Nenhuma data é hardcoded — tudo é derivado da Páscoa ou de regras fixas.
+    A variante de `regras` decide se a Epifania vai para o domingo.
     """
     pascoa = calcular_pascoa(ano)
 
-    # Epifânia (Brasil): 1º domingo entre 2 e 8 de janeiro
-    jan2 = date(ano, 1, 2)
-    epifania = jan2 + timedelta(days=(6 - jan2.weekday()) % 7)
-
-    # Batismo do Senhor: domingo seguinte à Epifânia
-    batismo_senhor = epifania + timedelta(days=7)
+    if carregar_regras(regras).epifania == "domingo":
+        # Epifânia (Brasil): 1º domingo entre 2 e 8 de janeiro
+        jan2 = date(ano, 1, 2)
+        epifania = jan2 + timedelta(days=(6 - jan2.weekday()) % 7)
+        # Batismo do Senhor: domingo seguinte à Epifânia
+        batismo_senhor = epifania + timedelta(days=7)
+    else:
+        # Epifania em 6 de janeiro; Batismo no domingo seguinte
+        epifania = date(ano, 1, 6)
+        batismo_senhor = epifania + timedelta(days=7 - (epifania.weekday() + 1) % 7)
 
     # 1º Domingo do Advento: último domingo em ou antes de 3 de dezembro
     dec3 = date(ano, 12, 3)
@@ -114,15 +216,22 @@ def nome_dia(data_obj: date) -> str:
 # GERADOR PRINCIPAL
 # =============================================================================
 
-def gerar_calendario_liturgico(ano: int) -> list[dict]:
+def gerar_calendario_liturgico(ano: int, todos_os_dias: bool = False,
+                               regras: str = REGRAS_PADRAO) -> list[dict]:
     """
     Gera todos os eventos litúrgicos do ano informado.
     Retorna lista de dicts prontos para UPSERT em `liturgia_diaria`.
+    Com `todos_os_dias=True` inclui também as férias (um registro por dia).
+    `regras` é a variante de `regras_liturgicas.json` (nacional, diocesana...).
     """
-    marcos = calcular_marcos(ano)
+    if todos_os_dias:
+        eventos = _gerar_todos_os_dias(ano, regras)
+        log.info("Total de dias gerados para %d: %d", ano, len(eventos))
+        return eventos
+
+    marcos = calcular_marcos(ano, regras)
     pascoa          = marcos["pascoa"]
     cinzas          = marcos["cinzas"]
-    epifania        = marcos["epifania"]
     batismo_senhor  = marcos["batismo_senhor"]
     advento_inicio  = marcos["advento_inicio"]
 
@@ -130,69 +239,25 @@ def gerar_calendario_liturgico(ano: int) -> list[dict]:
     datas_ocupadas: set = set()
 
     # -------------------------------------------------------------------------
-    # 1. DATAS MÓVEIS (relativas à Páscoa)
+    # 1. FESTAS E SOLENIDADES (tabela de regras, conflitos já resolvidos)
     # -------------------------------------------------------------------------
-    datas_moveis = [
-        {"delta": -46, "titulo": "Quarta-feira de Cinzas",              "grau": "Início da Quaresma", "cor": "Roxo",     "tempo": "Quaresma"},
-        {"delta": -7,  "titulo": "Domingo de Ramos",                    "grau": "Solenidade",         "cor": "Vermelho", "tempo": "Semana Santa"},
-        {"delta": -3,  "titulo": "Quinta-feira Santa — Ceia do Senhor", "grau": "Tríduo Pascal",      "cor": "Branco",   "tempo": "Tríduo Pascal"},
-        {"delta": -2,  "titulo": "Sexta-feira Santa — Paixão do Senhor","grau": "Solenidade",         "cor": "Vermelho", "tempo": "Tríduo Pascal"},
-        {"delta": -1,  "titulo": "Sábado Santo — Vigília Pascal",       "grau": "Solenidade",         "cor": "Branco",   "tempo": "Tríduo Pascal"},
-        {"delta":  0,  "titulo": "Domingo de Páscoa",                   "grau": "Solenidade",         "cor": "Branco",   "tempo": "Tempo Pascal"},
-        {"delta": 49,  "titulo": "Pentecostes",                         "grau": "Solenidade",         "cor": "Vermelho", "tempo": "Tempo Pascal"},
-        {"delta": 56,  "titulo": "Santíssima Trindade",                 "grau": "Solenidade",         "cor": "Branco",   "tempo": "Tempo Comum"},
-        {"delta": 60,  "titulo": "Corpus Christi",                      "grau": "Solenidade",         "cor": "Branco",   "tempo": "Tempo Comum"},
-        {"delta": 68,  "titulo": "Sagrado Coração de Jesus",            "grau": "Solenidade",         "cor": "Branco",   "tempo": "Tempo Comum"},
-    ]
-
-    for item in datas_moveis:
-        data_evento = pascoa + timedelta(days=item["delta"])
-        _adicionar(eventos, datas_ocupadas, data_evento, item["titulo"],
-                   item["grau"], item["cor"], item["tempo"])
+    for data_evento, (titulo, grau, cor, tempo) in festas_do_ano(carregar_regras(regras), ano, marcos):
+        _adicionar(eventos, datas_ocupadas, data_evento, titulo, grau, cor, tempo)
 
     # -------------------------------------------------------------------------
-    # 2. DATAS FIXAS
+    # 2. DOMINGOS DO ANO (preenchimento pelo tempo litúrgico)
     # -------------------------------------------------------------------------
-    datas_fixas = [
-        {"mes": 1,  "dia": 1,  "titulo": "Santa Maria, Mãe de Deus",                     "grau": "Solenidade", "cor": "Branco",         "tempo": "Tempo do Natal"},
-        {"mes": 10, "dia": 12, "titulo": "Nossa Senhora Aparecida",                       "grau": "Solenidade", "cor": "Branco",         "tempo": "Tempo Comum"},
-        {"mes": 11, "dia": 1,  "titulo": "Todos os Santos",                               "grau": "Solenidade", "cor": "Branco",         "tempo": "Tempo Comum"},
-        {"mes": 11, "dia": 2,  "titulo": "Comemoração de Todos os Fiéis Defuntos",        "grau": "Memória",    "cor": "Roxo/Preto",     "tempo": "Tempo Comum"},
-        {"mes": 12, "dia": 8,  "titulo": "Imaculada Conceição da Bem-Aventurada Virgem",  "grau": "Solenidade", "cor": "Branco",         "tempo": "Advento"},
-        {"mes": 12, "dia": 25, "titulo": "Natal do Senhor",                               "grau": "Solenidade", "cor": "Branco",         "tempo": "Tempo do Natal"},
-    ]
+    jan1 = date(ano, 1, 1)
+    primeiro_domingo = jan1 + timedelta(days=(6 - jan1.weekday()) % 7)
 
-    for item in datas_fixas:
-        data_evento = date(ano, item["mes"], item["dia"])
-        _adicionar(eventos, datas_ocupadas, data_evento, item["titulo"],
-                   item["grau"], item["cor"], item["tempo"])
-
-    # -------------------------------------------------------------------------
-    # 3. EPIFÂNIA E BATISMO DO SENHOR (calculados dinamicamente)
-    # -------------------------------------------------------------------------
-    _adicionar(eventos, datas_ocupadas, epifania,
-               "Epifania do Senhor", "Solenidade", "Branco", "Tempo do Natal")
-
-    _adicionar(eventos, datas_ocupadas, batismo_senhor,
-               "Batismo do Senhor", "Festa", "Branco", "Tempo do Natal")
-
-    # -------------------------------------------------------------------------
-    # 4. DOMINGOS DO ANO (preenchimento pelo tempo litúrgico)
-    # -------------------------------------------------------------------------
-    data_atual = date(ano, 1, 1)
-    fim_ano    = date(ano, 12, 31)
-
-    while data_atual <= fim_ano:
-        iso = data_atual.isoformat()
-
-        if data_atual.weekday() == 6 and iso not in datas_ocupadas:
+    for ordinal in range(primeiro_domingo.toordinal(), date(ano, 12, 31).toordinal() + 1, 7):
+        data_atual = date.fromordinal(ordinal)
+        if data_atual.isoformat() not in datas_ocupadas:
             titulo, cor, tempo, grau = _classificar_domingo(
                 data_atual, pascoa, cinzas, batismo_senhor, advento_inicio
             )
             _adicionar(eventos, datas_ocupadas, data_atual, titulo, grau, cor, tempo)
 
-        data_atual += timedelta(days=1)
-
     eventos.sort(key=lambda x: x["data_calendario"])
     log.info("Total de eventos gerados para %d: %d", ano, len(eventos))
     return eventos
@@ -238,17 +303,15 @@ def _classificar_domingo(data_obj, pascoa, cinzas, batismo_senhor, advento_inici
         n = ((data_obj - batismo_senhor).days // 7) + 1
         return f"{n}º Domingo do Tempo Comum", "Verde", "Tempo Comum", grau
 
-    # Quaresma (Cinzas até Páscoa — exclusive)
+    # Quaresma (Cinzas até Páscoa — exclusive); 1º Domingo = Cinzas + 4
     if cinzas < data_obj < pascoa:
-        n = (data_obj - cinzas).days // 7
+        n = (data_obj - cinzas).days // 7 + 1
         cor = "Rosa/Roxo" if n == 4 else "Roxo"     # 4º Dom = Laetare
         return f"{n}º Domingo da Quaresma", cor, "Quaresma", grau
 
     # Tempo Pascal (Páscoa até Pentecostes — exclusive)
     if pascoa < data_obj < (pascoa + timedelta(days=49)):
         n = ((data_obj - pascoa).days // 7) + 1
-        if n == 7:                                   # Ascensão (movida para domingo no Brasil)
-            return "Ascensão do Senhor", "Branco", "Tempo Pascal", "Solenidade"
         return f"{n}º Domingo da Páscoa", "Branco", "Tempo Pascal", grau
 
     # Tempo Comum — Parte 2 (Pentecostes até Advento)
@@ -256,9 +319,13 @@ def _classificar_domingo(data_obj, pascoa, cinzas, batismo_senhor, advento_inici
         if data_obj == advento_inicio - timedelta(days=7):   # Cristo Rei
             return "Nosso Senhor Jesus Cristo, Rei do Universo", "Branco", "Tempo Comum", "Solenidade"
         semanas_ate_advento = (advento_inicio - data_obj).days // 7
-        n = 34 - semanas_ate_advento
+        n = 35 - semanas_ate_advento                 # Cristo Rei = 34º
         return f"{n}º Domingo do Tempo Comum", "Verde", "Tempo Comum", grau
 
+    # Tempo do Natal (após 25 dez)
+    if data_obj > date(data_obj.year, 12, 25):
+        return "Domingo do Tempo de Natal", "Branco", "Tempo do Natal", grau
+
     # Advento
     if data_obj >= advento_inicio:
         n = ((data_obj - advento_inicio).days // 7) + 1
@@ -269,14 +336,163 @@ def _classificar_domingo(data_obj, pascoa, cinzas, batismo_senhor, advento_inici
 
 
 # =============================================================================
-# PERSISTÊNCIA — SUPABASE
+# CONSULTA PONTUAL — LITURGIA DE UMA DATA
 # =============================================================================
 
-def inserir_no_supabase(eventos: list[dict]) -> None:
+class InfoLiturgica(NamedTuple):
+    """Tempo, cor e semana de um dia. Imutável: as instâncias são compartilhadas pelo cache."""
+    tempo_liturgico: str
+    cor: str
+    semana_ordinal: int | None
+    santo_festa: str | None
+    grau: str
+
+
+def _intervalos_tempo(ano: int, marcos: dict) -> list[tuple]:
     """
-    Faz UPSERT em lotes na tabela `liturgia_diaria`.
-    Idempotente: reexecutar não duplica registros.
+    Tempos litúrgicos do ano como intervalos: (início, tempo, cor, âncora, base).
+    A semana de um dia `d` do intervalo é `(d - âncora) // 7 + base`; a âncora é
+    sempre um domingo e `âncora=None` indica tempo sem numeração de semanas.
+    """
+    pascoa = marcos["pascoa"]
+    cinzas = marcos["cinzas"]
+    advento = marcos["advento_inicio"]
+    batismo = marcos["batismo_senhor"]
+    return [
+        (date(ano, 1, 1),               "Tempo do Natal", "Branco", None, 0),
+        (batismo + timedelta(days=1),   "Tempo Comum",    "Verde",  batismo, 1),
+        (cinzas,                        "Quaresma",       "Roxo",   cinzas - timedelta(days=3), 0),
+        (pascoa - timedelta(days=7),    "Semana Santa",   "Roxo",   None, 0),
+        (pascoa - timedelta(days=3),    "Tríduo Pascal",  "Branco", None, 0),
+        (pascoa,                        "Tempo Pascal",   "Branco", pascoa, 1),
+        (pascoa + timedelta(days=50),   "Tempo Comum",    "Verde",  advento - timedelta(weeks=35), 0),
+        (advento,                       "Advento",        "Roxo",   advento, 1),
+        (date(ano, 12, 25),             "Tempo do Natal", "Branco", None, 0),
+    ]
+
+
+def _festas_do_ano(ano: int, marcos: dict, regras: str) -> dict[date, InfoLiturgica]:
+    """Festas e solenidades do ano, com a mesma precedência de `gerar_calendario_liturgico`."""
+    return {
+        data_obj: InfoLiturgica(tempo, cor, _extrair_semana_ordinal(titulo), titulo, grau)
+        for data_obj, (titulo, grau, cor, tempo) in festas_do_ano(carregar_regras(regras), ano, marcos)
+    }
+
+
+@lru_cache(maxsize=128)
+def _tabela_tempos(ano: int, regras: str = REGRAS_PADRAO) -> tuple[list[int], list[InfoLiturgica]]:
+    """
+    Fronteiras do ano em ordinais (início de cada trecho constante) e a
+    InfoLiturgica de cada trecho. Só os dias em que algo pode mudar — início de
+    tempo, domingo, segunda-feira, festa e o dia seguinte a ela — são avaliados.
+    """
+    marcos = calcular_marcos(ano, regras)
+    intervalos = _intervalos_tempo(ano, marcos)
+    inicios_tempo = [i[0] for i in intervalos]
+    festas = _festas_do_ano(ano, marcos, regras)
+
+    jan1 = date(ano, 1, 1)
+    primeiro_domingo = jan1 + timedelta(days=(6 - jan1.weekday()) % 7)
+    fronteiras = set(inicios_tempo) | {jan1}
+    for domingo in range(primeiro_domingo.toordinal(), date(ano, 12, 31).toordinal() + 1, 7):
+        fronteiras.update((date.fromordinal(domingo), date.fromordinal(domingo + 1)))
+    for data_obj in festas:
+        fronteiras.update((data_obj, data_obj + timedelta(days=1)))
+
+    inicios: list[int] = []
+    infos: list[InfoLiturgica] = []
+    for data_obj in sorted(d for d in fronteiras if d.year == ano):
+        info = festas.get(data_obj)
+        if info is None:
+            inicio, tempo, cor, ancora, base = intervalos[bisect_right(inicios_tempo, data_obj) - 1]
+            if data_obj.weekday() == 6:
+                titulo, cor, tempo, grau = _classificar_domingo(
+                    data_obj, marcos["pascoa"], marcos["cinzas"],
+                    marcos["batismo_senhor"], marcos["advento_inicio"])
+                info = InfoLiturgica(tempo, cor, _extrair_semana_ordinal(titulo), titulo, grau)
+            else:
+                semana = (data_obj - ancora).days // 7 + base if ancora else None
+                info = InfoLiturgica(tempo, cor, semana, None, "Féria")
+        if not infos or infos[-1] != info:
+            inicios.append(data_obj.toordinal())
+            infos.append(info)
+    return inicios, infos
+
+
+def liturgia_do_dia(data_obj: date, regras: str = REGRAS_PADRAO) -> InfoLiturgica:
     """
+    Tempo litúrgico, cor, semana e (se houver) festa de uma única data, sem
+    gerar o ano inteiro: busca binária nas fronteiras do ano, que ficam em
+    cache LRU (128 anos). Com o ano em cache a consulta fica abaixo de 1 µs.
+    """
+    inicios, infos = _tabela_tempos(data_obj.year, regras)
+    return infos[bisect_right(inicios, data_obj.toordinal()) - 1]
+
+
+# =============================================================================
+# ANO COMPLETO — TODOS OS DIAS (FÉRIAS INCLUSIVE)
+# =============================================================================
+
+_SUFIXO_TEMPO = {
+    "Tempo do Natal": "do Tempo do Natal",
+    "Tempo Comum":    "do Tempo Comum",
+    "Quaresma":       "da Quaresma",
+    "Semana Santa":   "da Semana Santa",
+    "Tempo Pascal":   "da Páscoa",
+    "Advento":        "do Advento",
+}
+
+_NOMES_DIAS = [_DIAS_SEMANA[i] for i in range(7)]
+
+
+def _titulo_feria(dia: str, info: InfoLiturgica) -> str:
+    """Ex.: 'Terça-feira da 3ª Semana do Tempo Comum', 'Quinta-feira após as Cinzas'."""
+    sufixo = _SUFIXO_TEMPO[info.tempo_liturgico]
+    if info.semana_ordinal is None:
+        return f"{dia} {sufixo}"
+    if info.semana_ordinal == 0:
+        return f"{dia} após as Cinzas"
+    return f"{dia} da {info.semana_ordinal}ª Semana {sufixo}"
+
+
+def _gerar_todos_os_dias(ano: int, regras: str = REGRAS_PADRAO) -> list[dict]:
+    """
+    Um registro por dia do ano. Cada trecho constante de `_tabela_tempos`
+    (mesmo tempo, cor e semana) é calculado uma vez e preenchido em bloco.
+    """
+    inicios, infos = _tabela_tempos(ano, regras)
+    fins = inicios[1:] + [date(ano, 12, 31).toordinal() + 1]
+    eventos: list[dict] = []
+
+    for inicio, fim, info in zip(inicios, fins, infos):
+        tempo, cor, semana, titulo, grau = info
+        dia_semana = date.fromordinal(inicio).weekday()
+        for ordinal in range(inicio, fim):
+            dia = _NOMES_DIAS[dia_semana]
+            eventos.append({
+                "data_calendario": date.fromordinal(ordinal).isoformat(),
+                "dia_semana":      dia,
+                "santo_festa":     titulo or _titulo_feria(dia, info),
+                "grau":            grau,
+                "cor":             cor,
+                "tempo_liturgico": tempo,
+                "semana_ordinal":  semana,
+            })
+            dia_semana = (dia_semana + 1) % 7
+    return eventos
+
+
+# =============================================================================
+# PERSISTÊNCIA — SUPABASE
+# =============================================================================
+
+_COLUNAS_LITURGIA = ("data_calendario", "dia_semana", "santo_festa", "grau",
+                     "cor", "tempo_liturgico", "semana_ordinal")
+
+
+@lru_cache(maxsize=1)
+def _criar_cliente():
+    """Cliente único do processo: o pool HTTP (keep-alive) é reaproveitado entre chamadas."""
     url = os.environ.get("SUPABASE_URL")
     key = os.environ.get("SUPABASE_KEY")
 
@@ -285,32 +501,233 @@ def inserir_no_supabase(eventos: list[dict]) -> None:
             "Variáveis SUPABASE_URL e SUPABASE_KEY não configuradas no .env"
         )
 
-    sb = create_client(url, key)
-    LOTE = 50
+    return create_client(url, key)
 
-    for i in range(0, len(eventos), LOTE):
-        lote = eventos[i : i + LOTE]
+
+def _hash_linha(linha: dict) -> bytes:
+    """Hash do conteúdo de uma linha de `liturgia_diaria` (só as colunas geradas)."""
+    conteudo = json.dumps([linha.get(c) for c in _COLUNAS_LITURGIA],
+                          ensure_ascii=False, separators=(",", ":"))
+    return hashlib.blake2b(conteudo.encode("utf-8"), digest_size=16).digest()
+
+
+def _buscar_hashes_existentes(sb, inicio: str, fim: str) -> dict[str, bytes]:
+    """
+    Lê as linhas já gravadas entre `inicio` e `fim` numa consulta por
+    intervalo (paginada só se passar do limite de 1000 linhas do PostgREST).
+    """
+    hashes: dict[str, bytes] = {}
+    PAGINA = 1000
+    offset = 0
+    while True:
         res = (
             sb.table("liturgia_diaria")
-            .upsert(lote, on_conflict="data_calendario")
+            .select(",".join(_COLUNAS_LITURGIA))
+            .gte("data_calendario", inicio)
+            .lte("data_calendario", fim)
+            .order("data_calendario")
+            .range(offset, offset + PAGINA - 1)
             .execute()
         )
-        log.info("  Lote %d/%d — %d registros enviados",
-                 i // LOTE + 1, -(-len(eventos) // LOTE), len(lote))
+        for linha in res.data:
+            hashes[linha["data_calendario"]] = _hash_linha(linha)
+        if len(res.data) < PAGINA:
+            return hashes
+        offset += PAGINA
+
+
+def filtrar_alterados(sb, eventos: list[dict]) -> list[dict]:
+    """Mantém só os eventos novos ou cujo conteúdo difere do que está no banco."""
+    if not eventos:
+        return []
+    datas = [e["data_calendario"] for e in eventos]
+    existentes = _buscar_hashes_existentes(sb, min(datas), max(datas))
+    return [e for e in eventos
+            if existentes.get(e["data_calendario"]) != _hash_linha(e)]
+
+
+class _TamanhoLoteAdaptativo:
+    """
+    Tamanho do próximo lote a partir da latência e do payload dos últimos:
+    dobra enquanto a resposta vem rápida (< metade do alvo) e cai pela metade
+    quando passa do alvo de latência ou do limite de bytes por requisição.
+    """
+
+    def __init__(self, inicial: int = 50, minimo: int = 10, maximo: int = 1000,
+                 latencia_alvo: float = 1.0, bytes_max: int = 512 * 1024):
+        self.tamanho = inicial
+        self.minimo = minimo
+        self.maximo = maximo
+        self.latencia_alvo = latencia_alvo
+        self.bytes_max = bytes_max
+
+    def registrar(self, linhas: int, latencia: float, n_bytes: int) -> None:
+        if latencia > self.latencia_alvo or n_bytes > self.bytes_max:
+            self.tamanho = max(self.minimo, self.tamanho // 2)
+        elif latencia < self.latencia_alvo / 2:
+            cabe = self.bytes_max * linhas // max(n_bytes, 1)
+            self.tamanho = max(self.minimo, min(self.maximo, self.tamanho * 2, cabe))
+
+
+def _enviar_lote(sb, lote: list[dict], tentativas: int) -> dict:
+    """UPSERT de um lote com retentativa (backoff exponencial) só deste lote."""
+    n_bytes = len(json.dumps(lote, ensure_ascii=False).encode("utf-8"))
+    for tentativa in range(1, tentativas + 1):
+        inicio = time.perf_counter()
+        try:
+            (
+                sb.table("liturgia_diaria")
+                .upsert(lote, on_conflict="data_calendario", returning=ReturnMethod.minimal)
+                .execute()
+            )
+            return {"linhas": len(lote), "bytes": n_bytes, "tentativas": tentativa,
+                    "latencia": time.perf_counter() - inicio, "erro": None}
+        except Exception as e:
+            log.warning("  Lote de %d registros falhou (tentativa %d/%d): %s",
+                        len(lote), tentativa, tentativas, e)
+            if tentativa < tentativas:
+                time.sleep(0.5 * 2 ** (tentativa - 1))
+            erro = str(e)
+    return {"linhas": len(lote), "bytes": n_bytes, "tentativas": tentativas,
+            "latencia": time.perf_counter() - inicio, "erro": erro}
+
+
+def _log_estatisticas_lotes(resultados: list[dict], tamanho_final: int) -> None:
+    if not resultados:
+        return
+    latencias = sorted(r["latencia"] * 1e3 for r in resultados)
+    p = lambda q: latencias[min(len(latencias) - 1, int(q * len(latencias)))]
+    log.info("Lotes: %d | latência (ms) mín %.0f · p50 %.0f · p95 %.0f · máx %.0f · média %.0f",
+             len(latencias), latencias[0], p(0.50), p(0.95), latencias[-1],
+             sum(latencias) / len(latencias))
+    log.info("Lotes: %.1f KiB enviados | %d retentativas | tamanho final do lote: %d",
+             sum(r["bytes"] for r in resultados) / 1024,
+             sum(r["tentativas"] - 1 for r in resultados), tamanho_final)
+
+
+def inserir_no_supabase(eventos: list[dict], diff: bool = False, sb=None,
+                        concorrencia: int = 4, tentativas: int = 3) -> dict:
+    """
+    Faz UPSERT em lotes na tabela `liturgia_diaria`.
+    Idempotente: reexecutar não duplica registros.
+    Com `diff=True` compara hashes de conteúdo com o que já está gravado e
+    envia só as linhas novas ou alteradas. `sb` permite injetar o cliente
+    (ex.: apontando para `postgrest_local.ServidorPostgrestLocal`).
+
+    Até `concorrencia` lotes ficam em voo ao mesmo tempo, todos pelo mesmo
+    cliente (pool HTTP único). O tamanho do lote se adapta à latência medida
+    e um lote que falha é reenviado sozinho, até `tentativas` vezes.
+    Retorna {"enviados": n, "pulados": m}.
+    """
+    if tentativas < 1:
+        raise ValueError("tentativas deve ser >= 1")
+    sb = sb or _criar_cliente()
+
+    total = len(eventos)
+    if diff:
+        eventos = filtrar_alterados(sb, eventos)
+        log.info("Diff: %d novos/alterados, %d inalterados pulados.",
+                 len(eventos), total - len(eventos))
+
+    ajuste = _TamanhoLoteAdaptativo()
+    resultados: list[dict] = []
+    posicao = 0
+
+    with ThreadPoolExecutor(max_workers=concorrencia) as pool:
+        em_voo = set()
+        while posicao < len(eventos) or em_voo:
+            while posicao < len(eventos) and len(em_voo) < concorrencia:
+                lote = eventos[posicao : posicao + ajuste.tamanho]
+                posicao += len(lote)
+                em_voo.add(pool.submit(_enviar_lote, sb, lote, tentativas))
+
+            prontos, em_voo = wait(em_voo, return_when=FIRST_COMPLETED)
+            for futuro in prontos:
+                r = futuro.result()
+                resultados.append(r)
+                if r["erro"] is None:
+                    ajuste.registrar(r["linhas"], r["latencia"], r["bytes"])
+                    log.info("  Lote %d — %d registros enviados (%.0f ms)",
+                             len(resultados), r["linhas"], r["latencia"] * 1e3)
+
+    _log_estatisticas_lotes(resultados, ajuste.tamanho)
+
+    falhas = sum(r["linhas"] for r in resultados if r["erro"])
+    if falhas:
+        raise RuntimeError(f"{falhas} registros não enviados após {tentativas} tentativas")
 
     log.info("UPSERT concluído: %d registros em `liturgia_diaria`.", len(eventos))
+    return {"enviados": len(eventos), "pulados": total - len(eventos)}
 
 
 # =============================================================================
 # SAÍDA JSON LOCAL
 # =============================================================================
 
-def salvar_json(eventos: list[dict], ano: int) -> str:
-    nome = f"calendario_{ano}.json"
+def salvar_json(eventos: list[dict], ano: int, formato: str = "json") -> str:
+    """Grava `calendario_{ano}` no formato pedido (json, ndjson ou msgpack)."""
+    nome = f"calendario_{ano}{FORMATOS[formato]}"
+    caminho = os.path.join(os.path.dirname(__file__), nome)
+    with abrir_escritor(caminho, formato) as escritor:
+        escritor.escrever_varios(eventos)
+    log.info("%s salvo: %s", formato.upper(), caminho)
+    return caminho
+
+
+# =============================================================================
+# GERAÇÃO EM INTERVALO (MULTIPROCESSO)
+# =============================================================================
+
+def _inicializar_worker() -> None:
+    """Roda uma vez por processo: silencia o log por ano dos marcos."""
+    log.setLevel(logging.WARNING)
+
+
+def _gerar_ano_worker(ano: int, todos_os_dias: bool = False,
+                      regras: str = REGRAS_PADRAO) -> tuple[int, list[dict]]:
+    return ano, gerar_calendario_liturgico(ano, todos_os_dias, regras)
+
+
+def gerar_intervalo(anos: list[int], processos: int | None = None, todos_os_dias: bool = False,
+                    regras: str = REGRAS_PADRAO) -> Iterator[tuple[int, list[dict]]]:
+    """
+    Distribui os anos num pool de processos (padrão: todos os núcleos) e
+    devolve (ano, eventos) na ordem de `anos`, à medida que cada ano termina.
+    """
+    processos = processos or os.cpu_count() or 1
+    lote = max(1, len(anos) // (processos * 4))
+
+    with ProcessPoolExecutor(max_workers=processos,
+                             initializer=_inicializar_worker) as pool:
+        yield from pool.map(partial(_gerar_ano_worker, todos_os_dias=todos_os_dias,
+                                    regras=regras),
+                            anos, chunksize=lote)
+
+
+def processar_intervalo(anos: list[int], dry_run: bool, todos_os_dias: bool = False,
+                        diff: bool = False, formato: str = "json",
+                        regras: str = REGRAS_PADRAO) -> str:
+    """
+    Gera os anos em paralelo e grava, em streaming, um `calendario_{ano}`
+    por ano mais o consolidado `calendario_{inicio}-{fim}`.
+    """
+    nome = f"calendario_{anos[0]}-{anos[-1]}{FORMATOS[formato]}"
     caminho = os.path.join(os.path.dirname(__file__), nome)
-    with open(caminho, "w", encoding="utf-8") as f:
-        json.dump(eventos, f, ensure_ascii=False, indent=2)
-    log.info("JSON salvo: %s", caminho)
+    opcoes_escritor = {"indent": False} if formato == "json" else {}
+    sb = None if dry_run else _criar_cliente()
+    inicio = time.perf_counter()
+
+    with abrir_escritor(caminho, formato, **opcoes_escritor) as consolidado:
+        for ano, eventos in gerar_intervalo(anos, todos_os_dias=todos_os_dias, regras=regras):
+            salvar_json(eventos, ano, formato)
+            consolidado.escrever_varios(eventos)
+            if not dry_run:
+                inserir_no_supabase(eventos, diff=diff, sb=sb)
+
+    duracao = time.perf_counter() - inicio
+    log.info("Consolidado salvo: %s (%d eventos)", caminho, consolidado.total)
+    log.info("%d anos em %.2fs — %.1f anos/s", len(anos), duracao,
+             len(anos) / duracao if duracao else float("inf"))
     return caminho
 
 
@@ -318,45 +735,85 @@ def salvar_json(eventos: list[dict], ano: int) -> str:
 # PONTO DE ENTRADA
 # =============================================================================
 
-def _resolver_ano() -> tuple[int, bool]:
+def _validar_ano(texto: str) -> int:
+    ano = int(texto)
+    if ano < 2000 or ano > 2100:
+        raise ValueError
+    return ano
+
+
+_FLAGS = {"--dry-run": "dry_run", "--todos-os-dias": "todos_os_dias", "--diff": "diff"}
+
+
+def _resolver_anos() -> tuple[list[int], dict]:
     """
-    Lê ano e flag --dry-run dos argumentos da linha de comando.
+    Lê ano (ou intervalo INICIO-FIM), as flags de `_FLAGS`, --formato=FMT e
+    --regras=VARIANTE da linha de comando.
     Sem argumento → próximo ano (datetime.now().year + 1).
     """
     args = sys.argv[1:]
-    dry_run = "--dry-run" in args
-    args = [a for a in args if a != "--dry-run"]
+    opcoes: dict = {nome: flag in args for flag, nome in _FLAGS.items()}
+    opcoes["formato"] = "json"
+    opcoes["regras"] = REGRAS_PADRAO
+    for arg in [a for a in args if a.startswith("--formato=")]:
+        opcoes["formato"] = arg.split("=", 1)[1]
+        if opcoes["formato"] not in FORMATOS:
+            log.error("Formato inválido: '%s'. Use: %s.", opcoes["formato"], ", ".join(FORMATOS))
+            sys.exit(1)
+    for arg in [a for a in args if a.startswith("--regras=")]:
+        opcoes["regras"] = arg.split("=", 1)[1]
+        if opcoes["regras"] not in variantes_disponiveis():
+            log.error("Variante de regras inválida: '%s'. Use: %s.",
+                      opcoes["regras"], ", ".join(variantes_disponiveis()))
+            sys.exit(1)
+    args = [a for a in args if a not in _FLAGS and not a.startswith(("--formato=", "--regras="))]
 
     if args:
         try:
-            ano = int(args[0])
-            if ano < 2000 or ano > 2100:
+            inicio, _, fim = args[0].partition("-")
+            ano_inicio = _validar_ano(inicio)
+            ano_fim = _validar_ano(fim) if fim else ano_inicio
+            if ano_fim < ano_inicio:
                 raise ValueError
         except ValueError:
-            log.error("Ano inválido: '%s'. Use um número entre 2000 e 2100.", args[0])
+            log.error("Ano inválido: '%s'. Use um número entre 2000 e 2100 "
+                      "ou um intervalo como 2025-2100.", args[0])
             sys.exit(1)
+        anos = list(range(ano_inicio, ano_fim + 1))
     else:
-        ano = datetime.now().year + 1
-        log.info("Ano não informado — usando próximo ano: %d", ano)
+        anos = [datetime.now().year + 1]
+        log.info("Ano não informado — usando próximo ano: %d", anos[0])
 
-    return ano, dry_run
+    return anos, opcoes
 
 
 def main():
-    ano, dry_run = _resolver_ano()
+    _configurar_ambiente()
+    anos, opcoes = _resolver_anos()
+    dry_run = opcoes["dry_run"]
+    sufixo = " [DRY-RUN — sem insert no banco]" if dry_run else ""
+
+    if len(anos) > 1:
+        log.info("=" * 60)
+        log.info("Gerando calendário litúrgico para %d–%d (%d anos, %d processos)%s",
+                 anos[0], anos[-1], len(anos), os.cpu_count() or 1, sufixo)
+        log.info("=" * 60)
+        processar_intervalo(anos, **opcoes)
+        log.info("Concluído.")
+        return
 
+    ano = anos[0]
     log.info("=" * 60)
-    log.info("Gerando calendário litúrgico para %d%s", ano,
-             " [DRY-RUN — sem insert no banco]" if dry_run else "")
+    log.info("Gerando calendário litúrgico para %d%s", ano, sufixo)
     log.info("=" * 60)
 
-    eventos = gerar_calendario_liturgico(ano)
-    salvar_json(eventos, ano)
+    eventos = gerar_calendario_liturgico(ano, opcoes["todos_os_dias"], opcoes["regras"])
+    salvar_json(eventos, ano, opcoes["formato"])
 
     if dry_run:
         log.info("Modo dry-run: nenhum dado enviado ao Supabase.")
     else:
-        inserir_no_supabase(eventos)
+        inserir_no_supabase(eventos, diff=opcoes["diff"])
 
     log.info("Concluído.")
 
@@ -0,0 +1,158 @@
+"""
+postgrest_local.py — Sacristia Digital
+Substituto local e em memória do endpoint REST do Supabase (PostgREST), para
+exercitar `inserir_no_supabase()` sem rede e sem banco.
+
+Entende o subconjunto que o cliente `supabase-py` usa neste projeto:
+    GET  /rest/v1/<tabela>?select=a,b&col=gte.X&col=lte.Y&offset=0&limit=1000
+    POST /rest/v1/<tabela>?on_conflict=<chave>      (upsert, corpo = lista JSON)
+
+`latencia` atrasa cada resposta (segundos) e `falhar_proximos` faz os
+próximos N upserts responderem 503, para simular rede lenta e falhas.
+
+Uso:
+    with ServidorPostgrestLocal(latencia=0.05) as srv:
+        sb = create_client(srv.url, "chave-local")
+        ...
+        srv.bytes_recebidos, srv.linhas_recebidas
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+_OPERADORES = {
+    "eq":  lambda a, b: a == b,
+    "neq": lambda a, b: a != b,
+    "gt":  lambda a, b: a > b,
+    "gte": lambda a, b: a >= b,
+    "lt":  lambda a, b: a < b,
+    "lte": lambda a, b: a <= b,
+}
+
+_PARAMETROS_RESERVADOS = {"select", "offset", "limit", "order", "on_conflict", "columns"}
+
+
+class ServidorPostgrestLocal:
+    """Servidor HTTP em thread própria; cada tabela é um dict em memória indexado pela chave do upsert."""
+
+    def __init__(self, host: str = "127.0.0.1", porta: int = 0, latencia: float = 0.0):
+        self.tabelas: dict[str, dict[str, dict]] = {}
+        self.latencia = latencia
+        self.falhar_proximos = 0
+        self.requisicoes = 0
+        self.bytes_recebidos = 0
+        self.linhas_recebidas = 0
+        self._trava = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, porta), self._criar_handler())
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, porta = self._httpd.server_address[:2]
+        return f"http://{host}:{porta}"
+
+    def __enter__(self) -> "ServidorPostgrestLocal":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def zerar_contadores(self) -> None:
+        with self._trava:
+            self.requisicoes = self.bytes_recebidos = self.linhas_recebidas = 0
+
+    # -------------------------------------------------------------------------
+    # Operações
+    # -------------------------------------------------------------------------
+
+    def _selecionar(self, tabela: str, parametros: list[tuple[str, str]]) -> list[dict]:
+        linhas = list(self.tabelas.get(tabela, {}).values())
+        colunas = None
+        ordem = None
+        offset, limit = 0, None
+        for nome, valor in parametros:
+            if nome == "select" and valor != "*":
+                colunas = valor.split(",")
+            elif nome == "order":
+                ordem = valor.split(".")
+            elif nome == "offset":
+                offset = int(valor)
+            elif nome == "limit":
+                limit = int(valor)
+            elif nome not in _PARAMETROS_RESERVADOS:
+                operador, _, alvo = valor.partition(".")
+                comparar = _OPERADORES[operador]
+                linhas = [l for l in linhas
+                          if l.get(nome) is not None and comparar(str(l[nome]), alvo)]
+        if ordem:
+            linhas.sort(key=lambda l: str(l.get(ordem[0])), reverse="desc" in ordem[1:])
+        linhas = linhas[offset: None if limit is None else offset + limit]
+        if colunas:
+            linhas = [{c: l.get(c) for c in colunas} for l in linhas]
+        return linhas
+
+    def _upsert(self, tabela: str, chave: str, linhas: list[dict]) -> list[dict]:
+        destino = self.tabelas.setdefault(tabela, {})
+        with self._trava:
+            for linha in linhas:
+                destino[str(linha[chave])] = {**destino.get(str(linha[chave]), {}), **linha}
+            self.linhas_recebidas += len(linhas)
+        return linhas
+
+    # -------------------------------------------------------------------------
+    # HTTP
+    # -------------------------------------------------------------------------
+
+    def _criar_handler(self):
+        servidor = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _responder(self, status: int, corpo) -> None:
+                dados = json.dumps(corpo).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(dados)))
+                self.end_headers()
+                self.wfile.write(dados)
+
+            def _rota(self) -> tuple[str, list[tuple[str, str]]]:
+                partes = urlsplit(self.path)
+                tabela = partes.path.rsplit("/", 1)[-1]
+                return tabela, parse_qsl(partes.query)
+
+            def do_GET(self):
+                tabela, parametros = self._rota()
+                with servidor._trava:
+                    servidor.requisicoes += 1
+                time.sleep(servidor.latencia)
+                self._responder(200, servidor._selecionar(tabela, parametros))
+
+            def do_POST(self):
+                tabela, parametros = self._rota()
+                corpo = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                with servidor._trava:
+                    servidor.requisicoes += 1
+                    servidor.bytes_recebidos += len(corpo)
+                    falhar = servidor.falhar_proximos > 0
+                    servidor.falhar_proximos -= falhar
+                time.sleep(servidor.latencia)
+                if falhar:
+                    self._responder(503, {"message": "falha simulada"})
+                    return
+                linhas = json.loads(corpo or b"[]")
+                if isinstance(linhas, dict):
+                    linhas = [linhas]
+                chave = dict(parametros).get("on_conflict", "id")
+                self._responder(201, servidor._upsert(tabela, chave, linhas))
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
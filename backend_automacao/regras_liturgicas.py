@@ -0,0 +1,189 @@
+"""
+regras_liturgicas.py — Sacristia Digital
+Motor declarativo das festas fixas e móveis do calendário litúrgico.
+
+As regras ficam em `regras_liturgicas.json`, uma entrada por variante
+(nacional, diocesana...). Uma variante pode herdar de outra (`herda`),
+substituir regras pelo `id`, remover regras (`remover`) e trocar a
+forma de calcular os marcos (`marcos.epifania`: "domingo" ou "6-jan").
+
+Cada regra é ancorada num marco do ano (`ancora` + `delta` em dias) ou numa
+data civil (`mes` + `dia`). A compilação ordena as regras por precedência
+(1 = maior, como na Tabela dos Dias Litúrgicos) uma única vez; por ano basta
+calcular as datas e fazer uma ordenação estável por data — o primeiro item
+de cada data é o vencedor.
+
+A variante compilada é guardada em disco (`.cache_regras/<sha256>.pickle`),
+indexada pelo hash do conteúdo resolvido: editar o JSON gera outra chave.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+from datetime import date, timedelta
+from functools import lru_cache
+from operator import itemgetter
+from typing import NamedTuple
+
+_DIR = os.path.dirname(os.path.abspath(__file__))
+CAMINHO_REGRAS = os.path.join(_DIR, "regras_liturgicas.json")
+DIR_CACHE = os.path.join(_DIR, ".cache_regras")
+REGRAS_PADRAO = "brasil"
+
+_VERSAO_COMPILADOR = 1        # mude ao alterar o formato de RegrasCompiladas
+_MODOS_EPIFANIA = ("domingo", "6-jan")
+_CAMPOS_EVENTO = ("titulo", "grau", "cor", "tempo")
+
+
+class RegrasCompiladas(NamedTuple):
+    """
+    Variante pronta para uso. As regras estão em ordem de precedência;
+    `datas[i]` é (âncora, delta) ou (None, (mes, dia)) e `eventos[i]` é
+    (titulo, grau, cor, tempo).
+    """
+    nome: str
+    hash: str
+    epifania: str
+    datas: tuple
+    eventos: tuple
+
+
+# =============================================================================
+# CARGA E HERANÇA
+# =============================================================================
+
+def _resolver_variante(variantes: dict, nome: str, visitadas: tuple = ()) -> dict:
+    """Aplica a cadeia de `herda` e devolve {"marcos": {...}, "regras": [...]}."""
+    if nome not in variantes:
+        raise ValueError(f"Variante de regras desconhecida: {nome!r} "
+                         f"(disponíveis: {', '.join(variantes)})")
+    if nome in visitadas:
+        raise ValueError(f"Herança circular nas regras: {' → '.join(visitadas + (nome,))}")
+
+    variante = variantes[nome]
+    if "herda" in variante:
+        base = _resolver_variante(variantes, variante["herda"], visitadas + (nome,))
+    else:
+        base = {"marcos": {}, "regras": []}
+
+    regras = {r["id"]: r for r in base["regras"]}
+    for id_regra in variante.get("remover", []):
+        regras.pop(id_regra, None)
+    for regra in variante.get("regras", []):
+        regras[regra["id"]] = regra
+    return {"marcos": {**base["marcos"], **variante.get("marcos", {})},
+            "regras": list(regras.values())}
+
+
+def _validar_regra(regra: dict) -> None:
+    faltando = [c for c in ("id", "precedencia") + _CAMPOS_EVENTO if c not in regra]
+    if faltando:
+        raise ValueError(f"Regra {regra.get('id', '?')!r} sem os campos: {', '.join(faltando)}")
+    if "ancora" in regra:
+        if "delta" not in regra:
+            raise ValueError(f"Regra {regra['id']!r}: 'ancora' exige 'delta'")
+    elif "mes" in regra and "dia" in regra:
+        date(2000, regra["mes"], regra["dia"])         # ValueError se a data não existe
+    else:
+        raise ValueError(f"Regra {regra['id']!r}: informe 'ancora'+'delta' ou 'mes'+'dia'")
+
+
+# =============================================================================
+# COMPILAÇÃO (COM CACHE EM DISCO)
+# =============================================================================
+
+def _compilar(nome: str, resolvida: dict, hash_: str) -> RegrasCompiladas:
+    epifania = resolvida["marcos"].get("epifania", "domingo")
+    if epifania not in _MODOS_EPIFANIA:
+        raise ValueError(f"marcos.epifania inválido: {epifania!r} (use {' ou '.join(_MODOS_EPIFANIA)})")
+
+    for regra in resolvida["regras"]:
+        _validar_regra(regra)
+    # Ordenação estável: empate de precedência mantém a ordem do arquivo
+    regras = sorted(resolvida["regras"], key=itemgetter("precedencia"))
+    return RegrasCompiladas(
+        nome=nome,
+        hash=hash_,
+        epifania=epifania,
+        datas=tuple((r["ancora"], r["delta"]) if "ancora" in r else (None, (r["mes"], r["dia"]))
+                    for r in regras),
+        eventos=tuple(tuple(r[c] for c in _CAMPOS_EVENTO) for r in regras),
+    )
+
+
+def _ler_cache(caminho: str) -> RegrasCompiladas | None:
+    try:
+        with open(caminho, "rb") as f:
+            compiladas = pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+        return None
+    return compiladas if isinstance(compiladas, RegrasCompiladas) else None
+
+
+def _gravar_cache(caminho: str, compiladas: RegrasCompiladas) -> None:
+    """Gravação atômica; falha de escrita só custa recompilar na próxima vez."""
+    temporario = f"{caminho}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(caminho), exist_ok=True)
+        with open(temporario, "wb") as f:
+            pickle.dump(compiladas, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporario, caminho)
+    except OSError:
+        if os.path.exists(temporario):
+            os.remove(temporario)
+
+
+@lru_cache(maxsize=None)
+def carregar_regras(nome: str = REGRAS_PADRAO, caminho: str = CAMINHO_REGRAS,
+                    dir_cache: str | None = DIR_CACHE) -> RegrasCompiladas:
+    """
+    Variante `nome` compilada. Uma vez por processo; entre processos e
+    execuções a compilação vem do cache em disco (`dir_cache=None` desliga).
+    """
+    with open(caminho, encoding="utf-8") as f:
+        variantes = json.load(f)
+    resolvida = _resolver_variante(variantes, nome)
+    canonico = json.dumps([_VERSAO_COMPILADOR, resolvida], sort_keys=True, ensure_ascii=False)
+    hash_ = hashlib.sha256(canonico.encode("utf-8")).hexdigest()
+
+    arquivo_cache = os.path.join(dir_cache, f"{hash_}.pickle") if dir_cache else None
+    if arquivo_cache:
+        compiladas = _ler_cache(arquivo_cache)
+        if compiladas is not None:
+            return compiladas._replace(nome=nome)
+
+    compiladas = _compilar(nome, resolvida, hash_)
+    if arquivo_cache:
+        _gravar_cache(arquivo_cache, compiladas)
+    return compiladas
+
+
+def variantes_disponiveis(caminho: str = CAMINHO_REGRAS) -> list[str]:
+    with open(caminho, encoding="utf-8") as f:
+        return list(json.load(f))
+
+
+# =============================================================================
+# APLICAÇÃO A UM ANO
+# =============================================================================
+
+def festas_do_ano(regras: RegrasCompiladas, ano: int, marcos: dict) -> list[tuple[date, tuple]]:
+    """
+    (data, (titulo, grau, cor, tempo)) de cada festa do ano, em ordem de data,
+    com os conflitos já resolvidos pela precedência.
+    """
+    itens = []
+    for (ancora, deslocamento), evento in zip(regras.datas, regras.eventos):
+        if ancora is None:
+            data_obj = date(ano, *deslocamento)
+        else:
+            data_obj = marcos[ancora] + timedelta(days=deslocamento)
+        itens.append((data_obj, evento))
+
+    itens.sort(key=itemgetter(0))              # estável: precedência desempata
+    festas = []
+    for data_obj, evento in itens:
+        if not festas or festas[-1][0] != data_obj:
+            festas.append((data_obj, evento))
+    return festas
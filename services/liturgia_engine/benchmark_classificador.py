@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+# =============================================================================
+# SCRIPT: Micro-benchmark do classificador de linhas (Sacristia Digital)
+# Compara a classificação antiga (lower() + any(x in ...) por tipo, três
+# re.search não compilados para a referência, re.sub em limpar_texto) com o
+# classificador compilado, linha a linha, sobre linhas reais de páginas
+# salvas. Confere que tipo, referência e texto limpo são idênticos.
+#
+# Uso:
+#     python benchmark_classificador.py [arquivo.html | diretório ...] [--repeticoes=20]
+#
+# Sem argumentos, usa debug_vatican.html e as páginas do cache de HTML.
+# Sai com código 1 se alguma linha divergir.
+# =============================================================================
+
+import glob
+import os
+import re
+import sys
+import time
+
+from bs4 import BeautifulSoup
+
+import classificador
+from cache_html import DIR_CACHE
+
+_RAIZ = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..")
+
+
+# =============================================================================
+# IMPLEMENTAÇÃO DE REFERÊNCIA (a anterior)
+# =============================================================================
+
+def referencia_antiga(texto):
+    patterns = [
+        r'([1-3]?\s*[A-Za-zÀ-ú]+\.?\s+\d+[,:]\s*\d+(?:-\d+)?(?:[a-z])?)',
+        r'([A-Za-zÀ-ú]+\s+\d+\s*\(\d+\)[,:]\s*\d+(?:-\d+)?)',
+        r'([A-Za-zÀ-ú]+\s+\d+[,:]\s*\d+(?:-\d+)?)'
+    ]
+    for pattern in patterns:
+        match = re.search(pattern, texto)
+        if match:
+            return match.group(1).strip()
+    return ""
+
+
+def limpar_antigo(texto):
+    texto = re.sub(r'\s+', ' ', texto)
+    texto = texto.replace('\xa0', ' ')
+    return texto.strip()
+
+
+def tipo_antigo(linha):
+    linha_lower = linha.lower()
+    if any(x in linha_lower for x in ["primeira leitura", "1ª leitura", "1.ª leitura"]):
+        return "primeira_leitura"
+    elif any(x in linha_lower for x in ["segunda leitura", "2ª leitura", "2.ª leitura"]):
+        return "segunda_leitura"
+    elif any(x in linha_lower for x in ["salmo responsorial", "salmo", "sl "]):
+        return "salmo"
+    elif "evangelho" in linha_lower:
+        return "evangelho"
+    elif any(x in linha_lower for x in ["refrão", "r.", "resp."]):
+        return "refrao"
+    return None
+
+
+def classificar_antigo(linha):
+    tipo = tipo_antigo(linha)
+    if tipo in classificador.TIPOS_LEITURA:
+        return tipo, referencia_antiga(linha)
+    return tipo, ""
+
+
+# =============================================================================
+# CORPUS E MEDIÇÃO
+# =============================================================================
+
+def _linhas(argumentos):
+    caminhos = []
+    for arg in argumentos or [os.path.join(_RAIZ, "debug_vatican.html"),
+                              os.path.join(DIR_CACHE, "objetos")]:
+        if os.path.isdir(arg):
+            caminhos.extend(sorted(glob.glob(os.path.join(arg, "*.html"))))
+        elif os.path.exists(arg):
+            caminhos.append(arg)
+    linhas = []
+    for caminho in caminhos:
+        with open(caminho, encoding="utf-8", errors="replace") as f:
+            soup = BeautifulSoup(f.read(), "html.parser")
+        for tag in soup(["script", "style"]):
+            tag.decompose()
+        linhas.extend(linha for linha in soup.get_text("\n").split("\n") if linha.strip())
+    return linhas
+
+
+def _medir(funcao, linhas, repeticoes):
+    """Melhor de `repeticoes` passadas, em ns por linha."""
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        for linha in linhas:
+            funcao(linha)
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor / len(linhas) * 1e9
+
+
+def main():
+    repeticoes = 20
+    argumentos = []
+    for arg in sys.argv[1:]:
+        if arg.startswith("--repeticoes="):
+            repeticoes = int(arg.partition("=")[2])
+        else:
+            argumentos.append(arg)
+
+    linhas = _linhas(argumentos)
+    if not linhas:
+        sys.exit("Nenhuma linha no corpus.")
+    limpas = [limpar_antigo(linha) for linha in linhas]
+    print(f"Classificador — {len(linhas)} linhas reais, melhor de {repeticoes}")
+
+    casos = [
+        ("limpar_texto", limpar_antigo, classificador.limpar_texto, linhas),
+        ("tipo + referência", classificar_antigo, classificador.classificar_linha, limpas),
+    ]
+    divergencias = 0
+    for nome, antigo, novo, entrada in casos:
+        erradas = [linha for linha in entrada if antigo(linha) != novo(linha)]
+        divergencias += len(erradas)
+        ns_antigo = _medir(antigo, entrada, repeticoes)
+        ns_novo = _medir(novo, entrada, repeticoes)
+        situacao = "idêntico" if not erradas else f"DIVERGE em {len(erradas)} linha(s): {erradas[0]!r}"
+        print(f"  {nome:<20} antigo {ns_antigo:7.0f} ns/linha · compilado {ns_novo:7.0f} ns/linha "
+              f"· {ns_antigo / ns_novo:4.1f}x  {situacao}")
+
+    sys.exit(1 if divergencias else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# =============================================================================
+# SCRIPT: Benchmark do coletor (Sacristia Digital)
+# Compara o download sequencial (requests.get, uma data por vez) com o
+# ColetorAsync contra o substituto local do Vatican News — sem rede.
+# Com --limite=N o servidor passa a responder 429 (Retry-After) acima de
+# N req/s, e o benchmark compara taxas fixas com o controle AIMD.
+#
+# Uso:
+#     python benchmark_coletor.py [--latencia=0.3] [--dias=31] [--taxa=10] [--concorrencia=4]
+#                                 [--limite=0] [--taxa-maxima=20]
+# =============================================================================
+
+import logging
+import sys
+import time
+from datetime import datetime, timedelta
+
+import requests
+
+import miner_liturgia as ml
+import sessao_http
+from coletor_async import ColetorAsync
+from vatican_local import ServidorVaticanLocal
+
+logging.disable(logging.WARNING)
+
+
+def _opcoes():
+    opcoes = {"latencia": 0.3, "dias": 31, "taxa": 10.0, "concorrencia": 4,
+              "limite": 0.0, "taxa_maxima": 20.0}
+    for arg in sys.argv[1:]:
+        nome, _, valor = arg.lstrip("-").replace("-", "_").partition("=")
+        if nome in opcoes:
+            opcoes[nome] = type(opcoes[nome])(valor)
+    return opcoes
+
+
+def comparar_taxas(o, datas):
+    """Taxas fixas × AIMD contra um servidor que recusa acima de `limite` req/s."""
+    print(f"\nServidor com limite de {o['limite']:g} req/s (429 + Retry-After acima disso)")
+    casos = [
+        (f"fixa {1 / 0.4:g} req/s (sleep 0.4 antigo)", {"taxa": 1 / 0.4}),
+        (f"fixa {o['taxa']:g} req/s", {"taxa": o["taxa"]}),
+        (f"AIMD 1 → até {o['taxa_maxima']:g} req/s", {"taxa": 1.0, "taxa_maxima": o["taxa_maxima"]}),
+    ]
+    for rotulo, parametros in casos:
+        with ServidorVaticanLocal(latencia=o["latencia"], limite_taxa=o["limite"]) as srv:
+            coletor = ColetorAsync(concorrencia_por_host=o["concorrencia"], rajada=1,
+                                   headers=ml.HEADERS, **parametros)
+            urls = [ml.url_da_data(d, srv.url) for d in datas]
+            inicio = time.perf_counter()
+            respostas = coletor.coletar(urls)
+            duracao = time.perf_counter() - inicio
+            ok = sum(1 for r in respostas if r.status == 200)
+            extra = ""
+            for controle in coletor.controles.values():
+                extra = f"  taxa final {controle.taxa:5.2f} · {controle.reducoes} redução(ões)"
+            print(f"  {rotulo:<38} {duracao:7.2f}s  {ok / duracao:6.1f} páginas/s  "
+                  f"{ok:3d}/{len(urls)} ok  {srv.recusadas:3d} × 429{extra}")
+
+
+def main():
+    o = _opcoes()
+    datas = [datetime(2025, 1, 1) + timedelta(days=i) for i in range(o["dias"])]
+    print(f"Coletor — {o['dias']} páginas, latência simulada {o['latencia']:.2f}s")
+
+    with ServidorVaticanLocal(latencia=o["latencia"]) as srv:
+        urls = [ml.url_da_data(d, srv.url) for d in datas]
+
+        inicio = time.perf_counter()
+        for url in urls:
+            requests.get(url, headers=ml.HEADERS, timeout=30)
+        sequencial = time.perf_counter() - inicio
+        print(f"  {'sequencial (requests.get)':<38} {sequencial:7.2f}s  {o['dias'] / sequencial:6.1f} páginas/s"
+              f"  {srv.conexoes:3d} conexões")
+        print(f"  {'sequencial + sleep(2) (antigo)':<38} {sequencial + 2 * o['dias']:7.2f}s  (estimado)")
+
+        srv.zerar_contadores()
+        sessao = sessao_http.obter_sessao()
+        inicio = time.perf_counter()
+        for url in urls:
+            sessao.get(url, headers=ml.HEADERS, timeout=30)
+        com_sessao = time.perf_counter() - inicio
+        print(f"  {'sequencial (sessão compartilhada)':<38} {com_sessao:7.2f}s  {o['dias'] / com_sessao:6.1f} páginas/s"
+              f"  {srv.conexoes:3d} conexões")
+
+        srv.zerar_contadores()
+        coletor = ColetorAsync(concorrencia_por_host=o["concorrencia"], taxa=o["taxa"],
+                               rajada=o["concorrencia"], headers=ml.HEADERS)
+        inicio = time.perf_counter()
+        respostas = coletor.coletar(urls)
+        concorrente = time.perf_counter() - inicio
+        assert all(r.status == 200 for r in respostas)
+        rotulo = f"ColetorAsync ({o['concorrencia']}×, {o['taxa']:g} req/s)"
+        print(f"  {rotulo:<38} {concorrente:7.2f}s  {o['dias'] / concorrente:6.1f} páginas/s")
+        print(f"  {'pico de requisições simultâneas':<38} {srv.pico_simultaneas:7d}")
+        print(f"  {'conexões TCP (servidor)':<38} {srv.conexoes:7d}")
+        print(f"  {'máx. requisições em 1 s':<38} {srv.taxa_maxima():7d}  "
+              f"(limite: {o['taxa']:g}/s + rajada de {o['concorrencia']})")
+        print(f"  {'ganho sobre o sequencial':<38} {sequencial / concorrente:7.1f}x")
+        print(f"  {'ganho sobre o antigo (com sleep)':<38} {(sequencial + 2 * o['dias']) / concorrente:7.1f}x")
+
+    if o["limite"]:
+        comparar_taxas(o, datas)
+
+    r = sessao_http.estatisticas()
+    print(f"  {'sessao_http (sessão + coletor)':<38} {r['conexoes_abertas']:7d} abertas, "
+          f"{r['conexoes_reusadas']} reusadas em {r['requisicoes']} requisições")
+
+
+if __name__ == "__main__":
+    main()
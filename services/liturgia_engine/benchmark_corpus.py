@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+# =============================================================================
+# SCRIPT: Corpus de páginas e benchmark das variantes de parser (Sacristia Digital)
+# Roda cada variante do parser da palavra-do-dia (miner_liturgia em cada
+# backend instalado, miner_vaticano_windows e miner_liturgia_) sobre o corpus
+# de páginas salvas em corpus_paginas/ — cada página .html com um .json ao
+# lado contendo os campos esperados — e mede páginas/s, pico de memória e
+# acerto campo a campo, para escolher a variante mais rápida entre as corretas.
+# Confere também o lecionário: um parse errado seguido do correto tem de
+# deixar no cache o texto correto.
+#
+# Uso:
+#     python benchmark_corpus.py [diretório ...] [--repeticoes=5] [--detalhes]
+#
+# Sem argumentos, usa corpus_paginas/. Para acrescentar uma página: salve o
+# HTML como <nome>.html e escreva <nome>.json com "data" (AAAA-MM-DD) e
+# "campos" (os valores esperados; campos omitidos não são conferidos).
+# =============================================================================
+
+import contextlib
+import glob
+import io
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+import miner_liturgia as ml
+import miner_liturgia_ as ml_antigo
+import miner_vaticano_windows as mw
+from lecionario import Lecionario
+
+DIR_CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "corpus_paginas")
+
+
+def variantes():
+    """[(nome, função(html, data_alvo))] de cada parser disponível aqui."""
+    lista = [(f"miner_liturgia ({parser})",
+              lambda html, data, parser=parser: ml.extrair_leituras(html, data, parser=parser))
+             for parser in ml.parsers_disponiveis()]
+    lista.append(("miner_vaticano_windows",
+                  lambda html, data: mw.extrair_leituras(html, data, salvar_debug=False)))
+    lista.append(("miner_liturgia_", ml_antigo.extrair_leituras))
+    return lista
+
+
+# =============================================================================
+# CORPUS
+# =============================================================================
+
+def carregar_corpus(diretorios):
+    """Páginas (nome, html, data_alvo, campos esperados) dos pares .html/.json."""
+    paginas = []
+    for diretorio in diretorios:
+        for caminho in sorted(glob.glob(os.path.join(diretorio, "*.html"))):
+            base = os.path.splitext(caminho)[0]
+            if not os.path.exists(base + ".json"):
+                print(f"  (sem {os.path.basename(base)}.json, ignorada: {os.path.basename(caminho)})")
+                continue
+            with open(caminho, encoding="utf-8", errors="replace") as f:
+                html = f.read()
+            with open(base + ".json", encoding="utf-8") as f:
+                esperado = json.load(f)
+            paginas.append((os.path.basename(base), html,
+                            datetime.strptime(esperado["data"], "%Y-%m-%d"),
+                            esperado["campos"]))
+    return paginas
+
+
+def _normalizar(valor):
+    return " ".join((valor or "").split())
+
+
+def conferir(resultado, campos):
+    """Campos (nome, esperado, obtido) que não batem; None conta todos como errados."""
+    obtidos = resultado or {}
+    return [(campo, esperado, obtidos.get(campo))
+            for campo, esperado in campos.items()
+            if _normalizar(obtidos.get(campo)) != _normalizar(esperado)]
+
+
+# =============================================================================
+# LECIONÁRIO
+# =============================================================================
+
+def conferir_lecionario(paginas):
+    """
+    Para cada página que o miner_liturgia lê certo, num lecionário novo:
+    guarda um parse errado e depois o correto, e confere o que `montar`
+    devolve. Dois erros: texto trocado com uma leitura a menos (a varredura
+    não confirma: não pode entrar) e texto trocado com as mesmas referências
+    (entra, mas o parse correto seguinte tem de substituí-lo). Devolve
+    [(página, caso, campos errados)] e quantas páginas foram conferidas.
+    """
+    falhas = []
+    conferidas = 0
+    with tempfile.TemporaryDirectory() as diretorio, _silencioso():
+        for pagina, html, data, campos in paginas:
+            correto = ml.extrair_leituras(html, data)
+            if correto is None or conferir(correto, campos) or not correto.get("primeira_leitura_ref"):
+                continue
+            conferidas += 1
+            trocado = {**correto, "evangelho_texto": "Texto de outra leitura, lido do bloco errado."}
+            casos = {
+                "leitura a menos": {**trocado, "primeira_leitura_ref": "", "primeira_leitura_texto": ""},
+                "mesmas referências": trocado,
+            }
+            for caso, errado in casos.items():
+                lecionario = Lecionario(os.path.join(diretorio, f"{pagina}-{len(falhas)}-{caso}.sqlite3"))
+                lecionario.guardar(html, errado)
+                lecionario.guardar(html, correto)
+                montado = lecionario.montar(html)
+                lecionario.fechar()
+                erros = conferir(montado, campos)
+                if erros:
+                    falhas.append((pagina, caso, [campo for campo, *_ in erros]))
+    return falhas, conferidas
+
+
+# =============================================================================
+# MEDIÇÃO
+# =============================================================================
+
+@contextlib.contextmanager
+def _silencioso():
+    """As variantes logam e dão print por página; isso não entra na medição."""
+    logging.disable(logging.CRITICAL)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            yield
+    finally:
+        logging.disable(logging.NOTSET)
+
+
+def medir(funcao, paginas, repeticoes):
+    """Resultados por página, melhor de `repeticoes` em páginas/s e pico de memória (KiB)."""
+    with _silencioso():
+        tracemalloc.start()
+        resultados = [funcao(html, data) for _, html, data, _ in paginas]
+        _, pico = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        melhor = float("inf")
+        for _ in range(repeticoes):
+            inicio = time.perf_counter()
+            for _, html, data, _ in paginas:
+                funcao(html, data)
+            melhor = min(melhor, time.perf_counter() - inicio)
+    return resultados, len(paginas) / melhor, pico / 1024
+
+
+def main():
+    repeticoes = 5
+    detalhes = False
+    diretorios = []
+    for arg in sys.argv[1:]:
+        if arg.startswith("--repeticoes="):
+            repeticoes = int(arg.partition("=")[2])
+        elif arg == "--detalhes":
+            detalhes = True
+        else:
+            diretorios.append(arg)
+
+    paginas = carregar_corpus(diretorios or [DIR_CORPUS])
+    if not paginas:
+        sys.exit("Nenhuma página com campos esperados no corpus.")
+    total_campos = sum(len(campos) for *_, campos in paginas)
+    print(f"Corpus — {len(paginas)} página(s), {total_campos} campo(s) esperados, melhor de {repeticoes}")
+
+    placar = []
+    for nome, funcao in variantes():
+        resultados, paginas_s, pico_kib = medir(funcao, paginas, repeticoes)
+        erros = {pagina: conferir(resultado, campos)
+                 for (pagina, _, _, campos), resultado in zip(paginas, resultados)}
+        corretos = total_campos - sum(len(e) for e in erros.values())
+        completas = sum(1 for e in erros.values() if not e)
+        acerto = corretos / total_campos
+        placar.append((acerto, paginas_s, nome))
+        print(f"  {nome:<30} {paginas_s:9.1f} páginas/s · pico {pico_kib:8.1f} KiB · "
+              f"campos {corretos}/{total_campos} ({acerto:5.1%}) · páginas completas {completas}/{len(paginas)}")
+        if detalhes:
+            for (pagina, *_), resultado in zip(paginas, resultados):
+                if resultado is None:
+                    print(f"      {pagina}: nenhum resultado")
+                    continue
+                for campo, esperado, obtido in erros[pagina]:
+                    esperado, obtido = _normalizar(esperado), _normalizar(obtido)
+                    i = next((i for i, (a, b) in enumerate(zip(esperado, obtido)) if a != b),
+                             min(len(esperado), len(obtido)))
+                    print(f"      {pagina}.{campo} (a partir do caractere {i}): "
+                          f"esperado {esperado[i:i + 50]!r}, obtido {obtido[i:i + 50]!r}")
+
+    acerto, paginas_s, nome = max(placar)
+    print(f"\n  ➜ Recomendada: {nome} ({acerto:.1%} dos campos, {paginas_s:.1f} páginas/s)")
+
+    falhas, conferidas = conferir_lecionario(paginas)
+    print(f"\nLecionário — parse errado seguido do correto: {conferidas - len({p for p, *_ in falhas})}"
+          f"/{conferidas} página(s) com o texto correto no cache")
+    for pagina, caso, campos in falhas:
+        print(f"  ❌ {pagina} ({caso}): {', '.join(campos)}")
+    if falhas:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+# =============================================================================
+# SCRIPT: Benchmark do parser (Sacristia Digital)
+# Compara o caminho antigo (árvore BeautifulSoup da página inteira com
+# html.parser + cinco find() em sequência) com o parse restrito ao container,
+# em cada backend instalado, sobre um corpus de páginas salvas. Confere que
+# os campos extraídos são idênticos aos do caminho antigo.
+#
+# Uso:
+#     python benchmark_parser.py [arquivo.html | diretório ...] [--repeticoes=5] [--processos=N]
+#
+# Sem argumentos, usa debug_vatican.html e as páginas do cache de HTML
+# (.cache_html/objetos). Sai com código 1 se algum backend divergir.
+# =============================================================================
+
+import glob
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from bs4 import BeautifulSoup
+
+import miner_liturgia as ml
+from cache_html import DIR_CACHE
+
+logging.disable(logging.WARNING)
+
+_RAIZ = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..")
+DATA = datetime(2025, 1, 29)
+
+
+def textos_legado(html):
+    """Caminho anterior: árvore completa e os seletores testados um a um."""
+    soup = BeautifulSoup(html, 'html.parser')
+    containers = [
+        soup.find('article'),
+        soup.find('main'),
+        soup.find('div', class_='section__content'),
+        soup.find('div', class_='content-body'),
+        soup.find('div', {'id': 'main-content'})
+    ]
+    corpo = next((c for c in containers if c), None)
+    if not corpo:
+        return None
+    return [ml.limpar_texto(e.get_text()) for e in corpo.find_all(ml.ELEMENTOS_TEXTO)]
+
+
+def leituras_legado(html):
+    """extrair_leituras com o caminho anterior no lugar de textos_do_container."""
+    restrito = ml.textos_do_container
+    ml.textos_do_container = lambda html, parser=None: textos_legado(html)
+    try:
+        return ml.extrair_leituras(html, DATA)
+    finally:
+        ml.textos_do_container = restrito
+
+
+def _corpus(argumentos):
+    caminhos = []
+    for arg in argumentos or [os.path.join(_RAIZ, "debug_vatican.html"),
+                              os.path.join(DIR_CACHE, "objetos")]:
+        if os.path.isdir(arg):
+            caminhos.extend(sorted(glob.glob(os.path.join(arg, "*.html"))))
+        elif os.path.exists(arg):
+            caminhos.append(arg)
+    paginas = []
+    for caminho in caminhos:
+        with open(caminho, encoding="utf-8", errors="replace") as f:
+            paginas.append((os.path.basename(caminho), f.read()))
+    return paginas
+
+
+def _medir(funcao, paginas, repeticoes):
+    """Melhor de `repeticoes` passadas pelo corpus, em ms por página."""
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        for _, html in paginas:
+            funcao(html)
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor / len(paginas) * 1e3
+
+
+def _textos_html_parser(html):
+    return ml.textos_do_container(html, "html.parser")
+
+
+def main():
+    opcoes = {"repeticoes": 5, "processos": 0}
+    argumentos = []
+    for arg in sys.argv[1:]:
+        nome, _, valor = arg.lstrip("-").partition("=")
+        if arg.startswith("--") and nome in opcoes:
+            opcoes[nome] = int(valor)
+        else:
+            argumentos.append(arg)
+
+    paginas = _corpus(argumentos)
+    if not paginas:
+        sys.exit("Nenhuma página no corpus.")
+    print(f"Parser — {len(paginas)} página(s), melhor de {opcoes['repeticoes']}")
+
+    base = _medir(textos_legado, paginas, opcoes["repeticoes"])
+    print(f"  {'legado (html.parser, página inteira)':<42} {base:8.2f} ms/página")
+
+    divergencias = 0
+    for parser in ml.parsers_disponiveis():
+        ms = _medir(lambda html: ml.textos_do_container(html, parser), paginas, opcoes["repeticoes"])
+        erradas = [nome for nome, html in paginas
+                   if ml.textos_do_container(html, parser) != textos_legado(html)
+                   or ml.extrair_leituras(html, DATA, parser=parser)
+                   != leituras_legado(html)]
+        divergencias += len(erradas)
+        situacao = "campos idênticos" if not erradas else f"DIVERGE em {', '.join(erradas)}"
+        print(f"  {'restrito (' + parser + ')':<42} {ms:8.2f} ms/página  {base / ms:5.1f}x  {situacao}")
+    for parser in sorted(set(ml.PARSERS) - set(ml.parsers_disponiveis())):
+        print(f"  {'restrito (' + parser + ')':<42}  não instalado")
+
+    if opcoes["processos"]:
+        htmls = [html for _, html in paginas] * opcoes["repeticoes"]
+        with ProcessPoolExecutor(opcoes["processos"]) as pool:
+            list(pool.map(_textos_html_parser, htmls[:opcoes["processos"]]))   # aquece
+            inicio = time.perf_counter()
+            list(pool.map(_textos_html_parser, htmls, chunksize=4))
+            ms = (time.perf_counter() - inicio) / len(htmls) * 1e3
+        print(f"  {'pool de ' + str(opcoes['processos']) + ' processos (html.parser)':<42} {ms:8.2f} ms/página  {base / ms:5.1f}x")
+
+    sys.exit(1 if divergencias else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+# =============================================================================
+# MÓDULO: Cache local de HTML bruto (Sacristia Digital)
+# Guarda as respostas das fontes em disco para não baixar de novo a mesma
+# página: índice por URL + corpo endereçado pelo conteúdo (sha256), com TTL,
+# revalidação condicional (ETag / Last-Modified → 304) e modo replay, que
+# responde só a partir do cache, sem rede. Página 200 ainda sem o Evangelho
+# (dias futuros costumam sair antes das leituras) vale só TTL_AUSENTE.
+#
+# Layout em disco:
+#     .cache_html/urls/<sha256(url)>.json      metadados da última resposta
+#     .cache_html/objetos/<sha256(corpo)>.html  corpo (compartilhado entre URLs)
+# =============================================================================
+
+import hashlib
+import json
+import os
+import time
+from typing import NamedTuple
+
+from lecionario import varrer_referencias
+
+DIR_CACHE = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache_html")
+TTL_PADRAO = 30 * 24 * 3600        # páginas de leituras quase nunca mudam
+TTL_AUSENTE = 24 * 3600            # 404 ou sem Evangelho: a página pode ser publicada depois
+_STATUS_CACHEAVEIS = {200, 404, 410}
+
+
+class CacheAusente(LookupError):
+    """URL pedida em modo replay sem resposta guardada."""
+
+
+def tem_evangelho(texto: str) -> bool:
+    """Página já publicada: traz o Evangelho com referência (varredura leve, sem parse)."""
+    varredura = varrer_referencias(texto)
+    return varredura is not None and "evangelho" in varredura[1]
+
+
+class Entrada(NamedTuple):
+    url: str
+    status: int
+    texto: str
+    etag: str = ""
+    last_modified: str = ""
+    baixado_em: float = 0.0
+    hash: str = ""
+    completa: bool | None = None        # None: entrada antiga, avaliada ao consultar
+
+
+class CacheHTML:
+    """
+        cache = CacheHTML()                     # ou CacheHTML(replay=True)
+        entrada, cabecalhos = cache.preparar(url)
+        if entrada is None:                     # precisa ir à rede
+            r = sessao.get(url, headers={**headers, **cabecalhos})
+            entrada = cache.registrar(url, r.status_code, r.text, r.headers)
+    """
+
+    def __init__(self, diretorio: str = DIR_CACHE, ttl: float = TTL_PADRAO,
+                 ttl_ausente: float = TTL_AUSENTE, replay: bool = False, completa=tem_evangelho):
+        self.diretorio = diretorio
+        self.completa = completa            # texto -> bool; 200 incompleto vale ttl_ausente
+        self.ttl = ttl
+        self.ttl_ausente = ttl_ausente
+        self.replay = replay
+        self.acertos = self.revalidados = self.baixados = 0
+        os.makedirs(os.path.join(diretorio, "urls"), exist_ok=True)
+        os.makedirs(os.path.join(diretorio, "objetos"), exist_ok=True)
+
+    # -------------------------------------------------------------------------
+    # Armazenamento
+    # -------------------------------------------------------------------------
+
+    def _caminho_indice(self, url: str) -> str:
+        chave = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return os.path.join(self.diretorio, "urls", f"{chave}.json")
+
+    def _caminho_objeto(self, hash_: str) -> str:
+        return os.path.join(self.diretorio, "objetos", f"{hash_}.html")
+
+    @staticmethod
+    def _gravar_atomico(caminho: str, dados: bytes) -> None:
+        temporario = f"{caminho}.{os.getpid()}.tmp"
+        with open(temporario, "wb") as f:
+            f.write(dados)
+        os.replace(temporario, caminho)
+
+    def consultar(self, url: str) -> Entrada | None:
+        try:
+            with open(self._caminho_indice(url), encoding="utf-8") as f:
+                meta = json.load(f)
+            with open(self._caminho_objeto(meta["hash"]), encoding="utf-8") as f:
+                texto = f.read()
+        except (OSError, ValueError, KeyError):
+            return None
+        return Entrada(texto=texto, **meta)
+
+    def _salvar(self, entrada: Entrada) -> Entrada:
+        caminho_objeto = self._caminho_objeto(entrada.hash)
+        if not os.path.exists(caminho_objeto):
+            self._gravar_atomico(caminho_objeto, entrada.texto.encode("utf-8"))
+        meta = entrada._asdict()
+        del meta["texto"]
+        self._gravar_atomico(self._caminho_indice(entrada.url),
+                             json.dumps(meta, ensure_ascii=False).encode("utf-8"))
+        return entrada
+
+    # -------------------------------------------------------------------------
+    # Política
+    # -------------------------------------------------------------------------
+
+    def fresco(self, entrada: Entrada) -> bool:
+        completa = entrada.completa
+        if completa is None and entrada.status == 200:
+            completa = self.completa(entrada.texto)
+        ttl = self.ttl if entrada.status == 200 and completa else self.ttl_ausente
+        return time.time() - entrada.baixado_em < ttl
+
+    def orfa(self, url: str, status: int | None) -> bool:
+        """304 sem cópia guardada para renovar: é preciso pedir de novo, sem condicionais."""
+        return status == 304 and self.consultar(url) is None
+
+    def preparar(self, url: str) -> tuple[Entrada | None, dict]:
+        """
+        (entrada servível sem rede, cabeçalhos condicionais). Entrada None
+        significa que é preciso requisitar, com os cabeçalhos devolvidos.
+        Em modo replay levanta CacheAusente se a URL nunca foi guardada.
+        """
+        entrada = self.consultar(url)
+        if entrada is not None and (self.replay or self.fresco(entrada)):
+            self.acertos += 1
+            return entrada, {}
+        if self.replay:
+            raise CacheAusente(url)
+
+        cabecalhos = {}
+        if entrada is not None and entrada.status == 200:
+            if entrada.etag:
+                cabecalhos["If-None-Match"] = entrada.etag
+            if entrada.last_modified:
+                cabecalhos["If-Modified-Since"] = entrada.last_modified
+        return None, cabecalhos
+
+    def registrar(self, url: str, status: int, texto: str, headers) -> Entrada:
+        """Incorpora a resposta da rede; 304 renova a entrada guardada."""
+        if status == 304:
+            anterior = self.consultar(url)
+            if anterior is not None:
+                self.revalidados += 1
+                return self._salvar(anterior._replace(
+                    baixado_em=time.time(),
+                    etag=headers.get("ETag", anterior.etag),
+                    last_modified=headers.get("Last-Modified", anterior.last_modified)))
+
+        entrada = Entrada(url, status, texto,
+                          etag=headers.get("ETag", ""),
+                          last_modified=headers.get("Last-Modified", ""),
+                          baixado_em=time.time(),
+                          hash=hashlib.sha256(texto.encode("utf-8")).hexdigest())
+        if status not in _STATUS_CACHEAVEIS:
+            return entrada                      # 5xx e afins não são guardados
+        if status == 200:
+            entrada = entrada._replace(completa=self.completa(texto))
+        self.baixados += 1
+        return self._salvar(entrada)
+
+    def resumo(self) -> str:
+        return (f"cache: {self.acertos} do disco, {self.revalidados} revalidados (304), "
+                f"{self.baixados} baixados")
+
+
+def requisitar_com_cache(cache: CacheHTML | None, sessao, url: str, condicionais: dict | None = None,
+                        **kwargs):
+    """
+    A parte de rede de baixar_com_cache, para quem já consultou
+    cache.preparar(url): (Entrada, cabeçalhos da resposta). Os cabeçalhos
+    servem a quem precisa de mais que o corpo (Retry-After num 429/503).
+    """
+    headers = kwargs.get("headers", {})
+    r = sessao.get(url, **{**kwargs, "headers": {**headers, **(condicionais or {})}})
+    if cache is None:
+        return Entrada(url, r.status_code, r.text), r.headers
+    if cache.orfa(url, r.status_code):
+        r = sessao.get(url, **kwargs)
+    return cache.registrar(url, r.status_code, r.text, r.headers), r.headers
+
+
+def baixar_com_cache(cache: CacheHTML | None, sessao, url: str, **kwargs) -> Entrada:
+    """GET síncrono (requests) passando pelo cache; sem cache, só embala a resposta."""
+    condicionais = {}
+    if cache is not None:
+        entrada, condicionais = cache.preparar(url)
+        if entrada is not None:
+            return entrada
+    return requisitar_com_cache(cache, sessao, url, condicionais, **kwargs)[0]
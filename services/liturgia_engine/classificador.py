@@ -0,0 +1,89 @@
+# =============================================================================
+# MÓDULO: Classificador de linhas litúrgicas (Sacristia Digital)
+# Reconhece, numa linha de texto, o marcador de leitura (Primeira Leitura,
+# Salmo, Evangelho, refrão...) e a referência bíblica que o acompanha.
+# Tudo compilado uma vez, na importação: os marcadores viram uma única
+# alternância (sem grupos, para o re poder pular direto às posições
+# candidatas) e a referência uma gramática pré-compilada.
+# =============================================================================
+
+import re
+
+# Marcadores por tipo, em ordem de prioridade: se uma linha tem mais de um,
+# vence o primeiro tipo da lista (não o que aparece antes na linha)
+MARCADORES = [
+    ("primeira_leitura", ["primeira leitura", "1ª leitura", "1.ª leitura"]),
+    ("segunda_leitura", ["segunda leitura", "2ª leitura", "2.ª leitura"]),
+    ("salmo", ["salmo responsorial", "salmo", "sl "]),
+    ("evangelho", ["evangelho"]),
+    ("refrao", ["refrão", "r.", "resp."]),
+]
+TIPOS_LEITURA = ("primeira_leitura", "segunda_leitura", "salmo", "evangelho")
+
+_PRIORIDADE = {tipo: i for i, (tipo, _) in enumerate(MARCADORES)}
+_TIPO_DA_CHAVE = {chave: tipo for tipo, chaves in MARCADORES for chave in chaves}
+_RE_MARCADOR = re.compile("|".join(
+    re.escape(chave) for chave in sorted(_TIPO_DA_CHAVE, key=len, reverse=True)
+))
+
+# Referência bíblica:
+#   Gn 1,1-5 · 1Cor 12,4-11 · Mt 5,1-12a · Jo. 3:16    (_RE_REFERENCIA)
+#   Sl 22 (23), 1-6                                     (_RE_REFERENCIA_SALMO)
+# A segunda forma só é tentada se a primeira não aparecer na linha.
+_LIVRO = r"[A-Za-zÀ-ú]+"
+_RE_REFERENCIA = re.compile(rf"[1-3]?\s*{_LIVRO}\.?\s+\d+[,:]\s*\d+(?:-\d+)?(?:[a-z])?")
+_RE_REFERENCIA_SALMO = re.compile(rf"{_LIVRO}\s+\d+\s*\(\d+\)[,:]\s*\d+(?:-\d+)?")
+
+
+def limpar_texto(texto):
+    """Remove espaços extras e normaliza texto (\\xa0 e demais espaços Unicode inclusive)."""
+    return " ".join(texto.split())
+
+
+def extrair_referencia_biblica(texto):
+    """
+    Extrai referências bíblicas de diferentes formatos:
+    - Gn 1,1-5
+    - 1Cor 12,4-11
+    - Sl 22 (23), 1-6
+    - Mt 5,1-12a
+    """
+    match = _RE_REFERENCIA.search(texto) or _RE_REFERENCIA_SALMO.search(texto)
+    return match.group().strip() if match else ""
+
+
+def normalizar_referencia(referencia):
+    """
+    Chave canônica de uma referência: sem espaços e pontos, minúsculas,
+    ':' como ',' e travessões como '-' ("Jo. 3:16" e "jo 3,16" → "jo3,16").
+    """
+    chave = referencia.lower().replace(":", ",").replace("–", "-").replace("—", "-")
+    return "".join(chave.replace(".", "").split())
+
+
+def identificar_tipo_leitura(linha):
+    """Identifica qual tipo de leitura baseado em palavras-chave"""
+    linha_lower = linha.lower()
+    match = _RE_MARCADOR.search(linha_lower)
+    if match is None:                       # a maioria das linhas
+        return None
+    melhor = None
+    for match in _RE_MARCADOR.finditer(linha_lower, match.start()):
+        tipo = _TIPO_DA_CHAVE[match.group()]
+        if melhor is None or _PRIORIDADE[tipo] < _PRIORIDADE[melhor]:
+            melhor = tipo
+            if _PRIORIDADE[tipo] == 0:
+                break
+    return melhor
+
+
+def classificar_linha(linha):
+    """
+    (tipo, referência) numa chamada: o tipo como em identificar_tipo_leitura
+    e, só para marcadores de leitura (TIPOS_LEITURA), a referência bíblica;
+    nos demais casos a referência é "".
+    """
+    tipo = identificar_tipo_leitura(linha)
+    if tipo in TIPOS_LEITURA:
+        return tipo, extrair_referencia_biblica(linha)
+    return tipo, ""
@@ -0,0 +1,247 @@
+# =============================================================================
+# MÓDULO: Coletor HTTP assíncrono (Sacristia Digital)
+# Busca várias páginas em paralelo respeitando, por host, um teto de
+# conexões simultâneas e um orçamento de requisições (token bucket).
+# =============================================================================
+
+import asyncio
+import logging
+import time
+from typing import NamedTuple
+from urllib.parse import urlsplit
+
+import httpx
+
+from cache_html import CacheAusente, CacheHTML
+from controle_taxa import ControleAIMD, segundos_retry_after
+from resiliencia import PoliticaRetentativa, falha_transitoria
+from sessao_http import criar_cliente_async
+
+log = logging.getLogger(__name__)
+
+
+class Resposta(NamedTuple):
+    url: str
+    status: int | None          # None = erro de rede/timeout (ver `erro`)
+    texto: str
+    erro: str = ""
+
+
+# =============================================================================
+# LIMITADOR DE TAXA
+# =============================================================================
+
+class LimitadorTokenBucket:
+    """
+    Token bucket: `taxa` fichas por segundo, acumulando no máximo `capacidade`.
+    Cada requisição gasta uma ficha; sem ficha, espera a próxima. Os pedidos
+    são atendidos em ordem de chegada. Com `controle` (ControleAIMD) a taxa
+    é a dele, e uma pausa pedida por Retry-After segura todas as fichas.
+    """
+
+    def __init__(self, taxa: float, capacidade: int = 1, controle: ControleAIMD | None = None):
+        if taxa <= 0:
+            raise ValueError("taxa deve ser positiva")
+        self._taxa = taxa
+        self.controle = controle
+        self.capacidade = max(1, capacidade)
+        self._fichas = float(self.capacidade)
+        self._ultimo = time.monotonic()
+        self._trava = asyncio.Lock()
+
+    @property
+    def taxa(self) -> float:
+        return self.controle.taxa if self.controle is not None else self._taxa
+
+    def _repor(self) -> None:
+        agora = time.monotonic()
+        self._fichas = min(self.capacidade, self._fichas + (agora - self._ultimo) * self.taxa)
+        self._ultimo = agora
+
+    async def adquirir(self) -> None:
+        async with self._trava:
+            if self.controle is not None and self.controle.pausa_restante() > 0:
+                await asyncio.sleep(self.controle.pausa_restante())
+                self._fichas, self._ultimo = 0.0, time.monotonic()    # a pausa não vira rajada
+            self._repor()
+            while self._fichas < 1:
+                await asyncio.sleep((1 - self._fichas) / self.taxa)
+                self._repor()
+            self._fichas -= 1
+
+
+# =============================================================================
+# COLETOR
+# =============================================================================
+
+class ColetorAsync:
+    """
+    Baixa URLs com o cliente httpx de `sessao_http`. Por host: no máximo
+    `concorrencia_por_host` requisições em voo e `taxa` requisições/s
+    (rajadas de até `rajada`). Com `cache`, páginas frescas no disco não
+    gastam vaga nem ficha e as vencidas são revalidadas com GET condicional.
+    Com `taxa_maxima`, `taxa` é só a inicial: um ControleAIMD por host
+    (em `controles`) a ajusta entre 0,2 e `taxa_maxima` conforme as respostas.
+    Falhas transitórias são repetidas e cada host tem um disjuntor, conforme
+    `politica` (PoliticaRetentativa; padrão: 3 tentativas).
+
+        coletor = ColetorAsync(concorrencia_por_host=4, taxa=1.0)
+        respostas = coletor.coletar(urls)        # na ordem de `urls`
+    """
+
+    def __init__(self, concorrencia_por_host: int = 4, taxa: float = 1.0, rajada: int = 4,
+                 timeout: float = 30.0, headers: dict | None = None,
+                 cache: CacheHTML | None = None, taxa_maxima: float | None = None,
+                 politica: PoliticaRetentativa | None = None):
+        self.concorrencia_por_host = concorrencia_por_host
+        self.taxa = taxa
+        self.taxa_maxima = taxa_maxima
+        self.rajada = rajada
+        self.timeout = timeout
+        self.headers = headers or {}
+        self.cache = cache
+        self.politica = politica or PoliticaRetentativa()
+        self._hosts: dict[str, tuple[asyncio.Semaphore, LimitadorTokenBucket]] = {}
+        self.controles: dict[str, ControleAIMD] = {}    # sobrevivem entre execuções
+        self.tempo_ocupado = 0.0                # soma do tempo com vaga de conexão em uso
+
+    def _controles(self, url: str) -> tuple[asyncio.Semaphore, LimitadorTokenBucket]:
+        host = urlsplit(url).netloc
+        if host not in self._hosts:
+            controle = None
+            if self.taxa_maxima is not None:
+                if host not in self.controles:
+                    self.controles[host] = ControleAIMD(taxa=self.taxa, minima=min(0.2, self.taxa),
+                                                        maxima=max(self.taxa, self.taxa_maxima),
+                                                        nome=host)
+                controle = self.controles[host]
+            self._hosts[host] = (asyncio.Semaphore(self.concorrencia_por_host),
+                                 LimitadorTokenBucket(self.taxa, self.rajada, controle))
+        return self._hosts[host]
+
+    async def baixar(self, cliente: httpx.AsyncClient, url: str, ao_enviar=None) -> Resposta:
+        """`ao_enviar()` é chamado quando a requisição sai (já com vaga e ficha)."""
+        condicionais = {}
+        if self.cache is not None:
+            try:
+                entrada, condicionais = self.cache.preparar(url)
+            except CacheAusente:
+                return Resposta(url, None, "", "ausente no cache (replay)")
+            if entrada is not None:
+                return Resposta(url, entrada.status, entrada.texto)
+
+        disjuntor = self.politica.disjuntor(url)
+        for tentativa in range(self.politica.tentativas):
+            sonda = disjuntor.estado == "meio-aberto"
+            if not disjuntor.permitir():
+                # Host falhando: a data falha na hora em vez de esperar o timeout
+                return Resposta(url, None, "", f"disjuntor aberto para {disjuntor.host}")
+            try:
+                resposta, erro = await self._requisitar(cliente, url, condicionais,
+                                                        ao_enviar if tentativa == 0 else None)
+                if resposta is not None and self.cache is not None \
+                        and self.cache.orfa(url, resposta.status_code):
+                    condicionais = {}           # nada a renovar: pede a página inteira
+                    resposta, erro = await self._requisitar(cliente, url, condicionais)
+            except asyncio.CancelledError:
+                if sonda:
+                    disjuntor.sonda_em_voo = False
+                raise
+            status = resposta.status_code if resposta is not None else None
+            transitoria = falha_transitoria(status)
+            disjuntor.registrar(transitoria)
+            if not transitoria:
+                if tentativa:
+                    self.politica.recuperadas += 1
+                break
+            if tentativa + 1 == self.politica.tentativas:
+                self.politica.esgotadas += 1
+                break
+            self.politica.retentativas += 1
+            retry_after = None
+            if resposta is not None:
+                retry_after = segundos_retry_after(resposta.headers.get("Retry-After"))
+            espera = self.politica.espera(tentativa, retry_after)
+            log.info(f"   🔁 {url}: {erro or f'HTTP {status}'} — tentativa {tentativa + 2} "
+                     f"de {self.politica.tentativas} em {espera:.1f}s")
+            await asyncio.sleep(espera)
+
+        if resposta is None:
+            return Resposta(url, None, "", erro)
+        if self.cache is not None:
+            entrada = self.cache.registrar(url, resposta.status_code, resposta.text, resposta.headers)
+            return Resposta(url, entrada.status, entrada.texto)
+        return Resposta(url, resposta.status_code, resposta.text)
+
+    async def _requisitar(self, cliente: httpx.AsyncClient, url: str, condicionais: dict,
+                          ao_enviar=None) -> tuple[httpx.Response | None, str]:
+        """Uma tentativa: (resposta, "") ou (None, descrição do erro de rede)."""
+        semaforo, limitador = self._controles(url)
+        # Vaga primeiro, ficha depois: quem espera vaga não queima orçamento
+        async with semaforo:
+            await limitador.adquirir()
+            if ao_enviar is not None:
+                ao_enviar()
+            inicio = time.perf_counter()
+            resposta, erro = None, ""
+            try:
+                resposta = await cliente.get(url, headers=condicionais)
+            except httpx.TimeoutException:
+                erro = "timeout"
+            except httpx.HTTPError as e:
+                erro = str(e) or type(e).__name__
+            finally:
+                self.tempo_ocupado += time.perf_counter() - inicio
+            # Cancelada (hedge) não chega aqui: não é sinal sobre o servidor
+            if limitador.controle is not None:
+                if resposta is None:
+                    limitador.controle.registrar(None)
+                else:
+                    limitador.controle.registrar(resposta.status_code, time.perf_counter() - inicio,
+                                                 resposta.headers.get("Retry-After"))
+        return resposta, erro
+
+    def log_taxas(self) -> None:
+        for controle in self.controles.values():
+            log.info(f"🎚️  {controle.resumo()}")
+
+    def _cliente(self, urls: list[str]) -> httpx.AsyncClient:
+        self._hosts.clear()                     # primitivas asyncio presas ao loop atual
+        # Pool keep-alive por host, do tamanho da concorrência permitida
+        hosts = {urlsplit(url).hostname for url in urls}
+        tamanhos = {host: self.concorrencia_por_host for host in hosts if host}
+        return criar_cliente_async(headers=self.headers, timeout=self.timeout, tamanho_pool=tamanhos)
+
+    async def coletar_async(self, urls: list[str]) -> list[Resposta]:
+        async with self._cliente(urls) as cliente:
+            return await asyncio.gather(*(self.baixar(cliente, url) for url in urls))
+
+    async def entregar_async(self, urls: list[str], entregar, em_voo: int, parar=None) -> None:
+        """
+        Entrega cada resposta a `entregar(indice, resposta)` assim que chega
+        (fora de ordem). `entregar` pode bloquear — roda numa thread — e no
+        máximo `em_voo` URLs ficam entre o início do download e a entrega,
+        então um consumidor lento segura o coletor (contrapressão). Com
+        `parar` (threading.Event) ligado, nenhuma URL nova é iniciada.
+        """
+        vagas = asyncio.Semaphore(em_voo)
+
+        async def uma(cliente, indice, url):
+            try:
+                resposta = await self.baixar(cliente, url)
+                await asyncio.to_thread(entregar, indice, resposta)
+            finally:
+                vagas.release()
+
+        async with self._cliente(urls) as cliente:
+            tarefas = []
+            for indice, url in enumerate(urls):
+                await vagas.acquire()
+                if parar is not None and parar.is_set():
+                    break
+                tarefas.append(asyncio.create_task(uma(cliente, indice, url)))
+            await asyncio.gather(*tarefas)
+
+    def coletar(self, urls: list[str]) -> list[Resposta]:
+        """Versão síncrona (roda o próprio loop de eventos)."""
+        return asyncio.run(self.coletar_async(urls))
@@ -0,0 +1,149 @@
+# =============================================================================
+# MÓDULO: Controle adaptativo de taxa (Sacristia Digital)
+# AIMD por host: a taxa de requisições sobe aos poucos (aditivo) enquanto as
+# respostas chegam rápidas e saudáveis, e cai pela metade (multiplicativo)
+# em 429/5xx, timeout ou latência subindo. Um Retry-After do servidor pausa
+# o host pelo tempo pedido. Cada decisão fica registrada (e vai para o log)
+# para comparar com o ritmo fixo antigo.
+#
+# Uso (síncrono):
+#     controle = ControleAIMD(taxa=2.5, maxima=5.0, nome="paulus")
+#     resposta = sessao.get(...)
+#     controle.registrar(resposta.status_code, latencia, resposta.headers.get("Retry-After"))
+#     time.sleep(controle.espera())
+#
+# O ColetorAsync usa um por host quando recebe `taxa_maxima`.
+# =============================================================================
+
+import logging
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+log = logging.getLogger(__name__)
+
+# Respostas que indicam servidor sobrecarregado (além de timeout/erro de rede)
+STATUS_CONGESTAO = {429, 500, 502, 503, 504}
+
+
+def segundos_retry_after(valor) -> float | None:
+    """Retry-After em segundos (aceita "120" ou uma data HTTP); None se ausente/inválido."""
+    if not valor:
+        return None
+    try:
+        return max(0.0, float(valor))
+    except ValueError:
+        pass
+    try:
+        quando = parsedate_to_datetime(valor)
+    except (TypeError, ValueError):
+        return None
+    if quando.tzinfo is None:
+        quando = quando.replace(tzinfo=timezone.utc)
+    return max(0.0, (quando - datetime.now(timezone.utc)).total_seconds())
+
+
+class ControleAIMD:
+    """
+    Taxa (req/s) de um host entre `minima` e `maxima`:
+
+    - resposta saudável e latência normal: taxa += aumento / taxa (≈ +aumento
+      req/s a cada segundo de respostas boas); até a primeira redução
+      (partida lenta, como no TCP) taxa += aumento a cada resposta;
+    - 429/5xx, timeout/erro de rede (status None) ou média móvel da latência
+      acima de `limiar_latencia` × a base (a menor média vista, que sobe
+      devagar — `deriva_base` por resposta — quando a média fica acima
+      dela, para um aumento permanente da latência do host ou uma base
+      tirada numa rajada rápida não travarem a taxa em `minima`): taxa *= fator,
+      no máximo uma vez por `carencia` s (uma rajada de falhas das
+      requisições que já estavam em voo conta como um só sinal);
+    - Retry-After: além de reduzir, pausa o host pelo tempo pedido.
+    """
+
+    def __init__(self, taxa: float = 1.0, minima: float = 0.2, maxima: float = 4.0,
+                 aumento: float = 0.5, fator: float = 0.5, limiar_latencia: float = 2.0,
+                 carencia: float = 1.0, deriva_base: float = 0.02, nome: str = ""):
+        if not 0 < minima <= maxima:
+            raise ValueError("exige 0 < minima <= maxima")
+        self.taxa = min(max(taxa, minima), maxima)
+        self.minima = minima
+        self.maxima = maxima
+        self.aumento = aumento
+        self.fator = fator
+        self.limiar_latencia = limiar_latencia
+        self.carencia = carencia
+        self.deriva_base = deriva_base
+        self.nome = nome
+        self.latencia_media = None          # média móvel exponencial (s)
+        self.melhor_media = None
+        self.pausa_ate = 0.0                # time.monotonic() até quando o host está pausado
+        self.respostas = 0
+        self.reducoes = 0
+        self.decisoes: list[tuple[float, float, str]] = []     # (monotonic, taxa nova, motivo)
+        self.partida_lenta = True
+        self._ultima_reducao = float("-inf")
+        self._taxa_logada = self.taxa
+        self._inicio = time.monotonic()
+
+    def registrar(self, status: int | None, latencia: float | None = None, retry_after=None) -> None:
+        """Resultado de uma requisição: status HTTP (None = timeout/erro de rede) e latência (s)."""
+        self.respostas += 1
+        pausa = segundos_retry_after(retry_after)
+        if pausa:
+            self.pausa_ate = max(self.pausa_ate, time.monotonic() + pausa)
+
+        if status is None or status in STATUS_CONGESTAO:
+            motivo = "timeout/erro de rede" if status is None else f"HTTP {status}"
+            self._reduzir(motivo + (f", Retry-After {pausa:g}s" if pausa else ""))
+            return
+
+        if latencia is not None:
+            self.latencia_media = latencia if self.latencia_media is None \
+                else 0.8 * self.latencia_media + 0.2 * latencia
+            if self.respostas >= 5:
+                if self.melhor_media is None or self.latencia_media < self.melhor_media:
+                    self.melhor_media = self.latencia_media
+                else:
+                    self.melhor_media += self.deriva_base * (self.latencia_media - self.melhor_media)
+            if self.melhor_media and self.latencia_media > self.limiar_latencia * self.melhor_media:
+                self._reduzir(f"latência {self.latencia_media * 1000:.0f} ms "
+                              f"(base {self.melhor_media * 1000:.0f} ms)")
+                return
+
+        if self.taxa < self.maxima:
+            passo = self.aumento if self.partida_lenta else self.aumento / self.taxa
+            self.taxa = min(self.maxima, self.taxa + passo)
+            if self.taxa >= self._taxa_logada * 1.25 or self.taxa == self.maxima:
+                self._decidir("respostas saudáveis", log.info)
+
+    def _reduzir(self, motivo: str) -> None:
+        agora = time.monotonic()
+        if agora - self._ultima_reducao < self.carencia:
+            return
+        self._ultima_reducao = agora
+        self.partida_lenta = False
+        self.reducoes += 1
+        self.taxa = max(self.minima, self.taxa * self.fator)
+        self._decidir(motivo, log.warning)
+
+    def _decidir(self, motivo: str, nivel) -> None:
+        seta = "⬆️" if self.taxa > self._taxa_logada else "⬇️"
+        nivel(f"🎚️  {self.nome}: {seta} {self._taxa_logada:.2f} → {self.taxa:.2f} req/s ({motivo})")
+        self._taxa_logada = self.taxa
+        self.decisoes.append((time.monotonic(), self.taxa, motivo))
+
+    def pausa_restante(self) -> float:
+        return max(0.0, self.pausa_ate - time.monotonic())
+
+    def espera(self) -> float:
+        """Intervalo até a próxima requisição, para laços síncronos (substitui o sleep fixo)."""
+        return max(self.pausa_restante(), 1.0 / self.taxa)
+
+    def taxa_media(self) -> float:
+        """Requisições por segundo efetivas desde a criação do controle."""
+        return self.respostas / max(1e-9, time.monotonic() - self._inicio)
+
+    def resumo(self) -> str:
+        return (f"{self.nome}: taxa {self.taxa:.2f} req/s (média efetiva {self.taxa_media():.2f}) · "
+                f"{self.respostas} respostas · {self.reducoes} redução(ões) · "
+                f"{len(self.decisoes)} decisão(ões)")
@@ -1,13 +1,17 @@
 # =============================================================================
 # DIAGNÓSTICO AVANÇADO - Vatican News HTML Structure
-# Execute: python diagnostico_vatican.py
+# Execute: python diagnostico_vatican.py [--replay]
+# (usa o mesmo cache de HTML do minerador; --replay = só o cache, sem rede)
 # =============================================================================
 
-import requests
+import sys
 from bs4 import BeautifulSoup
 from datetime import datetime
 import json
 
+from cache_html import CacheAusente, CacheHTML, baixar_com_cache
+from sessao_http import obter_sessao
+
 url = "https://www.vaticannews.va/pt/palavra-do-dia/2025/01/29.html"
 
 headers = {
@@ -21,13 +25,19 @@ print("="*70)
 print(f"\n[URL] {url}\n")
 
 try:
-    response = requests.get(url, headers=headers, timeout=30)
+    cache = CacheHTML(replay="--replay" in sys.argv)
+    try:
+        response = baixar_com_cache(cache, obter_sessao(), url, headers=headers, timeout=30)
+    except CacheAusente:
+        print("[ERRO] Página ausente no cache (--replay). Rode uma vez sem --replay.")
+        exit(1)
+    print(f"[INFO] {cache.resumo()}")
     
-    if response.status_code != 200:
-        print(f"[ERRO] HTTP {response.status_code}")
+    if response.status != 200:
+        print(f"[ERRO] HTTP {response.status}")
         exit(1)
     
-    soup = BeautifulSoup(response.text, 'html.parser')
+    soup = BeautifulSoup(response.texto, 'html.parser')
     
     # =========================================================================
     # 1. IDENTIFICA CONTAINERS PRINCIPAIS
@@ -64,7 +74,7 @@ try:
         print("\n[ERRO] Nenhum container conhecido encontrado!")
         print("[HINT] Salvando HTML completo...")
         with open('debug_full.html', 'w', encoding='utf-8') as f:
-            f.write(response.text)
+            f.write(response.texto)
         print("[OK] Arquivo salvo: debug_full.html")
         exit(1)
     
@@ -0,0 +1,253 @@
+# =============================================================================
+# MÓDULO: Fila de backfill em SQLite (Sacristia Digital)
+# Um período longo (anos) é dividido em shards de N dias numa fila local em
+# SQLite. Cada trabalhador — processos nesta máquina ou em outras que vejam
+# o mesmo arquivo — reivindica um shard (com prazo de posse), minera e
+# confirma. Quem cai no meio do shard perde a posse quando o prazo vence e
+# o shard volta para a fila: o backfill retoma de onde parou.
+#
+#     fila = FilaBackfill()
+#     fila.criar(date(2020, 1, 1), date(2025, 12, 31), dias_por_shard=7)
+#     while (shard := fila.reivindicar("host-1:1234")):
+#         with fila.manter_posse(shard):
+#             ...
+#         fila.confirmar(shard, com_dados=7)            # ou fila.devolver(shard, erro)
+#     fila.progresso()
+#
+# Entre máquinas, o arquivo precisa estar num sistema de arquivos com
+# locks confiáveis (SQLite sobre NFS/SMB costuma não ter).
+# =============================================================================
+
+import contextlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from datetime import date, timedelta
+from typing import NamedTuple
+
+log = logging.getLogger(__name__)
+
+ARQUIVO_FILA = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".backfill.sqlite3")
+DIAS_POR_SHARD = 7
+PRAZO_POSSE = 15 * 60       # s; shard reivindicado e não confirmado nesse prazo volta à fila
+MAX_TENTATIVAS = 3          # reivindicações por shard antes de marcá-lo como 'falhou'
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS shards (
+    id           INTEGER PRIMARY KEY,
+    inicio       TEXT NOT NULL,             -- AAAA-MM-DD, inclusive
+    fim          TEXT NOT NULL,             -- AAAA-MM-DD, inclusive
+    dias         INTEGER NOT NULL,
+    estado       TEXT NOT NULL DEFAULT 'pendente',   -- pendente | em_andamento | concluido | falhou
+    trabalhador  TEXT,
+    posse_ate    REAL,                      -- time.time()
+    tentativas   INTEGER NOT NULL DEFAULT 0,
+    iniciado_em  REAL,
+    concluido_em REAL,
+    com_dados    INTEGER,
+    sem_dados    INTEGER,
+    transitorias INTEGER,
+    erro         TEXT,
+    UNIQUE (inicio, fim)
+);
+CREATE INDEX IF NOT EXISTS shards_estado ON shards (estado, inicio);
+"""
+
+
+class Shard(NamedTuple):
+    id: int
+    inicio: date
+    fim: date
+    trabalhador: str
+    tentativa: int
+
+    def datas(self) -> list[date]:
+        return [self.inicio + timedelta(days=i) for i in range((self.fim - self.inicio).days + 1)]
+
+
+class FilaBackfill:
+    """
+    Fila de shards em SQLite (modo WAL). Reivindicar é uma transação
+    IMMEDIATE — dois trabalhadores nunca pegam o mesmo shard — e vale por
+    `prazo_posse` s; confirmar/devolver só valem para o dono atual.
+    """
+
+    def __init__(self, caminho: str = ARQUIVO_FILA, prazo_posse: float = PRAZO_POSSE,
+                 max_tentativas: int = MAX_TENTATIVAS):
+        self.caminho = caminho
+        self.prazo_posse = prazo_posse
+        self.max_tentativas = max_tentativas
+        self._conexao = sqlite3.connect(caminho, timeout=30, isolation_level=None)
+        self._conexao.execute("PRAGMA journal_mode=WAL")
+        self._conexao.executescript(_ESQUEMA)
+
+    def fechar(self) -> None:
+        self._conexao.close()
+
+    def __enter__(self) -> "FilaBackfill":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.fechar()
+
+    @contextlib.contextmanager
+    def _transacao(self):
+        """BEGIN IMMEDIATE … COMMIT (ROLLBACK em erro): trava de escrita desde o início."""
+        self._conexao.execute("BEGIN IMMEDIATE")
+        try:
+            yield self._conexao
+        except BaseException:
+            self._conexao.execute("ROLLBACK")
+            raise
+        self._conexao.execute("COMMIT")
+
+    # -------------------------------------------------------------------------
+    # PRODUTOR
+    # -------------------------------------------------------------------------
+
+    def criar(self, inicio: date, fim: date, dias_por_shard: int = DIAS_POR_SHARD) -> int:
+        """Enfileira [inicio, fim] em shards de `dias_por_shard` dias; repetir não duplica. Devolve os novos."""
+        if fim < inicio:
+            raise ValueError("fim anterior ao início")
+        linhas = []
+        atual = inicio
+        while atual <= fim:
+            ultimo = min(fim, atual + timedelta(days=dias_por_shard - 1))
+            linhas.append((atual.isoformat(), ultimo.isoformat(), (ultimo - atual).days + 1))
+            atual = ultimo + timedelta(days=1)
+        with self._transacao() as c:
+            antes = c.total_changes
+            c.executemany("INSERT OR IGNORE INTO shards (inicio, fim, dias) VALUES (?, ?, ?)", linhas)
+            novos = c.total_changes - antes
+        log.info(f"🧩 {novos} shard(s) novo(s) de até {dias_por_shard} dias entre {inicio} e {fim} "
+                 f"({len(linhas) - novos} já na fila)")
+        return novos
+
+    # -------------------------------------------------------------------------
+    # TRABALHADOR
+    # -------------------------------------------------------------------------
+
+    def reivindicar(self, trabalhador: str) -> Shard | None:
+        """Próximo shard pendente (ou com posse vencida), já em nome de `trabalhador`; None se acabou."""
+        agora = time.time()
+        with self._transacao() as c:
+            # Posse vencida sem mais tentativas: trabalhador caiu nesse shard vezes demais
+            c.execute("UPDATE shards SET estado = 'falhou', erro = COALESCE(erro, 'posse vencida') "
+                      "WHERE estado = 'em_andamento' AND posse_ate < ? AND tentativas >= ?",
+                      (agora, self.max_tentativas))
+            linha = c.execute(
+                "SELECT id, inicio, fim, tentativas FROM shards "
+                "WHERE estado = 'pendente' OR (estado = 'em_andamento' AND posse_ate < ?) "
+                "ORDER BY inicio LIMIT 1", (agora,)
+            ).fetchone()
+            if linha is None:
+                return None
+            id_, inicio, fim, tentativas = linha
+            c.execute("UPDATE shards SET estado = 'em_andamento', trabalhador = ?, posse_ate = ?, "
+                      "tentativas = tentativas + 1, iniciado_em = ? WHERE id = ?",
+                      (trabalhador, agora + self.prazo_posse, agora, id_))
+        return Shard(id_, date.fromisoformat(inicio), date.fromisoformat(fim), trabalhador, tentativas + 1)
+
+    def renovar(self, shard: Shard) -> bool:
+        """Estende a posse (shards longos); False se ela já foi perdida."""
+        cursor = self._conexao.execute(
+            "UPDATE shards SET posse_ate = ? WHERE id = ? AND trabalhador = ? AND estado = 'em_andamento'",
+            (time.time() + self.prazo_posse, shard.id, shard.trabalhador))
+        return cursor.rowcount == 1
+
+    @contextlib.contextmanager
+    def manter_posse(self, shard: Shard, intervalo: float | None = None):
+        """
+        Renova a posse de `shard` a cada `intervalo` s (padrão: um terço do
+        prazo) enquanto o bloco roda, numa thread com conexão própria: um
+        shard lento (ritmo mínimo, disjuntor, backoff) não vence no meio.
+        """
+        intervalo = intervalo or self.prazo_posse / 3
+        parar = threading.Event()
+
+        def renovar():
+            with FilaBackfill(self.caminho, self.prazo_posse, self.max_tentativas) as fila:
+                while not parar.wait(intervalo):
+                    if not fila.renovar(shard):
+                        log.warning(f"⚠️  Shard {shard.id}: posse perdida (outro trabalhador o refaz)")
+                        return
+
+        thread = threading.Thread(target=renovar, name=f"posse-{shard.id}", daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            parar.set()
+            thread.join()
+
+    def confirmar(self, shard: Shard, com_dados: int = 0, sem_dados: int = 0,
+                  transitorias: int = 0) -> bool:
+        """Marca o shard como concluído; False se a posse tinha passado a outro trabalhador."""
+        cursor = self._conexao.execute(
+            "UPDATE shards SET estado = 'concluido', concluido_em = ?, com_dados = ?, sem_dados = ?, "
+            "transitorias = ?, erro = NULL WHERE id = ? AND trabalhador = ? AND estado = 'em_andamento'",
+            (time.time(), com_dados, sem_dados, transitorias, shard.id, shard.trabalhador))
+        return cursor.rowcount == 1
+
+    def devolver(self, shard: Shard, erro: str) -> bool:
+        """Devolve o shard à fila (ou 'falhou', esgotadas as tentativas); False se não era mais dono."""
+        estado = "falhou" if shard.tentativa >= self.max_tentativas else "pendente"
+        cursor = self._conexao.execute(
+            "UPDATE shards SET estado = ?, erro = ?, posse_ate = NULL "
+            "WHERE id = ? AND trabalhador = ? AND estado = 'em_andamento'",
+            (estado, erro, shard.id, shard.trabalhador))
+        return cursor.rowcount == 1
+
+    def reabrir_falhos(self) -> int:
+        """Volta os shards 'falhou' para a fila, com tentativas zeradas."""
+        cursor = self._conexao.execute(
+            "UPDATE shards SET estado = 'pendente', tentativas = 0 WHERE estado = 'falhou'")
+        return cursor.rowcount
+
+    # -------------------------------------------------------------------------
+    # PROGRESSO
+    # -------------------------------------------------------------------------
+
+    def progresso(self) -> dict:
+        """
+        Shards e dias por estado, dias/s dos shards concluídos e ETA (s) para
+        os dias restantes nesse ritmo (None sem shards concluídos ainda).
+        """
+        por_estado = {estado: {"shards": 0, "dias": 0}
+                      for estado in ("pendente", "em_andamento", "concluido", "falhou")}
+        for estado, shards, dias in self._conexao.execute(
+                "SELECT estado, COUNT(*), SUM(dias) FROM shards GROUP BY estado"):
+            por_estado[estado] = {"shards": shards, "dias": dias or 0}
+        primeiro, ultimo, concluidos = self._conexao.execute(
+            "SELECT MIN(iniciado_em), MAX(concluido_em), SUM(dias) FROM shards WHERE estado = 'concluido'"
+        ).fetchone()
+        totais = self._conexao.execute(
+            "SELECT COALESCE(SUM(com_dados), 0), COALESCE(SUM(sem_dados), 0), "
+            "COALESCE(SUM(transitorias), 0) FROM shards WHERE estado = 'concluido'").fetchone()
+
+        total_dias = sum(e["dias"] for e in por_estado.values())
+        restantes = por_estado["pendente"]["dias"] + por_estado["em_andamento"]["dias"]
+        ritmo = concluidos / (ultimo - primeiro) if concluidos and ultimo > primeiro else None
+        return {
+            "estados": por_estado,
+            "total_dias": total_dias,
+            "dias_restantes": restantes,
+            "com_dados": totais[0], "sem_dados": totais[1], "transitorias": totais[2],
+            "dias_por_segundo": ritmo,
+            "eta": restantes / ritmo if ritmo else None,
+        }
+
+    def log_progresso(self) -> None:
+        p = self.progresso()
+        e = p["estados"]
+        feitos = e["concluido"]["dias"]
+        percentual = feitos / p["total_dias"] * 100 if p["total_dias"] else 0.0
+        eta = "—" if p["eta"] is None else str(timedelta(seconds=round(p["eta"])))
+        ritmo = "—" if p["dias_por_segundo"] is None else f"{p['dias_por_segundo'] * 60:.1f} dias/min"
+        log.info(f"🧩 Backfill: {feitos}/{p['total_dias']} dias ({percentual:.1f}%) · "
+                 f"shards: {e['concluido']['shards']} concluídos, {e['em_andamento']['shards']} em andamento, "
+                 f"{e['pendente']['shards']} pendentes, {e['falhou']['shards']} falhos")
+        log.info(f"   ✅ {p['com_dados']} com leituras · ⚠️  {p['sem_dados']} sem · "
+                 f"⚡ {p['transitorias']} transitórias · ritmo {ritmo} · ETA {eta}")
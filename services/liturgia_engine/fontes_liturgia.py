@@ -0,0 +1,288 @@
+# =============================================================================
+# MÓDULO: Fontes da liturgia e requisições com hedge (Sacristia Digital)
+# Cada site de onde vem a palavra do dia é uma FonteLiturgia: sabe montar a
+# URL de uma data, dizer se uma página parece completa e extrair dela uma
+# linha no formato de `liturgia_palavra` (COLUNAS). O ColetorComHedge busca
+# cada data na fonte principal e, se ela não responder dentro do percentil
+# de latência observado (ou falhar), dispara a próxima fonte e fica com a
+# primeira página completa.
+#
+#     fontes = [FonteVatican(), FontePaulus()]       # FonteVatican: miner_liturgia
+#     coletor = ColetorComHedge(fontes, concorrencia_por_host=4, taxa=1.0)
+#     respostas = coletor.coletar(datas)
+#     linha = processar_por_fonte(r.status, r.texto, data, r.url, fontes, lecionario)
+# =============================================================================
+
+import asyncio
+import logging
+import time
+from collections import Counter, deque
+
+import httpx
+from bs4 import BeautifulSoup, SoupStrainer
+
+from classificador import extrair_referencia_biblica, limpar_texto
+from coletor_async import ColetorAsync, Resposta
+from lecionario import Lecionario
+
+log = logging.getLogger(__name__)
+
+# Linha da tabela liturgia_palavra (todas as fontes devolvem este formato)
+COLUNAS = (
+    "data",
+    "primeira_leitura_ref", "primeira_leitura_texto",
+    "salmo_ref", "salmo_refrao", "salmo_texto",
+    "segunda_leitura_ref", "segunda_leitura_texto",
+    "evangelho_ref", "evangelho_texto",
+)
+
+# Hedge: espera o percentil da latência da fonte principal antes de disparar
+# a seguinte; sem amostras suficientes, espera HEDGE_INICIAL segundos
+PERCENTIL_HEDGE = 0.95
+HEDGE_INICIAL = 2.0
+AMOSTRAS_MINIMAS = 10
+JANELA_LATENCIAS = 200
+
+
+# =============================================================================
+# FONTES
+# =============================================================================
+
+class FonteLiturgia:
+    """
+    Interface de uma fonte. Subclasses definem `nome`, `url_base`,
+    `url(data_alvo)` e `extrair(html, data_alvo)` (dict com as colunas que
+    a página tiver, ou None); `processar` valida o status e normaliza para
+    COLUNAS. Devem ser picklable: `processar` roda no pool de processos.
+    """
+
+    nome = "fonte"
+    url_base = ""
+
+    def url(self, data_alvo) -> str:
+        raise NotImplementedError
+
+    def extrair(self, html: str, data_alvo) -> dict | None:
+        raise NotImplementedError
+
+    def atende(self, url: str) -> bool:
+        return url.startswith(self.url_base)
+
+    def parece_completa(self, resposta: Resposta) -> bool:
+        """Teste barato (sem parse), feito no download: 200 e com Evangelho."""
+        return resposta.status == 200 and "evangelho" in resposta.texto.lower()
+
+    def processar(self, status: int, html: str, data_alvo, lecionario: Lecionario | None = None) -> dict | None:
+        """
+        Linha normalizada (COLUNAS) ou None se a página não tiver o Evangelho.
+        Com `lecionario`, páginas de leituras já conhecidas saem do cache e
+        as demais alimentam o cache depois do parse.
+        """
+        if status != 200:
+            log.warning(f"   ⚠️  {self.nome}: HTTP {status}")
+            return None
+        if lecionario is not None:
+            dados = lecionario.montar(html)
+            if dados is not None:
+                log.info(f"   📚 {self.nome}: leituras do lecionário")
+                return normalizar(dados, data_alvo)
+        linha = normalizar(self.extrair(html, data_alvo), data_alvo)
+        if linha is not None and lecionario is not None:
+            lecionario.guardar(html, linha)
+        return linha
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.url_base!r})"
+
+
+def normalizar(dados: dict | None, data_alvo) -> dict | None:
+    """Completa `dados` com as COLUNAS ausentes; None se faltar o Evangelho."""
+    if not dados:
+        return None
+    linha = {coluna: (dados.get(coluna) or "").strip() for coluna in COLUNAS}
+    linha["data"] = data_alvo.strftime('%Y-%m-%d')
+    if not (linha["evangelho_ref"] and linha["evangelho_texto"]):
+        return None
+    return linha
+
+
+class FontePaulus(FonteLiturgia):
+    """
+    Portal Paulus (liturgia-diaria?dia=&mes=&ano=): cada leitura é um <h2>
+    ("1ª LEITURA - Hb 10,11-18") seguido de div.corpo, e o refrão do salmo
+    fica em div.refrao, tudo dentro de div.liturgia-diaria.
+    """
+
+    nome = "paulus"
+    TITULOS = {
+        "primeira_leitura": "1ª LEITURA",
+        "salmo": "SALMO RESPONSORIAL",
+        "segunda_leitura": "2ª LEITURA",
+        "evangelho": "EVANGELHO",
+    }
+
+    def __init__(self, url_base: str = "https://www.paulus.com.br/portal/liturgia-diaria/"):
+        self.url_base = url_base
+
+    def url(self, data_alvo) -> str:
+        return f"{self.url_base}?dia={data_alvo.day}&mes={data_alvo.month}&ano={data_alvo.year}"
+
+    def parece_completa(self, resposta: Resposta) -> bool:
+        return super().parece_completa(resposta) and "liturgia-diaria" in resposta.texto
+
+    def extrair(self, html: str, data_alvo) -> dict | None:
+        soup = BeautifulSoup(html, "html.parser", parse_only=SoupStrainer("div", class_="liturgia-diaria"))
+        container = soup.find("div", class_="liturgia-diaria")
+        if not container:
+            return None
+
+        dados = {}
+        for chave, titulo in self.TITULOS.items():
+            h2 = container.find("h2", string=lambda t: t and titulo in t.upper())
+            if not h2:
+                continue
+            cabecalho = limpar_texto(h2.get_text())
+            corpo = h2.find_next_sibling("div", class_="corpo")
+            dados[f"{chave}_ref"] = extrair_referencia_biblica(cabecalho) or cabecalho
+            dados[f"{chave}_texto"] = "\n".join(
+                limpar_texto(linha) for linha in corpo.get_text("\n").split("\n") if linha.strip()
+            ) if corpo else ""
+
+        refrao = container.find("div", class_="refrao")
+        if refrao:
+            dados["salmo_refrao"] = limpar_texto(refrao.get_text()).removeprefix("R.").strip()
+        return dados
+
+
+def processar_por_fonte(status, html, data_alvo, url, fontes, lecionario=None):
+    """`processar` do pipeline: extrai com a fonte dona de `url`."""
+    fonte = next((f for f in fontes if f.atende(url)), None)
+    if fonte is None:
+        log.error(f"   ❌ Nenhuma fonte atende {url}")
+        return None
+    return fonte.processar(status, html, data_alvo, lecionario)
+
+
+# =============================================================================
+# LATÊNCIA OBSERVADA
+# =============================================================================
+
+class PercentilLatencia:
+    """Percentil das últimas `janela` latências (s); `inicial` até juntar `minimo` amostras."""
+
+    def __init__(self, percentil: float = PERCENTIL_HEDGE, inicial: float = HEDGE_INICIAL,
+                 minimo: int = AMOSTRAS_MINIMAS, janela: int = JANELA_LATENCIAS):
+        self.percentil = percentil
+        self.inicial = inicial
+        self.minimo = minimo
+        self._amostras = deque(maxlen=janela)
+
+    def registrar(self, segundos: float) -> None:
+        self._amostras.append(segundos)
+
+    def limite(self) -> float:
+        if len(self._amostras) < self.minimo:
+            return self.inicial
+        ordenadas = sorted(self._amostras)
+        return ordenadas[min(len(ordenadas) - 1, int(self.percentil * len(ordenadas)))]
+
+
+# =============================================================================
+# COLETOR COM HEDGE
+# =============================================================================
+
+class ColetorComHedge(ColetorAsync):
+    """
+    ColetorAsync cujos itens são datas: cada uma é buscada em `fontes[0]`
+    e, se a resposta não chegar em `latencia.limite()` segundos (o percentil
+    `percentil` das latências da principal, contadas a partir do envio) ou
+    chegar incompleta, na fonte seguinte — sem cancelar a que está em voo.
+    Vence a primeira resposta completa (`parece_completa`); as demais são
+    canceladas. Cada host segue com o próprio teto de conexões e token bucket.
+
+    Sem resposta completa, devolve a última recebida.
+    """
+
+    def __init__(self, fontes: list[FonteLiturgia], percentil: float = PERCENTIL_HEDGE,
+                 hedge_inicial: float = HEDGE_INICIAL, **kwargs):
+        if not fontes:
+            raise ValueError("informe ao menos uma fonte")
+        super().__init__(**kwargs)
+        self.fontes = list(fontes)
+        self.latencia = PercentilLatencia(percentil, hedge_inicial)
+        self.hedges = 0                         # fontes secundárias disparadas
+        self.vitorias = Counter()               # resposta usada, por fonte
+
+    def _cliente(self, datas) -> httpx.AsyncClient:
+        return super()._cliente([fonte.url_base for fonte in self.fontes])
+
+    async def baixar(self, cliente: httpx.AsyncClient, data_alvo) -> Resposta:
+        principal = self.fontes[0]
+        pendentes = list(self.fontes)
+        em_voo: dict[asyncio.Task, FonteLiturgia] = {}
+        enviada_em: dict[FonteLiturgia, float] = {}
+        enviada = asyncio.Event()               # a principal saiu da fila local (vaga/ficha)
+        recebidas: list[Resposta] = []
+
+        def disparar() -> bool:
+            if not pendentes:
+                return False
+            fonte = pendentes.pop(0)
+            if fonte is not principal:
+                self.hedges += 1
+                log.info(f"   🔀 {data_alvo.strftime('%d/%m/%Y')}: acionando {fonte.nome}")
+
+            def ao_enviar():
+                enviada_em[fonte] = time.perf_counter()
+                if fonte is principal:
+                    enviada.set()
+
+            tarefa = asyncio.create_task(super(ColetorComHedge, self).baixar(
+                cliente, fonte.url(data_alvo), ao_enviar=ao_enviar))
+            em_voo[tarefa] = fonte
+            return True
+
+        disparar()
+        marco = None                            # desde quando corre o prazo do próximo hedge
+        try:
+            while em_voo:
+                if marco is None and enviada.is_set():
+                    marco = enviada_em[principal]
+                if marco is None:
+                    # Na fila da própria principal o prazo não corre: esperar
+                    # vaga local não é lentidão do site
+                    envio = asyncio.create_task(enviada.wait())
+                    feitas, _ = await asyncio.wait({*em_voo, envio}, return_when=asyncio.FIRST_COMPLETED)
+                    envio.cancel()
+                    feitas.discard(envio)
+                else:
+                    prazo = max(0.0, marco + self.latencia.limite() - time.perf_counter())
+                    feitas, _ = await asyncio.wait(em_voo, timeout=prazo if pendentes else None,
+                                                   return_when=asyncio.FIRST_COMPLETED)
+                    if not feitas:              # acima do percentil: corre a próxima fonte
+                        disparar()
+                        marco = time.perf_counter()
+                        continue
+                for tarefa in feitas:
+                    fonte = em_voo.pop(tarefa)
+                    resposta = tarefa.result()
+                    if fonte is principal and fonte in enviada_em:
+                        self.latencia.registrar(time.perf_counter() - enviada_em[fonte])
+                    recebidas.append(resposta)
+                    if fonte.parece_completa(resposta):
+                        self.vitorias[fonte.nome] += 1
+                        return resposta
+                if not em_voo and disparar():   # falhou e não há outra em voo
+                    marco = time.perf_counter()
+        finally:
+            for tarefa, fonte in em_voo.items():
+                tarefa.cancel()
+                if fonte is principal and fonte in enviada_em:
+                    # Limite inferior: a principal ainda não tinha respondido
+                    self.latencia.registrar(time.perf_counter() - enviada_em[fonte])
+        return recebidas[-1]
+
+    def resumo(self) -> str:
+        vitorias = ", ".join(f"{nome} {n}" for nome, n in self.vitorias.most_common()) or "nenhuma"
+        return (f"Fontes: {vitorias} · {self.hedges} hedge(s) · "
+                f"p{self.latencia.percentil * 100:g} da principal {self.latencia.limite():.2f}s")
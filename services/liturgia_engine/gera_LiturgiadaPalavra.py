@@ -5,15 +5,25 @@
 # REQUER: pip install requests beautifulsoup4
 # =============================================================================
 
-import requests
-from bs4 import BeautifulSoup
+import logging
 from datetime import datetime, timedelta
 import time
 
+import requests
+
+# Fonte, ritmo e sessão HTTP (pool keep-alive) compartilhados com o minerador do Vatican News
+from controle_taxa import ControleAIMD
+from fontes_liturgia import FontePaulus
+from sessao_http import estatisticas, obter_sessao
+
 # =============================
 # 1 - CONFIGURAÇÕES INICIAIS
 # =============================
 BASE_URL = "https://www.paulus.com.br/portal/liturgia-diaria/"
+FONTE = FontePaulus(BASE_URL)
+# Ritmo adaptativo no lugar do sleep(0.4) fixo: começa nos mesmos 2,5 req/s,
+# sobe até 5 enquanto a Paulus responde bem e recua em 429/5xx/timeout
+CONTROLE = ControleAIMD(taxa=2.5, maxima=5.0, nome="paulus")
 DATA_INICIO = datetime.now()
 DATA_FIM = datetime(2027, 1, 31)
 
@@ -42,52 +52,22 @@ HTML_TEMPLATE_START = """
 def extrair_liturgia(data_alvo):
     """
     Realiza o Webscraping de uma data específica na Paulus.
+    O parse fica em FontePaulus (fontes_liturgia), a mesma usada pelo
+    minerador do Vatican News como fonte secundária: a linha sai já no
+    formato de 'liturgia_palavra'.
     """
-    params = {
-        "dia": data_alvo.day,
-        "mes": data_alvo.month,
-        "ano": data_alvo.year
-    }
-    
     try:
         # User-Agent para evitar bloqueio
         headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
-        response = requests.get(BASE_URL, params=params, headers=headers, timeout=15)
-        soup = BeautifulSoup(response.text, 'html.parser')
-        container = soup.find('div', class_='liturgia-diaria')
-        
-        if not container:
-            return None
-
-        # Função auxiliar para extrair texto por cabeçalho
-        def get_content(header_name):
-            # Procura o H2 que contém o nome da leitura
-            h2 = container.find('h2', string=lambda t: t and header_name in t.upper())
-            if h2:
-                # O texto está na div .corpo que vem logo após o h2
-                corpo = h2.find_next_sibling('div', class_='corpo')
-                return h2.get_text(strip=True), corpo.get_text(strip=True) if corpo else ""
-            return "", ""
-
-        # Mapeamento exato para as colunas da sua tabela 'liturgia_palavra'
-        p1_ref, p1_txt = get_content("1ª LEITURA")
-        salmo_ref, salmo_txt = get_content("SALMO RESPONSORIAL")
-        ev_ref, ev_txt = get_content("EVANGELHO")
-        
-        # O refrão do salmo na Paulus tem uma classe específica
-        refrao_tag = container.find('div', class_='refrao')
-        salmo_refrao = refrao_tag.get_text(strip=True) if refrao_tag else ""
-
-        return {
-            "data": data_alvo.strftime('%Y-%m-%d'),
-            "primeira_leitura_ref": p1_ref,
-            "primeira_leitura_texto": p1_txt,
-            "salmo_ref": salmo_ref,
-            "salmo_refrao": salmo_refrao,
-            "salmo_texto": salmo_txt,
-            "evangelho_ref": ev_ref,
-            "evangelho_texto": ev_txt
-        }
+        inicio = time.perf_counter()
+        response = obter_sessao().get(FONTE.url(data_alvo), headers=headers, timeout=15)
+        CONTROLE.registrar(response.status_code, time.perf_counter() - inicio,
+                           response.headers.get("Retry-After"))
+        return FONTE.processar(response.status_code, response.text, data_alvo)
+    except requests.exceptions.RequestException as e:
+        CONTROLE.registrar(None)
+        print(f"\n[ERRO] {data_alvo.date()}: {e}")
+        return None
     except Exception as e:
         print(f"\n[ERRO] {data_alvo.date()}: {e}")
         return None
@@ -95,6 +75,7 @@ def extrair_liturgia(data_alvo):
 # =============================
 # 2 - EXECUÇÃO DO LOOP MESTRE
 # =============================
+logging.basicConfig(level=logging.INFO, format="%(message)s")   # decisões de ritmo do CONTROLE
 current_date = DATA_INICIO
 dados_totais = []
 
@@ -130,12 +111,16 @@ with open("preview_liturgia.html", "w", encoding="utf-8") as f:
             
         # Incrementa um dia
         current_date += timedelta(days=1)
-        # Delay de cortesia para o servidor da Paulus não nos bloquear
-        time.sleep(0.4)
+        # Delay de cortesia para o servidor da Paulus não nos bloquear (adaptativo)
+        time.sleep(CONTROLE.espera())
 
     f.write("</body></html>")
 
 print(f"\n\n✅ PROCESSO CONCLUÍDO!")
 print(f"📊 Total de dias minerados: {len(dados_totais)}")
 print(f"📄 Relatório gerado: preview_liturgia.html")
+conexoes = estatisticas()
+print(f"🔌 Conexões: {conexoes['conexoes_abertas']} abertas, {conexoes['conexoes_reusadas']} reusadas "
+      f"em {conexoes['requisicoes']} requisições")
+print(f"🎚️  Ritmo: {CONTROLE.resumo()}")
 print(f"💡 Próximo passo: Importar {len(dados_totais)} registros para o Supabase.")
\ No newline at end of file
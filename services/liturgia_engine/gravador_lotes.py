@@ -0,0 +1,129 @@
+# =============================================================================
+# MÓDULO: Gravação em lotes no Supabase (Sacristia Digital)
+# Acumula as linhas mineradas e faz UPSERT em lotes — por tamanho ou por
+# tempo decorrido — em vez de uma ida ao banco por data. Se um lote falha,
+# ele é dividido ao meio até isolar as linhas ruins: só elas são
+# retentadas e, persistindo o erro, relatadas.
+#
+# Uso:
+#     with GravadorEmLotes(sb, tamanho_lote=50, intervalo=5.0) as gravador:
+#         for linha in linhas:
+#             gravador.adicionar(linha)
+#     gravador.gravadas, gravador.falhas
+# =============================================================================
+
+import logging
+import time
+
+from postgrest.types import ReturnMethod
+
+log = logging.getLogger(__name__)
+
+
+class GravadorEmLotes:
+    """
+    Buffer de UPSERT para `tabela` (chave de conflito `chave`). Descarrega
+    quando junta `tamanho_lote` linhas ou quando a mais antiga espera há
+    `intervalo` segundos (verificado a cada `adicionar`/`talvez_descarregar`).
+    """
+
+    def __init__(self, sb, tabela: str = "liturgia_palavra", chave: str = "data",
+                 tamanho_lote: int = 50, intervalo: float = 5.0, tentativas: int = 3):
+        self.sb = sb
+        self.tabela = tabela
+        self.chave = chave
+        self.tamanho_lote = tamanho_lote
+        self.intervalo = intervalo
+        self.tentativas = tentativas
+        self._buffer: list[dict] = []
+        self._primeira_em: float | None = None
+        self.gravadas = 0
+        self.falhas: list[tuple[object, str]] = []    # (chave da linha, erro)
+        self.lotes: list[dict] = []                   # {"linhas", "latencia", "ok"} por requisição
+
+    def __enter__(self) -> "GravadorEmLotes":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.descarregar()
+        self.log_resumo()
+
+    # -------------------------------------------------------------------------
+    # Entrada
+    # -------------------------------------------------------------------------
+
+    def adicionar(self, linha: dict) -> None:
+        if not self._buffer:
+            self._primeira_em = time.monotonic()
+        self._buffer.append(linha)
+        self.talvez_descarregar()
+
+    def talvez_descarregar(self) -> None:
+        if not self._buffer:
+            return
+        if (len(self._buffer) >= self.tamanho_lote
+                or time.monotonic() - self._primeira_em >= self.intervalo):
+            self.descarregar()
+
+    def descarregar(self) -> None:
+        lote, self._buffer = self._buffer, []
+        if lote:
+            self._gravar(lote)
+
+    # -------------------------------------------------------------------------
+    # Envio
+    # -------------------------------------------------------------------------
+
+    def _upsert(self, lote: list[dict]) -> str | None:
+        """Uma requisição; devolve a mensagem de erro ou None."""
+        inicio = time.perf_counter()
+        erro = None
+        try:
+            (
+                self.sb.table(self.tabela)
+                .upsert(lote, on_conflict=self.chave, returning=ReturnMethod.minimal)
+                .execute()
+            )
+        except Exception as e:
+            erro = str(e) or type(e).__name__
+        latencia = time.perf_counter() - inicio
+        self.lotes.append({"linhas": len(lote), "latencia": latencia, "ok": erro is None})
+        log.info(f"   💾 Lote de {len(lote)} linha(s) em {latencia * 1e3:.0f} ms"
+                 + (f" — falhou: {erro}" if erro else ""))
+        return erro
+
+    def _gravar(self, lote: list[dict]) -> None:
+        """Envia o lote; em falha, divide ao meio até isolar as linhas ruins."""
+        erro = self._upsert(lote)
+        if erro is None:
+            self.gravadas += len(lote)
+            return
+        if len(lote) > 1:
+            meio = len(lote) // 2
+            self._gravar(lote[:meio])
+            self._gravar(lote[meio:])
+            return
+
+        # Linha isolada: retenta com backoff antes de desistir dela
+        for tentativa in range(2, self.tentativas + 1):
+            time.sleep(0.5 * 2 ** (tentativa - 2))
+            erro = self._upsert(lote)
+            if erro is None:
+                self.gravadas += 1
+                return
+        chave = lote[0].get(self.chave)
+        self.falhas.append((chave, erro))
+        log.error(f"   ❌ Linha {chave} não gravada após {self.tentativas} tentativas: {erro}")
+
+    # -------------------------------------------------------------------------
+    # Relatório
+    # -------------------------------------------------------------------------
+
+    def log_resumo(self) -> None:
+        if not self.lotes:
+            return
+        latencias = sorted(l["latencia"] * 1e3 for l in self.lotes)
+        p50 = latencias[len(latencias) // 2]
+        log.info(f"💾 Gravação: {self.gravadas} linhas em {len(self.lotes)} requisições "
+                 f"(latência ms: mín {latencias[0]:.0f} · p50 {p50:.0f} · máx {latencias[-1]:.0f}) "
+                 f"| {len(self.falhas)} falha(s)")
@@ -0,0 +1,176 @@
+# =============================================================================
+# MÓDULO: Lecionário local (Sacristia Digital)
+# As leituras se repetem: o ciclo dominical (anos A/B/C) e o ferial (anos
+# I/II) voltam aos mesmos trechos. O lecionário guarda, em SQLite, o texto
+# de cada leitura pela referência normalizada e cada conjunto de leituras
+# já visto; uma página cujas referências já estão todas lá é montada do
+# cache, com uma varredura leve do HTML (regex, sem árvore), em vez do
+# parse completo.
+#
+#     lecionario = Lecionario()
+#     dados = lecionario.montar(html)            # None: referências novas
+#     if dados is None:
+#         dados = ...parse completo...; lecionario.guardar(html, dados)
+#
+# Textos iguais (mesmo hash) são gravados uma vez só, seja qual for a data
+# ou a referência que os usa.
+# =============================================================================
+
+import contextlib
+import hashlib
+import html as html_lib
+import json
+import logging
+import os
+import re
+import sqlite3
+
+from classificador import TIPOS_LEITURA, classificar_linha, limpar_texto, normalizar_referencia
+
+log = logging.getLogger(__name__)
+
+ARQUIVO_LECIONARIO = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".lecionario.sqlite3")
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS textos (
+    id     INTEGER PRIMARY KEY,
+    hash   TEXT NOT NULL UNIQUE,            -- sha1 do texto
+    texto  TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS referencias (
+    ref       TEXT PRIMARY KEY,             -- normalizar_referencia(...)
+    texto_id  INTEGER NOT NULL REFERENCES textos (id)
+);
+CREATE TABLE IF NOT EXISTS paginas (
+    assinatura    TEXT PRIMARY KEY,         -- pares tipo=ref que a varredura encontra na página
+    refs          TEXT NOT NULL,            -- JSON {tipo: referência como veio do parse}
+    salmo_refrao  TEXT NOT NULL DEFAULT '',
+    usos          INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+_RE_INVISIVEL = re.compile(r"<(script|style|noscript)\b.*?</\1\s*>", re.IGNORECASE | re.DOTALL)
+_RE_TAG = re.compile(r"<[^>]+>")
+
+# Uma conexão por arquivo em cada processo: o Lecionario vai em pickle para
+# o pool de extração a cada página e não deve reabrir o banco toda vez
+_CONEXOES: dict[str, sqlite3.Connection] = {}
+
+
+def varrer_referencias(html: str) -> tuple[str, dict[str, str]] | None:
+    """
+    Varredura leve: (assinatura, {tipo: referência normalizada}) das linhas
+    de marcador que trazem referência (vale a última de cada tipo, como no
+    parse); None se não houver nenhuma.
+    """
+    pares = set()
+    ultimas = {}
+    for trecho in _RE_TAG.split(_RE_INVISIVEL.sub("", html)):
+        if len(trecho) <= 3:
+            continue
+        tipo, ref = classificar_linha(limpar_texto(html_lib.unescape(trecho)))
+        if tipo in TIPOS_LEITURA and ref:
+            ultimas[tipo] = normalizar_referencia(ref)
+            pares.add(f"{tipo}={ultimas[tipo]}")
+    if not ultimas:
+        return None
+    return "|".join(sorted(pares)), ultimas
+
+
+class Lecionario:
+    """
+    Cache de leituras em SQLite (modo WAL), compartilhado pelos processos
+    de extração. Uma página só é montada do cache se a mesma assinatura já
+    veio de um parse completo cujas referências coincidiram com as da
+    varredura — layout que a varredura não lê bem nunca entra.
+    """
+
+    def __init__(self, caminho: str = ARQUIVO_LECIONARIO):
+        self.caminho = caminho
+
+    def _conexao(self) -> sqlite3.Connection:
+        if self.caminho not in _CONEXOES:
+            conexao = sqlite3.connect(self.caminho, timeout=30, isolation_level=None)
+            conexao.execute("PRAGMA journal_mode=WAL")
+            conexao.executescript(_ESQUEMA)
+            _CONEXOES[self.caminho] = conexao
+        return _CONEXOES[self.caminho]
+
+    def fechar(self) -> None:
+        """Fecha a conexão deste processo com o arquivo."""
+        conexao = _CONEXOES.pop(self.caminho, None)
+        if conexao is not None:
+            conexao.close()
+
+    @contextlib.contextmanager
+    def _transacao(self):
+        conexao = self._conexao()
+        conexao.execute("BEGIN IMMEDIATE")
+        try:
+            yield conexao
+        except BaseException:
+            conexao.execute("ROLLBACK")
+            raise
+        conexao.execute("COMMIT")
+
+    def montar(self, html: str) -> dict | None:
+        """Colunas de leitura (sem "data") a partir do cache; None se a página tem algo novo."""
+        varredura = varrer_referencias(html)
+        if varredura is None:
+            return None
+        conexao = self._conexao()
+        pagina = conexao.execute("SELECT refs, salmo_refrao FROM paginas WHERE assinatura = ?",
+                                 (varredura[0],)).fetchone()
+        if pagina is None:
+            return None
+        dados = {"salmo_refrao": pagina[1]}
+        for tipo, ref in json.loads(pagina[0]).items():
+            linha = conexao.execute(
+                "SELECT t.texto FROM referencias r JOIN textos t ON t.id = r.texto_id WHERE r.ref = ?",
+                (normalizar_referencia(ref),)).fetchone()
+            if linha is None:
+                return None
+            dados[f"{tipo}_ref"] = ref
+            dados[f"{tipo}_texto"] = linha[0]
+        conexao.execute("UPDATE paginas SET usos = usos + 1 WHERE assinatura = ?", (varredura[0],))
+        return dados
+
+    def guardar(self, html: str, dados: dict) -> None:
+        """
+        Registra as leituras de um parse completo (`dados` nas colunas de
+        liturgia_palavra) — só se a varredura achou as mesmas referências e
+        todas têm texto; nesse caso o texto substitui o que a referência tinha.
+        """
+        leituras = {tipo: (dados[f"{tipo}_ref"], dados.get(f"{tipo}_texto") or "")
+                    for tipo in TIPOS_LEITURA if dados.get(f"{tipo}_ref")}
+        varredura = varrer_referencias(html)
+        confere = varredura is not None and all(texto for _, texto in leituras.values()) and \
+            varredura[1] == {tipo: normalizar_referencia(ref) for tipo, (ref, _) in leituras.items()}
+        if not confere:
+            return                              # parse que a varredura não confirma não entra no cache
+        with self._transacao() as c:
+            for ref, texto in leituras.values():
+                chave = hashlib.sha1(texto.encode("utf-8")).hexdigest()
+                c.execute("INSERT OR IGNORE INTO textos (hash, texto) VALUES (?, ?)", (chave, texto))
+                # Página conferida: o texto dela vale para a referência (substitui o anterior)
+                c.execute("INSERT INTO referencias (ref, texto_id) SELECT ?, id FROM textos WHERE hash = ? "
+                          "ON CONFLICT (ref) DO UPDATE SET texto_id = excluded.texto_id",
+                          (normalizar_referencia(ref), chave))
+            c.execute("INSERT INTO paginas (assinatura, refs, salmo_refrao) VALUES (?, ?, ?) "
+                      "ON CONFLICT (assinatura) DO UPDATE SET refs = excluded.refs, "
+                      "salmo_refrao = excluded.salmo_refrao",
+                      (varredura[0], json.dumps({tipo: ref for tipo, (ref, _) in leituras.items()},
+                                                ensure_ascii=False),
+                       dados.get("salmo_refrao") or ""))
+
+    def usos(self) -> int:
+        """Páginas montadas do cache até agora (todas as execuções)."""
+        return self._conexao().execute("SELECT COALESCE(SUM(usos), 0) FROM paginas").fetchone()[0]
+
+    def resumo(self) -> str:
+        conexao = self._conexao()
+        paginas, = conexao.execute("SELECT COUNT(*) FROM paginas").fetchone()
+        refs, = conexao.execute("SELECT COUNT(*) FROM referencias").fetchone()
+        textos, tamanho = conexao.execute("SELECT COUNT(*), COALESCE(SUM(LENGTH(texto)), 0) FROM textos").fetchone()
+        return (f"Lecionário: {paginas} conjunto(s) de leituras, {refs} referência(s), "
+                f"{textos} texto(s) distinto(s) ({tamanho / 1024:.0f} KiB)")
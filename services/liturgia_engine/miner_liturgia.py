@@ -4,89 +4,117 @@
 # AUTOR: Sistema Sacristia Digital
 # =============================================================================
 
+import multiprocessing
 import os
+import socket
+import time
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 from datetime import datetime, timedelta
+from functools import lru_cache, partial
 from supabase import create_client
-import time
 import re
 from dotenv import load_dotenv
 import logging
 
-# Configuração de Logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s [%(levelname)s] %(message)s',
-    handlers=[
-        logging.FileHandler('miner_liturgia.log'),
-        logging.StreamHandler()
-    ]
-)
+from cache_html import CacheAusente, CacheHTML, requisitar_com_cache
+from classificador import classificar_linha, limpar_texto
+from controle_taxa import segundos_retry_after
+from fila_backfill import ARQUIVO_FILA, DIAS_POR_SHARD, FilaBackfill
+from fontes_liturgia import ColetorComHedge, FonteLiturgia, FontePaulus, processar_por_fonte
+from gravador_lotes import GravadorEmLotes
+from lecionario import Lecionario
+from pipeline_mineracao import TRABALHADORES_PADRAO, PoolExtracao, executar_pipeline, log_estagios
+from resiliencia import PoliticaRetentativa, falha_transitoria
+from sessao_http import log_estatisticas, obter_sessao
+
+URL_BASE = "https://www.vaticannews.va"
+
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'pt-BR,pt;q=0.9,en;q=0.8',
+    'Accept-Encoding': 'gzip, deflate, br',
+    'Connection': 'keep-alive',
+    'Upgrade-Insecure-Requests': '1'
+}
+
+# Backend do parser HTML: "html.parser" (sempre disponível), "lxml" ou "selectolax"
+PARSER_PADRAO = "html.parser"
+PARSERS = ("html.parser", "lxml", "selectolax")
+
+# Containers de conteúdo, em ordem de preferência: (tag, atributos, seletor CSS)
+CONTAINERS = [
+    ("article", {}, "article"),
+    ("main", {}, "main"),
+    ("div", {"class": "section__content"}, "div.section__content"),
+    ("div", {"class": "content-body"}, "div.content-body"),
+    ("div", {"id": "main-content"}, "div#main-content"),
+]
+ELEMENTOS_TEXTO = ['p', 'h1', 'h2', 'h3', 'h4', 'strong']
+
+# Gravação no Supabase: UPSERT a cada N linhas ou N segundos
+TAMANHO_LOTE = 50
+INTERVALO_LOTE = 5.0
+
+# Orçamento de cortesia com o servidor (por host)
+CONCORRENCIA_PADRAO = 4      # requisições simultâneas
+TAXA_PADRAO = 1.0            # requisições por segundo
+RAJADA_PADRAO = 4            # fichas acumuláveis do token bucket
 
-load_dotenv()
+# Retentativas e disjuntores das chamadas avulsas de minerar_data (por processo)
+POLITICA = PoliticaRetentativa()
 
-URL_SUPABASE = os.environ.get("SUPABASE_URL")
-KEY_SUPABASE = os.environ.get("SUPABASE_KEY")
 
-if not URL_SUPABASE or not KEY_SUPABASE:
-    raise ValueError("❌ Variáveis SUPABASE_URL e SUPABASE_KEY não configuradas!")
+def _configurar_ambiente():
+    """Logging e .env — só ao rodar como script, para o módulo poder ser importado offline."""
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s [%(levelname)s] %(message)s',
+        handlers=[
+            logging.FileHandler('miner_liturgia.log'),
+            logging.StreamHandler()
+        ]
+    )
+    logging.getLogger("httpx").setLevel(logging.WARNING)   # uma linha por requisição é ruído
+    load_dotenv()
+
+
+@lru_cache(maxsize=1)
+def _criar_cliente():
+    """Cliente Supabase criado na primeira gravação (e reaproveitado)."""
+    url_supabase = os.environ.get("SUPABASE_URL")
+    key_supabase = os.environ.get("SUPABASE_KEY")
+
+    if not url_supabase or not key_supabase:
+        raise ValueError("❌ Variáveis SUPABASE_URL e SUPABASE_KEY não configuradas!")
 
-supabase = create_client(URL_SUPABASE, KEY_SUPABASE)
+    return create_client(url_supabase, key_supabase)
 
 # =============================================================================
 # REGEX E UTILITÁRIOS
 # =============================================================================
 
-def extrair_referencia_biblica(texto):
-    """
-    Extrai referências bíblicas de diferentes formatos:
-    - Gn 1,1-5
-    - 1Cor 12,4-11
-    - Sl 22 (23), 1-6
-    - Mt 5,1-12a
-    """
-    patterns = [
-        r'([1-3]?\s*[A-Za-zÃ -ú]+\.?\s+\d+[,:]\s*\d+(?:-\d+)?(?:[a-z])?)',
-        r'([A-Za-zÃ -ú]+\s+\d+\s*\(\d+\)[,:]\s*\d+(?:-\d+)?)',
-        r'([A-Za-zÃ -ú]+\s+\d+[,:]\s*\d+(?:-\d+)?)'
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, texto)
-        if match:
-            return match.group(1).strip()
-    
-    return ""
-
-def limpar_texto(texto):
-    """Remove espaços extras e normaliza texto"""
-    texto = re.sub(r'\s+', ' ', texto)
-    texto = texto.replace('\xa0', ' ')
-    return texto.strip()
-
-def identificar_tipo_leitura(linha):
-    """Identifica qual tipo de leitura baseado em palavras-chave"""
-    linha_lower = linha.lower()
-    
-    if any(x in linha_lower for x in ["primeira leitura", "1ª leitura", "1.ª leitura"]):
-        return "primeira_leitura"
-    elif any(x in linha_lower for x in ["segunda leitura", "2ª leitura", "2.ª leitura"]):
-        return "segunda_leitura"
-    elif any(x in linha_lower for x in ["salmo responsorial", "salmo", "sl "]):
-        return "salmo"
-    elif "evangelho" in linha_lower:
-        return "evangelho"
-    elif any(x in linha_lower for x in ["refrão", "r.", "resp."]):
-        return "refrao"
-    
-    return None
+def parsers_disponiveis():
+    """Backends de PARSERS instalados neste ambiente."""
+    disponiveis = ["html.parser"]
+    for modulo in ("lxml", "selectolax"):
+        try:
+            __import__(modulo)
+            disponiveis.append(modulo)
+        except ImportError:
+            pass
+    return disponiveis
 
 # =============================================================================
 # MINERADOR PRINCIPAL
 # =============================================================================
 
-def minerar_data(data_alvo):
+def url_da_data(data_alvo, url_base=URL_BASE):
+    return f"{url_base}/pt/palavra-do-dia/{data_alvo.strftime('%Y/%m/%d')}.html"
+
+
+def minerar_data(data_alvo, url_base=URL_BASE, cache=None, parser=PARSER_PADRAO, politica=None):
     """
     Extrai leituras litúrgicas do Vatican News para uma data específica.
     
@@ -95,142 +123,292 @@ def minerar_data(data_alvo):
     2. Extrai todos os parágrafos e títulos
     3. Identifica blocos por palavras-chave
     4. Captura texto até o próximo marcador
-    """
-    url = f"https://www.vaticannews.va/pt/palavra-do-dia/{data_alvo.strftime('%Y/%m/%d')}.html"
-    
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-        'Accept-Language': 'pt-BR,pt;q=0.9,en;q=0.8',
-        'Accept-Encoding': 'gzip, deflate, br',
-        'Connection': 'keep-alive',
-        'Upgrade-Insecure-Requests': '1'
-    }
     
-    try:
-        logging.info(f"📡 Acessando: {url}")
-        response = requests.get(url, headers=headers, timeout=30)
-        
-        if response.status_code == 404:
-            logging.warning(f"⚠️  Página não encontrada (404)")
+    Com `cache` (CacheHTML), a página vem do disco quando fresca — antes
+    de consultar o disjuntor, que só guarda a rede. Timeout, erro de rede e
+    429/5xx são repetidos com backoff e jitter (nunca antes do Retry-After),
+    e com o disjuntor do host aberto a data falha na hora (`politica`,
+    padrão POLITICA).
+    """
+    url = url_da_data(data_alvo, url_base)
+    politica = politica or POLITICA
+    condicionais = {}
+    if cache is not None:
+        try:
+            entrada, condicionais = cache.preparar(url)
+        except CacheAusente:
+            logging.warning(f"   ⚠️  Página ausente no cache (replay): {url}")
             return None
-            
-        if response.status_code != 200:
-            logging.error(f"❌ Erro HTTP {response.status_code}")
+        if entrada is not None:
+            return _processar_resposta(entrada.status, entrada.texto, data_alvo, parser=parser)
+    disjuntor = politica.disjuntor(url)
+    
+    for tentativa in range(politica.tentativas):
+        if not disjuntor.permitir():
+            logging.error(f"   🔌 Disjuntor aberto para {disjuntor.host} — pulando {url}")
             return None
+        status = retry_after = None
+        try:
+            logging.info(f"📡 Acessando: {url}")
+            response, cabecalhos = requisitar_com_cache(cache, obter_sessao(), url, condicionais,
+                                                        headers=HEADERS, timeout=30)
+            status = response.status
+            retry_after = segundos_retry_after(cabecalhos.get("Retry-After"))
+        except requests.exceptions.Timeout:
+            logging.error(f"   ⏱️  Timeout ao acessar {url}")
+        except requests.exceptions.RequestException as e:
+            logging.error(f"   ❌ Erro de rede: {str(e)}")
         
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        # Estrutura de dados
-        dados = {
-            "data": data_alvo.strftime('%Y-%m-%d'),
-            "primeira_leitura_ref": "",
-            "primeira_leitura_texto": "",
-            "salmo_ref": "",
-            "salmo_refrao": "",
-            "salmo_texto": "",
-            "segunda_leitura_ref": "",
-            "segunda_leitura_texto": "",
-            "evangelho_ref": "",
-            "evangelho_texto": ""
-        }
-
-        # Tenta múltiplos seletores (robustez)
-        containers = [
-            soup.find('article'),
-            soup.find('main'),
-            soup.find('div', class_='section__content'),
-            soup.find('div', class_='content-body'),
-            soup.find('div', {'id': 'main-content'})
-        ]
-        
-        corpo = next((c for c in containers if c), None)
-        
-        if not corpo:
-            logging.warning("⚠️  Nenhum container de conteúdo encontrado")
+        disjuntor.registrar(falha_transitoria(status))
+        if not falha_transitoria(status):
+            if tentativa:
+                politica.recuperadas += 1
+            return _processar_resposta(status, response.texto, data_alvo, parser=parser)
+        if tentativa + 1 == politica.tentativas:
+            politica.esgotadas += 1
+            logging.error(f"   ❌ {url}: {politica.tentativas} tentativas sem resposta")
             return None
+        politica.retentativas += 1
+        espera = politica.espera(tentativa, retry_after)
+        logging.info(f"   🔁 Nova tentativa em {espera:.1f}s")
+        time.sleep(espera)
+
 
-        # Extração de elementos
-        elementos = []
-        for elem in corpo.find_all(['p', 'h1', 'h2', 'h3', 'h4', 'strong']):
-            texto = limpar_texto(elem.get_text())
-            if texto and len(texto) > 3:
-                elementos.append(texto)
+def _processar_resposta(status, html, data_alvo, url=None, parser=PARSER_PADRAO):
+    """Valida o status HTTP e extrai as leituras (None se não houver dados)."""
+    if status == 404:
+        logging.warning(f"⚠️  Página não encontrada (404)")
+        return None
         
-        if not elementos:
-            logging.warning("⚠️  Nenhum elemento textual extraído")
-            return None
+    if status != 200:
+        logging.error(f"❌ Erro HTTP {status}")
+        return None
+    
+    try:
+        return extrair_leituras(html, data_alvo, parser=parser)
+    except Exception as e:
+        logging.error(f"   ❌ Erro inesperado: {str(e)}", exc_info=True)
+        return None
+
+
+class FonteVatican(FonteLiturgia):
+    """Vatican News (pt/palavra-do-dia) como fonte do ColetorComHedge."""
+
+    nome = "vatican"
+
+    def __init__(self, url_base=URL_BASE, parser=PARSER_PADRAO):
+        self.url_base = url_base
+        self.parser = parser
+
+    def url(self, data_alvo):
+        return url_da_data(data_alvo, self.url_base)
+
+    def extrair(self, html, data_alvo):
+        return extrair_leituras(html, data_alvo, parser=self.parser)
+
+    def processar(self, status, html, data_alvo, lecionario=None):
+        if status != 200:
+            return _processar_resposta(status, html, data_alvo, parser=self.parser)   # loga 404/HTTP
+        return super().processar(status, html, data_alvo, lecionario)
+
+
+# Fontes selecionáveis por --fontes, em ordem de preferência (a primeira é a principal)
+FONTES = {"vatican": FonteVatican, "paulus": FontePaulus}
+
+
+def textos_do_container(html, parser=PARSER_PADRAO):
+    """
+    Textos (limpos) dos elementos ELEMENTOS_TEXTO do primeiro container de
+    CONTAINERS presente na página, em ordem de documento; None se nenhum.
+    
+    Só o container vira árvore: cada candidato é procurado com um
+    SoupStrainer (seletor CSS no selectolax), na ordem de preferência, e a
+    marca do candidato ausente do HTML dispensa o parse. A navegação e o
+    resto da página nunca são materializados.
+    """
+    if parser == "selectolax":
+        from selectolax.parser import HTMLParser
+        arvore = HTMLParser(html)
+        for _, _, seletor in CONTAINERS:
+            corpo = arvore.css_first(seletor)
+            if corpo is not None:
+                return [limpar_texto(e.text(deep=True)) for e in corpo.css(", ".join(ELEMENTOS_TEXTO))]
+        return None
+    if parser not in PARSERS:
+        raise ValueError(f"Parser desconhecido: {parser} (opções: {', '.join(PARSERS)})")
+
+    html_minusculo = html.lower()
+    for nome, atributos, _ in CONTAINERS:
+        marca = next(iter(atributos.values()), f"<{nome}")
+        if marca not in html_minusculo:
+            continue
+        # No SoupStrainer o class ainda é a string crua ("a section__content b")
+        filtro = {chave: re.compile(rf"(?:^|\s){re.escape(valor)}(?:\s|$)") if chave == "class" else valor
+                  for chave, valor in atributos.items()}
+        soup = BeautifulSoup(html, parser, parse_only=SoupStrainer(nome, filtro))
+        corpo = soup.find(nome, atributos)
+        if corpo:
+            return [limpar_texto(e.get_text()) for e in corpo.find_all(ELEMENTOS_TEXTO)]
+    return None
+
+
+def extrair_leituras(html, data_alvo, parser=PARSER_PADRAO):
+    """Parser da página palavra-do-dia (sem rede)."""
+    # Estrutura de dados
+    dados = {
+        "data": data_alvo.strftime('%Y-%m-%d'),
+        "primeira_leitura_ref": "",
+        "primeira_leitura_texto": "",
+        "salmo_ref": "",
+        "salmo_refrao": "",
+        "salmo_texto": "",
+        "segunda_leitura_ref": "",
+        "segunda_leitura_texto": "",
+        "evangelho_ref": "",
+        "evangelho_texto": ""
+    }
+
+    # Tenta múltiplos seletores (robustez)
+    textos = textos_do_container(html, parser)
+    
+    if textos is None:
+        logging.warning("⚠️  Nenhum container de conteúdo encontrado")
+        return None
+
+    # Extração de elementos
+    elementos = [texto for texto in textos if texto and len(texto) > 3]
+    
+    if not elementos:
+        logging.warning("⚠️  Nenhum elemento textual extraído")
+        return None
+    
+    # Processamento sequencial
+    bloco_atual = None
+    buffer_texto = []
+    
+    for idx, texto in enumerate(elementos):
+        tipo, ref = classificar_linha(texto)
         
-        # Processamento sequencial
-        bloco_atual = None
-        buffer_texto = []
+        if tipo == "refrao" and bloco_atual == "salmo":
+            # Captura refrão do salmo
+            dados["salmo_refrao"] = texto.replace("Refrão:", "").replace("R.", "").replace("Resp.", "").strip()
+            continue
         
-        for idx, texto in enumerate(elementos):
-            tipo = identificar_tipo_leitura(texto)
+        if tipo in ["primeira_leitura", "segunda_leitura", "salmo", "evangelho"]:
+            # Salva bloco anterior
+            if bloco_atual and buffer_texto:
+                dados[f"{bloco_atual}_texto"] = "\n".join(buffer_texto)
             
-            if tipo == "refrao" and bloco_atual == "salmo":
-                # Captura refrão do salmo
-                dados["salmo_refrao"] = texto.replace("Refrão:", "").replace("R.", "").replace("Resp.", "").strip()
-                continue
+            # Inicia novo bloco
+            bloco_atual = tipo
+            buffer_texto = []
             
-            if tipo in ["primeira_leitura", "segunda_leitura", "salmo", "evangelho"]:
-                # Salva bloco anterior
-                if bloco_atual and buffer_texto:
-                    dados[f"{bloco_atual}_texto"] = "\n".join(buffer_texto)
-                
-                # Inicia novo bloco
-                bloco_atual = tipo
-                buffer_texto = []
-                
-                # Extrai referência
-                ref = extrair_referencia_biblica(texto)
-                dados[f"{bloco_atual}_ref"] = ref
-                
-                logging.info(f"   📖 {tipo.replace('_', ' ').title()}: {ref}")
-                continue
+            # Referência (já extraída por classificar_linha)
+            dados[f"{bloco_atual}_ref"] = ref
             
-            # Acumula texto do bloco atual
-            if bloco_atual:
-                # Ignora linhas muito curtas ou de navegação
-                if len(texto) > 30 and not any(x in texto.lower() for x in ["compartilhar", "imprimir", "palavra do papa"]):
-                    buffer_texto.append(texto)
-        
-        # Salva último bloco
-        if bloco_atual and buffer_texto:
-            dados[f"{bloco_atual}_texto"] = "\n".join(buffer_texto)
-        
-        # Validação de qualidade
-        campos_obrigatorios = ["evangelho_ref", "evangelho_texto"]
-        if not all(dados[campo] for campo in campos_obrigatorios):
-            logging.warning(f"⚠️  Dados incompletos (falta Evangelho)")
-            return None
+            logging.info(f"   📖 {tipo.replace('_', ' ').title()}: {ref}")
+            continue
         
-        # Estatísticas
-        total_chars = sum(len(dados[k]) for k in dados if k.endswith('_texto'))
-        logging.info(f"   ✅ Extraído {total_chars} caracteres de texto litúrgico")
-        
-        return dados
-        
-    except requests.exceptions.Timeout:
-        logging.error(f"   ⏱️  Timeout ao acessar {url}")
-        return None
-    except requests.exceptions.RequestException as e:
-        logging.error(f"   ❌ Erro de rede: {str(e)}")
+        # Acumula texto do bloco atual
+        if bloco_atual:
+            # Ignora linhas muito curtas ou de navegação
+            if len(texto) > 30 and not any(x in texto.lower() for x in ["compartilhar", "imprimir", "palavra do papa"]):
+                buffer_texto.append(texto)
+    
+    # Salva último bloco
+    if bloco_atual and buffer_texto:
+        dados[f"{bloco_atual}_texto"] = "\n".join(buffer_texto)
+    
+    # Validação de qualidade
+    campos_obrigatorios = ["evangelho_ref", "evangelho_texto"]
+    if not all(dados[campo] for campo in campos_obrigatorios):
+        logging.warning(f"⚠️  Dados incompletos (falta Evangelho)")
         return None
+    
+    # Estatísticas
+    total_chars = sum(len(dados[k]) for k in dados if k.endswith('_texto'))
+    logging.info(f"   ✅ Extraído {total_chars} caracteres de texto litúrgico")
+    
+    return dados
+
+# =============================================================================
+# DATAS JÁ GRAVADAS
+# =============================================================================
+
+def datas_ja_completas(sb, inicio, fim):
+    """
+    Datas (AAAA-MM-DD) entre `inicio` e `fim` que já têm `evangelho_texto`
+    não vazio em `liturgia_palavra` — uma consulta por intervalo, paginada
+    só se passar do limite de 1000 linhas do PostgREST.
+    """
+    completas = set()
+    PAGINA = 1000
+    offset = 0
+    while True:
+        res = (
+            sb.table("liturgia_palavra")
+            .select("data")
+            .gte("data", inicio)
+            .lte("data", fim)
+            .neq("evangelho_texto", "")
+            .order("data")
+            .range(offset, offset + PAGINA - 1)
+            .execute()
+        )
+        completas.update(linha["data"] for linha in res.data)
+        if len(res.data) < PAGINA:
+            return completas
+        offset += PAGINA
+
+
+def filtrar_pendentes(sb, lista_datas):
+    """Remove de `lista_datas` as datas já completas no banco (na dúvida, mantém todas)."""
+    if not lista_datas:
+        return lista_datas
+    try:
+        completas = datas_ja_completas(sb, min(lista_datas).strftime('%Y-%m-%d'),
+                                       max(lista_datas).strftime('%Y-%m-%d'))
     except Exception as e:
-        logging.error(f"   ❌ Erro inesperado: {str(e)}", exc_info=True)
-        return None
+        logging.warning(f"⚠️  Não foi possível consultar datas existentes ({str(e)}) — minerando todas")
+        return lista_datas
+    pendentes = [d for d in lista_datas if d.strftime('%Y-%m-%d') not in completas]
+    logging.info(f"🗃️  {len(lista_datas) - len(pendentes)} de {len(lista_datas)} datas já completas no banco "
+                 f"— {len(pendentes)} a minerar (use --force para minerar todas)")
+    return pendentes
 
 # =============================================================================
 # WORKFLOW DE MINERAÇÃO
 # =============================================================================
 
-def workflow_mensal(modo="atual"):
+def workflow_mensal(modo="atual", concorrencia=CONCORRENCIA_PADRAO, taxa=TAXA_PADRAO, cache=None,
+                    forcar=False, sb=None, trabalhadores=TRABALHADORES_PADRAO, url_base=URL_BASE,
+                    parser=PARSER_PADRAO, fontes=None, taxa_maxima=None, inicio=None, fim=None,
+                    lecionario=None):
     """
     Workflow de mineração com diferentes modos:
     - 'atual': Mês atual
     - 'proximo': Mês atual + próximo (se dia >= 20)
-    - 'range': Período customizado
+    - 'range': Período customizado, de `inicio` a `fim` (inclusive)
+    
+    Períodos longos (anos) rendem mais como backfill em shards, com vários
+    trabalhadores e retomada após queda: ver `backfill_trabalhar`.
+    
+    Com `cache` as páginas já baixadas vêm do disco; com `cache.replay` nada
+    é buscado na rede (útil para reprocessar após corrigir o parser).
+    Datas que já têm Evangelho no banco são puladas, salvo com `forcar=True`.
+    
+    Download, extração (`trabalhadores` processos, backend `parser`) e
+    gravação rodam em pipeline, sobrepostos (ver pipeline_mineracao).
+    
+    `fontes` (padrão: só o Vatican News em `url_base`) são consultadas com
+    hedge: se a principal passar do p95 da própria latência ou falhar, a
+    data é pedida também à seguinte e vale a primeira página completa.
+    
+    Com `taxa_maxima`, `taxa` é só a inicial: o ritmo de cada host se ajusta
+    sozinho (AIMD, ver controle_taxa) até `taxa_maxima` req/s.
+    
+    Com `lecionario` (ver lecionario), páginas cujas leituras já foram
+    mineradas em outra data do ciclo saem do cache sem parse completo.
     """
     hoje = datetime.now()
     primeiro_dia_mes = hoje.replace(day=1)
@@ -242,6 +420,16 @@ def workflow_mensal(modo="atual"):
     # Cálculo de datas
     lista_datas = []
     
+    if modo == "range":
+        if inicio is None or fim is None:
+            raise ValueError("modo 'range' exige inicio e fim")
+        lista_datas = [inicio + timedelta(days=x) for x in range((fim - inicio).days + 1)]
+        logging.info(f"📅 Processando {len(lista_datas)} dias de {inicio.strftime('%d/%m/%Y')} "
+                     f"a {fim.strftime('%d/%m/%Y')}")
+        return minerar_lista(lista_datas, concorrencia=concorrencia, taxa=taxa, cache=cache,
+                             forcar=forcar, sb=sb, trabalhadores=trabalhadores, url_base=url_base,
+                             parser=parser, fontes=fontes, taxa_maxima=taxa_maxima, lecionario=lecionario)
+    
     # Mês atual
     ultimo_dia_mes = (primeiro_dia_mes.replace(day=28) + timedelta(days=4)).replace(day=1) - timedelta(days=1)
     dias_mes_atual = ultimo_dia_mes.day
@@ -258,50 +446,151 @@ def workflow_mensal(modo="atual"):
         lista_datas.extend([proximo_mes + timedelta(days=x) for x in range(dias_proximo_mes)])
         logging.info(f"📅 Incluindo {dias_proximo_mes} dias de {proximo_mes.strftime('%B/%Y')}")
     
-    logging.info(f"\n🎯 Total de {len(lista_datas)} datas a processar\n")
+    return minerar_lista(lista_datas, concorrencia=concorrencia, taxa=taxa, cache=cache,
+                         forcar=forcar, sb=sb, trabalhadores=trabalhadores, url_base=url_base,
+                         parser=parser, fontes=fontes, taxa_maxima=taxa_maxima, lecionario=lecionario)
+
+
+def minerar_lista(lista_datas, concorrencia=CONCORRENCIA_PADRAO, taxa=TAXA_PADRAO, cache=None,
+                  forcar=False, sb=None, trabalhadores=TRABALHADORES_PADRAO, url_base=URL_BASE,
+                  parser=PARSER_PADRAO, fontes=None, taxa_maxima=None, lecionario=None, pool=None):
+    """
+    Minera `lista_datas` (pipeline, hedge, gravação em lotes — ver
+    workflow_mensal) e registra o relatório. `pool` (PoolExtracao) é
+    reaproveitado em vez de abrir um pool de processos novo. Devolve {"sucesso", "pulos",
+    "transitorias", "erros", "erros_extracao", "interrompido", "ja_no_banco"}.
+    """
+    sb = sb or _criar_cliente()
+    total_datas = len(lista_datas)
+    if not forcar:
+        lista_datas = filtrar_pendentes(sb, lista_datas)
     
-    # Contadores
-    sucesso = pulos = erros = 0
+    logging.info(f"\n🎯 Total de {len(lista_datas)} datas a processar\n")
     
-    for d in lista_datas:
-        logging.info(f"📆 {d.strftime('%d/%m/%Y (%A)')}")
-        resultado = minerar_data(d)
-        
-        if resultado:
-            try:
-                # Upsert no Supabase
-                response = supabase.table("liturgia_palavra").upsert(
-                    resultado, 
-                    on_conflict="data"
-                ).execute()
-                
-                sucesso += 1
-                logging.info(f"   💾 Salvo no banco!\n")
-                
-            except Exception as e:
-                erros += 1
-                logging.error(f"   ❌ Erro ao salvar no Supabase: {str(e)}\n")
-        else:
-            pulos += 1
-        
-        # Rate limiting (respeito ao servidor)
-        time.sleep(2)
+    # Download concorrente (o token bucket substitui o antigo sleep(2) por data),
+    # extração em pool e upsert em lotes, sobrepostos com filas limitadas
+    fontes = fontes or [FonteVatican(url_base, parser)]
+    usos_antes = lecionario.usos() if lecionario is not None else 0
+    coletor = ColetorComHedge(fontes, concorrencia_por_host=concorrencia, taxa=taxa, rajada=RAJADA_PADRAO,
+                              timeout=30, headers=HEADERS, cache=cache, taxa_maxima=taxa_maxima)
+    with GravadorEmLotes(sb, tamanho_lote=TAMANHO_LOTE, intervalo=INTERVALO_LOTE) as gravador:
+        resultado = executar_pipeline(
+            [(d, d) for d in lista_datas],
+            partial(processar_por_fonte, fontes=fontes, lecionario=lecionario), gravador, coletor,
+            trabalhadores=trabalhadores, processos=len(lista_datas) > 1,
+            rotulo=lambda d: d.strftime('%d/%m/%Y (%A)'), pool=pool,
+        )
+    if cache is not None:
+        logging.info(f"🗄️  {cache.resumo()}")
+    if len(fontes) > 1:
+        logging.info(f"🔀 {coletor.resumo()}")
+    if lecionario is not None:
+        logging.info(f"📚 {lecionario.resumo()} · {lecionario.usos() - usos_antes} página(s) montada(s) do cache")
+    pulos = resultado["sem_dados"]
+    transitorias = resultado["transitorias"]
+    erros_extracao = resultado["erros_extracao"]
+    sucesso = gravador.gravadas
+    erros = len(gravador.falhas)
     
     # Relatório final
     logging.info(f"\n{'='*70}")
     logging.info(f"📊 RELATÓRIO FINAL")
     logging.info(f"{'='*70}")
     logging.info(f"✅ Sucesso: {sucesso}")
-    logging.info(f"⚠️  Pulados: {pulos}")
-    logging.info(f"❌ Erros: {erros}")
-    logging.info(f"📈 Taxa de sucesso: {(sucesso/(sucesso+pulos+erros)*100):.1f}%")
+    logging.info(f"⚠️  Pulados (sem leituras na fonte): {pulos}")
+    logging.info(f"⚡ Falhas transitórias (timeout/5xx/disjuntor — tentar de novo): {transitorias}")
+    logging.info(f"🧨 Erros de extração (parser/pool — tentar de novo): {erros_extracao}")
+    logging.info(f"❌ Erros de gravação: {erros}")
+    logging.info(f"🗃️  Já no banco: {total_datas - len(lista_datas)}")
+    if resultado["interrompido"]:
+        logging.error("🛑 Pipeline interrompido: o pool de extração quebrou de vez")
+    if lista_datas:
+        logging.info(f"📈 Taxa de sucesso: {(sucesso/(sucesso+pulos+transitorias+erros_extracao+erros)*100):.1f}%")
+    logging.info(f"🔁 {coletor.politica.resumo()}")
+    log_estatisticas()
+    coletor.log_taxas()
+    log_estagios(resultado)
     logging.info(f"{'='*70}\n")
+    return {"sucesso": sucesso, "pulos": pulos, "transitorias": transitorias, "erros": erros,
+            "erros_extracao": erros_extracao, "interrompido": resultado["interrompido"],
+            "ja_no_banco": total_datas - len(lista_datas)}
+
+# =============================================================================
+# BACKFILL EM SHARDS
+# =============================================================================
+
+def backfill_trabalhar(caminho_fila=ARQUIVO_FILA, trabalhador=None, sb=None, **opcoes):
+    """
+    Reivindica shards da fila (fila_backfill) até ela esvaziar e minera cada
+    um com `minerar_lista` (`opcoes`: as mesmas de workflow_mensal), com a
+    posse renovada enquanto ele roda e um só pool de extração para todos.
+    Shard com falha transitória, de extração ou de gravação volta à fila;
+    se o processo cair, a posse vence e outro trabalhador o retoma. Pool
+    quebrado de vez encerra o trabalhador. Devolve quantos shards concluiu.
+    """
+    trabalhador = trabalhador or f"{socket.gethostname()}:{os.getpid()}"
+    sb = sb or _criar_cliente()
+    concluidos = 0
+    with FilaBackfill(caminho_fila) as fila, \
+            PoolExtracao(opcoes.get("trabalhadores", TRABALHADORES_PADRAO)) as pool:
+        while (shard := fila.reivindicar(trabalhador)) is not None:
+            logging.info(f"🧩 {trabalhador}: shard {shard.id} — {shard.inicio:%d/%m/%Y} a "
+                         f"{shard.fim:%d/%m/%Y} (tentativa {shard.tentativa})")
+            datas = [datetime.combine(d, datetime.min.time()) for d in shard.datas()]
+            try:
+                with fila.manter_posse(shard):
+                    r = minerar_lista(datas, sb=sb, pool=pool, **opcoes)
+            except Exception as e:
+                logging.error(f"❌ Shard {shard.id}: {e}", exc_info=True)
+                fila.devolver(shard, str(e) or type(e).__name__)
+                continue
+            if r["transitorias"] or r["erros_extracao"] or r["erros"]:
+                fila.devolver(shard, f"{r['transitorias']} falha(s) transitória(s), "
+                                     f"{r['erros_extracao']} erro(s) de extração, "
+                                     f"{r['erros']} erro(s) de gravação")
+                if r["interrompido"]:
+                    logging.error(f"🛑 {trabalhador}: pool de extração quebrado — encerrando o trabalhador")
+                    break
+            elif fila.confirmar(shard, com_dados=r["sucesso"] + r["ja_no_banco"], sem_dados=r["pulos"]):
+                concluidos += 1
+            else:
+                logging.warning(f"⚠️  Shard {shard.id}: posse perdida antes de confirmar (outro trabalhador o refaz)")
+            fila.log_progresso()
+    return concluidos
+
+
+def _processo_backfill(caminho_fila, opcoes):
+    """Alvo de cada processo de `backfill_processos` (spawn: reconfigura logging e .env)."""
+    _configurar_ambiente()
+    backfill_trabalhar(caminho_fila, **opcoes)
+
+
+def backfill_processos(processos, caminho_fila=ARQUIVO_FILA, **opcoes):
+    """
+    `processos` trabalhadores nesta máquina sobre a mesma fila. O ritmo por
+    host (`taxa`, `taxa_maxima`) é dividido entre eles, para o conjunto
+    respeitar o mesmo orçamento de um trabalhador só.
+    """
+    if processos <= 1:
+        return backfill_trabalhar(caminho_fila, **opcoes)
+    for chave in ("taxa", "taxa_maxima"):
+        if opcoes.get(chave):
+            opcoes[chave] = opcoes[chave] / processos
+    contexto = multiprocessing.get_context("spawn")
+    filhos = [contexto.Process(target=_processo_backfill, args=(caminho_fila, opcoes),
+                               name=f"backfill-{i + 1}") for i in range(processos)]
+    for filho in filhos:
+        filho.start()
+    for filho in filhos:
+        filho.join()
+    with FilaBackfill(caminho_fila) as fila:
+        fila.log_progresso()
 
 # =============================================================================
 # MODO TESTE
 # =============================================================================
 
-def testar_data_especifica(data_str):
+def testar_data_especifica(data_str, cache=None, parser=PARSER_PADRAO):
     """
     Testa mineração de uma data específica (formato: YYYY-MM-DD)
     Útil para debug
@@ -309,7 +598,7 @@ def testar_data_especifica(data_str):
     data = datetime.strptime(data_str, "%Y-%m-%d")
     logging.info(f"\n🧪 MODO TESTE - Data: {data.strftime('%d/%m/%Y')}\n")
     
-    resultado = minerar_data(data)
+    resultado = minerar_data(data, cache=cache, parser=parser)
     
     if resultado:
         print("\n" + "="*70)
@@ -331,20 +620,83 @@ def testar_data_especifica(data_str):
 if __name__ == "__main__":
     import sys
     
+    _configurar_ambiente()
+    
+    # Opções de ritmo: --concorrencia=4 --taxa=1.0 (req/s por host) --trabalhadores=3 (extração)
+    # Ritmo adaptativo: --taxa-maxima=4 (a --taxa vira a inicial e o AIMD ajusta até esse teto)
+    # Parser: --parser=html.parser|lxml|selectolax
+    # Fontes: --fontes=vatican,paulus (a primeira é a principal; as demais entram por hedge)
+    # Cache: páginas em .cache_html/; --replay usa só o cache; --sem-cache desliga
+    # Lecionário: leituras repetidas saem de .lecionario.sqlite3; --sem-lecionario desliga
+    # (e --replay também: reprocessar após corrigir o parser exige o parse completo)
+    opcoes = {"concorrencia": CONCORRENCIA_PADRAO, "taxa": TAXA_PADRAO, "trabalhadores": TRABALHADORES_PADRAO}
+    # Backfill: --fila=caminho.sqlite3 --dias-por-shard=7 --processos=N (trabalhadores nesta máquina)
+    backfill = {"fila": ARQUIVO_FILA, "dias_por_shard": DIAS_POR_SHARD, "processos": 1}
+    args = []
+    for arg in sys.argv[1:]:
+        nome, _, valor = arg.partition("=")
+        if nome in ("--concorrencia", "--taxa", "--trabalhadores"):
+            opcoes[nome[2:]] = float(valor) if nome == "--taxa" else int(valor)
+        elif nome == "--taxa-maxima":
+            opcoes["taxa_maxima"] = float(valor)
+        elif nome == "--parser":
+            if valor not in parsers_disponiveis():
+                sys.exit(f"❌ Parser '{valor}' indisponível (instalados: {', '.join(parsers_disponiveis())})")
+            opcoes["parser"] = valor
+        elif nome == "--fontes":
+            nomes = valor.split(",")
+            if not nomes or any(n not in FONTES for n in nomes):
+                sys.exit(f"❌ Fontes inválidas '{valor}' (opções: {', '.join(FONTES)})")
+            opcoes["fontes"] = nomes
+        elif nome in ("--processos", "--dias-por-shard"):
+            backfill[nome[2:].replace("-", "_")] = int(valor)
+        elif nome == "--fila":
+            backfill["fila"] = valor
+        elif nome not in ("--replay", "--sem-cache", "--sem-lecionario", "--force"):
+            args.append(arg)
+    if "fontes" in opcoes:
+        opcoes["fontes"] = [FonteVatican(parser=opcoes.get("parser", PARSER_PADRAO)) if n == "vatican"
+                            else FONTES[n]() for n in opcoes["fontes"]]
+    cache = None if "--sem-cache" in sys.argv else CacheHTML(replay="--replay" in sys.argv)
+    if "--sem-lecionario" not in sys.argv and "--replay" not in sys.argv:
+        opcoes["lecionario"] = Lecionario()
+    
     try:
         # Modo CLI
-        if len(sys.argv) > 1:
-            if sys.argv[1] == "test":
+        if args:
+            if args[0] == "test":
                 # python miner_vaticano_v7_final.py test 2025-01-29
-                data_teste = sys.argv[2] if len(sys.argv) > 2 else datetime.now().strftime("%Y-%m-%d")
-                testar_data_especifica(data_teste)
-            elif sys.argv[1] == "proximo":
-                workflow_mensal(modo="proximo")
+                data_teste = args[1] if len(args) > 1 else datetime.now().strftime("%Y-%m-%d")
+                testar_data_especifica(data_teste, cache=cache, parser=opcoes.get("parser", PARSER_PADRAO))
+            elif args[0] == "proximo":
+                workflow_mensal(modo="proximo", cache=cache, forcar="--force" in sys.argv, **opcoes)
+            elif args[0] == "range" and len(args) == 3:
+                # python miner_liturgia.py range 2025-01-01 2025-03-31
+                inicio, fim = (datetime.strptime(a, "%Y-%m-%d") for a in args[1:3])
+                workflow_mensal(modo="range", inicio=inicio, fim=fim, cache=cache,
+                                forcar="--force" in sys.argv, **opcoes)
+            elif args[0] == "backfill" and len(args) > 1:
+                # python miner_liturgia.py backfill criar 2015-01-01 2024-12-31 [--dias-por-shard=7]
+                # python miner_liturgia.py backfill trabalhar [--processos=4]   (em quantas máquinas quiser)
+                # python miner_liturgia.py backfill status | reabrir
+                if args[1] == "trabalhar":
+                    backfill_processos(backfill["processos"], backfill["fila"], cache=cache,
+                                       forcar="--force" in sys.argv, **opcoes)
+                else:
+                    with FilaBackfill(backfill["fila"]) as fila:
+                        if args[1] == "criar" and len(args) == 4:
+                            inicio, fim = (datetime.strptime(a, "%Y-%m-%d").date() for a in args[2:4])
+                            fila.criar(inicio, fim, backfill["dias_por_shard"])
+                        elif args[1] == "reabrir":
+                            logging.info(f"🧩 {fila.reabrir_falhos()} shard(s) falho(s) de volta à fila")
+                        elif args[1] != "status":
+                            logging.error("❌ Use: backfill criar INICIO FIM | trabalhar | status | reabrir")
+                        fila.log_progresso()
             else:
-                logging.error("❌ Modo inválido. Use: test, atual, ou proximo")
+                logging.error("❌ Modo inválido. Use: test, atual, proximo, range INICIO FIM ou backfill")
         else:
             # Modo padrão: mês atual
-            workflow_mensal(modo="atual")
+            workflow_mensal(modo="atual", cache=cache, forcar="--force" in sys.argv, **opcoes)
             
     except KeyboardInterrupt:
         logging.warning("\n⚠️  Interrompido pelo usuário.")
@@ -8,20 +8,23 @@ import os
 import requests
 from bs4 import BeautifulSoup
 from datetime import datetime, timedelta
+from functools import lru_cache
 from supabase import create_client
 import time
 import re
 from dotenv import load_dotenv
 
-load_dotenv()
+@lru_cache(maxsize=1)
+def _criar_cliente():
+    """Cliente Supabase criado na primeira gravação — o parser importa offline."""
+    load_dotenv()
+    url_supabase = os.environ.get("SUPABASE_URL")
+    key_supabase = os.environ.get("SUPABASE_KEY")
 
-URL_SUPABASE = os.environ.get("SUPABASE_URL")
-KEY_SUPABASE = os.environ.get("SUPABASE_KEY")
+    if not url_supabase or not key_supabase:
+        raise ValueError("❌ Variáveis SUPABASE_URL e SUPABASE_KEY não configuradas!")
 
-if not URL_SUPABASE or not KEY_SUPABASE:
-    raise ValueError("❌ Variáveis SUPABASE_URL e SUPABASE_KEY não configuradas!")
-
-supabase = create_client(URL_SUPABASE, KEY_SUPABASE)
+    return create_client(url_supabase, key_supabase)
 
 def extrair_referencia_biblica(texto):
     """Extrai referências bíblicas (ex: Gn 1,1-5)"""
@@ -56,77 +59,81 @@ def minerar_data(data_alvo):
             print(f"   ❌ Erro HTTP {response.status_code}")
             return None
         
-        soup = BeautifulSoup(response.text, 'html.parser')
+        return extrair_leituras(response.text, data_alvo)
         
-        dados = {
-            "data": data_alvo.strftime('%Y-%m-%d'),
-            "primeira_leitura_ref": "", "primeira_leitura_texto": "",
-            "salmo_ref": "", "salmo_refrao": "", "salmo_texto": "",
-            "segunda_leitura_ref": "", "segunda_leitura_texto": "",
-            "evangelho_ref": "", "evangelho_texto": ""
-        }
+    except Exception as e:
+        print(f"   ❌ Erro: {str(e)}")
+        return None
 
-        corpo = soup.find('div', class_='section__content') or soup.find('article')
-        if not corpo:
-            print("   ⚠️  Estrutura HTML não reconhecida")
-            return None
+def extrair_leituras(html, data_alvo):
+    """Parser da página palavra-do-dia (sem rede)"""
+    soup = BeautifulSoup(html, 'html.parser')
+    
+    dados = {
+        "data": data_alvo.strftime('%Y-%m-%d'),
+        "primeira_leitura_ref": "", "primeira_leitura_texto": "",
+        "salmo_ref": "", "salmo_refrao": "", "salmo_texto": "",
+        "segunda_leitura_ref": "", "segunda_leitura_texto": "",
+        "evangelho_ref": "", "evangelho_texto": ""
+    }
 
-        texto_completo = corpo.get_text(separator="\n", strip=True)
-        linhas = [l.strip() for l in texto_completo.split("\n") if l.strip()]
-        
-        bloco_atual = None
-        texto_temporario = []
+    corpo = soup.find('div', class_='section__content') or soup.find('article')
+    if not corpo:
+        print("   ⚠️  Estrutura HTML não reconhecida")
+        return None
+
+    texto_completo = corpo.get_text(separator="\n", strip=True)
+    linhas = [l.strip() for l in texto_completo.split("\n") if l.strip()]
+    
+    bloco_atual = None
+    texto_temporario = []
+    
+    for linha in linhas:
+        linha_lower = linha.lower()
         
-        for linha in linhas:
-            linha_lower = linha.lower()
+        if "primeira leitura" in linha_lower or "1ª leitura" in linha_lower:
+            if texto_temporario and bloco_atual:
+                dados[f"{bloco_atual}_texto"] = "\n".join(texto_temporario)
+            bloco_atual = "primeira_leitura"
+            dados["primeira_leitura_ref"] = extrair_referencia_biblica(linha)
+            texto_temporario = []
             
-            if "primeira leitura" in linha_lower or "1ª leitura" in linha_lower:
-                if texto_temporario and bloco_atual:
-                    dados[f"{bloco_atual}_texto"] = "\n".join(texto_temporario)
-                bloco_atual = "primeira_leitura"
-                dados["primeira_leitura_ref"] = extrair_referencia_biblica(linha)
-                texto_temporario = []
-                
-            elif "salmo" in linha_lower and "responsorial" in linha_lower:
-                if texto_temporario and bloco_atual:
-                    dados[f"{bloco_atual}_texto"] = "\n".join(texto_temporario)
-                bloco_atual = "salmo"
-                dados["salmo_ref"] = extrair_referencia_biblica(linha)
-                texto_temporario = []
-                
-            elif "segunda leitura" in linha_lower or "2ª leitura" in linha_lower:
-                if texto_temporario and bloco_atual:
-                    dados[f"{bloco_atual}_texto"] = "\n".join(texto_temporario)
-                bloco_atual = "segunda_leitura"
-                dados["segunda_leitura_ref"] = extrair_referencia_biblica(linha)
-                texto_temporario = []
-                
-            elif "evangelho" in linha_lower:
-                if texto_temporario and bloco_atual:
-                    dados[f"{bloco_atual}_texto"] = "\n".join(texto_temporario)
-                bloco_atual = "evangelho"
-                dados["evangelho_ref"] = extrair_referencia_biblica(linha)
-                texto_temporario = []
-                
-            elif bloco_atual == "salmo" and ("refrão" in linha_lower or "r." in linha_lower):
-                dados["salmo_refrao"] = linha.replace("Refrão:", "").replace("R.", "").strip()
-                
-            elif bloco_atual and len(linha) > 20:
-                texto_temporario.append(linha)
-        
-        if texto_temporario and bloco_atual:
-            dados[f"{bloco_atual}_texto"] = "\n".join(texto_temporario)
-        
-        if not dados["evangelho_ref"] or not dados["evangelho_texto"]:
-            print(f"   ⚠️  Dados incompletos")
-            return None
+        elif "salmo" in linha_lower and "responsorial" in linha_lower:
+            if texto_temporario and bloco_atual:
+                dados[f"{bloco_atual}_texto"] = "\n".join(texto_temporario)
+            bloco_atual = "salmo"
+            dados["salmo_ref"] = extrair_referencia_biblica(linha)
+            texto_temporario = []
             
-        print(f"   ✅ Dados extraídos!")
-        return dados
-        
-    except Exception as e:
-        print(f"   ❌ Erro: {str(e)}")
+        elif "segunda leitura" in linha_lower or "2ª leitura" in linha_lower:
+            if texto_temporario and bloco_atual:
+                dados[f"{bloco_atual}_texto"] = "\n".join(texto_temporario)
+            bloco_atual = "segunda_leitura"
+            dados["segunda_leitura_ref"] = extrair_referencia_biblica(linha)
+            texto_temporario = []
+            
+        elif "evangelho" in linha_lower:
+            if texto_temporario and bloco_atual:
+                dados[f"{bloco_atual}_texto"] = "\n".join(texto_temporario)
+            bloco_atual = "evangelho"
+            dados["evangelho_ref"] = extrair_referencia_biblica(linha)
+            texto_temporario = []
+            
+        elif bloco_atual == "salmo" and ("refrão" in linha_lower or "r." in linha_lower):
+            dados["salmo_refrao"] = linha.replace("Refrão:", "").replace("R.", "").strip()
+            
+        elif bloco_atual and len(linha) > 20:
+            texto_temporario.append(linha)
+    
+    if texto_temporario and bloco_atual:
+        dados[f"{bloco_atual}_texto"] = "\n".join(texto_temporario)
+    
+    if not dados["evangelho_ref"] or not dados["evangelho_texto"]:
+        print(f"   ⚠️  Dados incompletos")
         return None
+        
+    print(f"   ✅ Dados extraídos!")
+    return dados
 
 def workflow_mensal():
     """Workflow principal de mineração"""
@@ -155,7 +162,7 @@ def workflow_mensal():
         
         if resultado:
             try:
-                supabase.table("liturgia_palavra").upsert(resultado, on_conflict="data").execute()
+                _criar_cliente().table("liturgia_palavra").upsert(resultado, on_conflict="data").execute()
                 sucesso += 1
                 print(f"   💾 Salvo!\n")
             except Exception as e:
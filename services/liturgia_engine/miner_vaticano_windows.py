@@ -7,14 +7,16 @@
 import os
 import sys
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, CData, NavigableString, Tag
 from datetime import datetime, timedelta
+from functools import lru_cache
 from supabase import create_client
 import time
-import re
 from dotenv import load_dotenv
 import logging
 
+from classificador import classificar_linha, limpar_texto
+
 # =============================================================================
 # FIX: Windows Console Encoding
 # =============================================================================
@@ -27,73 +29,77 @@ if sys.platform == "win32":
     # Configuração para Windows PowerShell/CMD
     os.system('chcp 65001 > nul')
 
-# Configuração de Logging (SEM EMOJIS para Windows)
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s [%(levelname)s] %(message)s',
-    handlers=[
-        logging.FileHandler('miner_liturgia.log', encoding='utf-8'),
-        logging.StreamHandler()
-    ]
-)
+def _configurar_ambiente():
+    """Logging e .env — só ao rodar como script, para o parser poder ser importado offline."""
+    # Configuração de Logging (SEM EMOJIS para Windows)
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s [%(levelname)s] %(message)s',
+        handlers=[
+            logging.FileHandler('miner_liturgia.log', encoding='utf-8'),
+            logging.StreamHandler()
+        ]
+    )
+    load_dotenv()
 
-load_dotenv()
 
-URL_SUPABASE = os.environ.get("SUPABASE_URL")
-KEY_SUPABASE = os.environ.get("SUPABASE_KEY")
+@lru_cache(maxsize=1)
+def _criar_cliente():
+    """Cliente Supabase criado na primeira gravação (e reaproveitado)."""
+    url_supabase = os.environ.get("SUPABASE_URL")
+    key_supabase = os.environ.get("SUPABASE_KEY")
 
-if not URL_SUPABASE or not KEY_SUPABASE:
-    raise ValueError("[ERRO] Variaveis SUPABASE_URL e SUPABASE_KEY nao configuradas!")
+    if not url_supabase or not key_supabase:
+        raise ValueError("[ERRO] Variaveis SUPABASE_URL e SUPABASE_KEY nao configuradas!")
 
-supabase = create_client(URL_SUPABASE, KEY_SUPABASE)
+    return create_client(url_supabase, key_supabase)
 
 # =============================================================================
 # REGEX E UTILITÁRIOS
 # =============================================================================
 
-def extrair_referencia_biblica(texto):
+# Elementos que quebram o texto em blocos; os demais (strong, a, span, em...)
+# são inline e ficam no bloco que os contém
+BLOCOS = frozenset([
+    'p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'div', 'section', 'article', 'header',
+    'footer', 'blockquote', 'ul', 'ol', 'li', 'table', 'tr', 'td', 'th',
+])
+TIPOS_TEXTO = (NavigableString, CData)    # como get_text(): sem comentários, scripts e estilos
+
+def blocos_de_texto(corpo):
     """
-    Extrai referências bíblicas de diferentes formatos:
-    - Gn 1,1-5
-    - 1Cor 12,4-11
-    - Sl 22 (23), 1-6
-    - Mt 5,1-12a
+    Percorre a árvore de `corpo` uma única vez (pilha explícita, sem
+    get_text() por elemento) e devolve cada bloco de texto exatamente uma
+    vez, em ordem de documento. Um bloco é o texto de um elemento de BLOCOS
+    fora dos blocos aninhados nele; entrar ou sair de um bloco fecha o
+    anterior. Tempo linear no tamanho da página.
     """
-    patterns = [
-        r'([1-3]?\s*[A-Za-zÀ-ú]+\.?\s+\d+[,:]\s*\d+(?:-\d+)?(?:[a-z])?)',
-        r'([A-Za-zÀ-ú]+\s+\d+\s*\(\d+\)[,:]\s*\d+(?:-\d+)?)',
-        r'([A-Za-zÀ-ú]+\s+\d+[,:]\s*\d+(?:-\d+)?)'
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, texto)
-        if match:
-            return match.group(1).strip()
-    
-    return ""
+    blocos = []
+    trechos = []
 
-def limpar_texto(texto):
-    """Remove espaços extras e normaliza texto"""
-    texto = re.sub(r'\s+', ' ', texto)
-    texto = texto.replace('\xa0', ' ')
-    return texto.strip()
+    def fechar_bloco():
+        if trechos:
+            texto = limpar_texto("".join(trechos))
+            trechos.clear()
+            if texto:
+                blocos.append(texto)
 
-def identificar_tipo_leitura(linha):
-    """Identifica qual tipo de leitura baseado em palavras-chave"""
-    linha_lower = linha.lower()
-    
-    if any(x in linha_lower for x in ["primeira leitura", "1ª leitura", "1.ª leitura"]):
-        return "primeira_leitura"
-    elif any(x in linha_lower for x in ["segunda leitura", "2ª leitura", "2.ª leitura"]):
-        return "segunda_leitura"
-    elif any(x in linha_lower for x in ["salmo responsorial", "salmo", "sl "]):
-        return "salmo"
-    elif "evangelho" in linha_lower:
-        return "evangelho"
-    elif any(x in linha_lower for x in ["refrão", "r.", "resp."]):
-        return "refrao"
-    
-    return None
+    pilha = [(iter(corpo.children), True)]
+    while pilha:
+        filhos, eh_bloco = pilha[-1]
+        no = next(filhos, None)
+        if no is None:
+            pilha.pop()
+            if eh_bloco:
+                fechar_bloco()
+        elif type(no) in TIPOS_TEXTO:
+            trechos.append(no)
+        elif isinstance(no, Tag):
+            bloco = no.name in BLOCOS
+            if bloco:
+                fechar_bloco()
+            pilha.append((iter(no.children), bloco))
+    return blocos
 
 # =============================================================================
 # MINERADOR PRINCIPAL
@@ -132,121 +138,121 @@ def minerar_data(data_alvo):
             logging.error(f"[HTTP] Erro {response.status_code}")
             return None
         
-        soup = BeautifulSoup(response.text, 'html.parser')
+        return extrair_leituras(response.text, data_alvo)
         
-        # Estrutura de dados
-        dados = {
-            "data": data_alvo.strftime('%Y-%m-%d'),
-            "primeira_leitura_ref": "",
-            "primeira_leitura_texto": "",
-            "salmo_ref": "",
-            "salmo_refrao": "",
-            "salmo_texto": "",
-            "segunda_leitura_ref": "",
-            "segunda_leitura_texto": "",
-            "evangelho_ref": "",
-            "evangelho_texto": ""
-        }
+    except requests.exceptions.Timeout:
+        logging.error(f"   [TIMEOUT] Ao acessar {url}")
+        return None
+    except requests.exceptions.RequestException as e:
+        logging.error(f"   [REDE] Erro de rede: {str(e)}")
+        return None
+    except Exception as e:
+        logging.error(f"   [ERRO] Erro inesperado: {str(e)}", exc_info=True)
+        return None
 
-        # Tenta múltiplos seletores (robustez)
-        containers = [
-            soup.find('article'),
-            soup.find('main'),
-            soup.find('div', class_='section__content'),
-            soup.find('div', class_='content-body'),
-            soup.find('div', {'id': 'main-content'})
-        ]
-        
-        corpo = next((c for c in containers if c), None)
-        
-        if not corpo:
-            logging.warning("[HTML] Nenhum container de conteudo encontrado")
-            return None
+def extrair_leituras(html, data_alvo, salvar_debug=True):
+    """Parser da página palavra-do-dia (sem rede); `salvar_debug` grava o HTML sem texto."""
+    soup = BeautifulSoup(html, 'html.parser')
+    
+    # Estrutura de dados
+    dados = {
+        "data": data_alvo.strftime('%Y-%m-%d'),
+        "primeira_leitura_ref": "",
+        "primeira_leitura_texto": "",
+        "salmo_ref": "",
+        "salmo_refrao": "",
+        "salmo_texto": "",
+        "segunda_leitura_ref": "",
+        "segunda_leitura_texto": "",
+        "evangelho_ref": "",
+        "evangelho_texto": ""
+    }
+
+    # Tenta múltiplos seletores (robustez)
+    containers = [
+        soup.find('article'),
+        soup.find('main'),
+        soup.find('div', class_='section__content'),
+        soup.find('div', class_='content-body'),
+        soup.find('div', {'id': 'main-content'})
+    ]
+    
+    corpo = next((c for c in containers if c), None)
+    
+    if not corpo:
+        logging.warning("[HTML] Nenhum container de conteudo encontrado")
+        return None
 
-        # Extração de elementos
-        elementos = []
-        for elem in corpo.find_all(['p', 'h1', 'h2', 'h3', 'h4', 'strong', 'div']):
-            texto = limpar_texto(elem.get_text())
-            if texto and len(texto) > 3:
-                elementos.append(texto)
+    # Extração de elementos (cada bloco de texto uma única vez)
+    elementos = [texto for texto in blocos_de_texto(corpo) if len(texto) > 3]
+    
+    if not elementos:
+        logging.warning("[PARSE] Nenhum elemento textual extraido")
         
-        if not elementos:
-            logging.warning("[PARSE] Nenhum elemento textual extraido")
-            
-            # DEBUG: Salva HTML para análise
+        # DEBUG: Salva HTML para análise
+        if salvar_debug:
             debug_path = f"debug_{data_alvo.strftime('%Y%m%d')}.html"
             with open(debug_path, 'w', encoding='utf-8') as f:
-                f.write(response.text)
+                f.write(html)
             logging.info(f"[DEBUG] HTML salvo em: {debug_path}")
-            
-            return None
         
-        # Processamento sequencial
-        bloco_atual = None
-        buffer_texto = []
-        
-        for idx, texto in enumerate(elementos):
-            tipo = identificar_tipo_leitura(texto)
-            
-            if tipo == "refrao" and bloco_atual == "salmo":
-                # Captura refrão do salmo
-                dados["salmo_refrao"] = texto.replace("Refrão:", "").replace("R.", "").replace("Resp.", "").strip()
-                continue
-            
-            if tipo in ["primeira_leitura", "segunda_leitura", "salmo", "evangelho"]:
-                # Salva bloco anterior
-                if bloco_atual and buffer_texto:
-                    dados[f"{bloco_atual}_texto"] = "\n".join(buffer_texto)
-                
-                # Inicia novo bloco
-                bloco_atual = tipo
-                buffer_texto = []
-                
-                # Extrai referência
-                ref = extrair_referencia_biblica(texto)
-                dados[f"{bloco_atual}_ref"] = ref
-                
-                logging.info(f"   [BLOCK] {tipo.replace('_', ' ').title()}: {ref}")
-                continue
-            
-            # Acumula texto do bloco atual
-            if bloco_atual:
-                # Ignora linhas muito curtas ou de navegação
-                if len(texto) > 30 and not any(x in texto.lower() for x in ["compartilhar", "imprimir", "palavra do papa", "mais lidas"]):
-                    buffer_texto.append(texto)
+        return None
+    
+    # Processamento sequencial
+    bloco_atual = None
+    buffer_texto = []
+    
+    for idx, texto in enumerate(elementos):
+        tipo, ref = classificar_linha(texto)
         
-        # Salva último bloco
-        if bloco_atual and buffer_texto:
-            dados[f"{bloco_atual}_texto"] = "\n".join(buffer_texto)
+        if tipo == "refrao" and bloco_atual == "salmo":
+            # Captura refrão do salmo
+            dados["salmo_refrao"] = texto.replace("Refrão:", "").replace("R.", "").replace("Resp.", "").strip()
+            continue
         
-        # Validação de qualidade
-        campos_obrigatorios = ["evangelho_ref", "evangelho_texto"]
-        if not all(dados[campo] for campo in campos_obrigatorios):
-            logging.warning(f"[VALID] Dados incompletos (falta Evangelho)")
+        if tipo in ["primeira_leitura", "segunda_leitura", "salmo", "evangelho"]:
+            # Salva bloco anterior
+            if bloco_atual and buffer_texto:
+                dados[f"{bloco_atual}_texto"] = "\n".join(buffer_texto)
             
-            # DEBUG: Mostra o que foi extraído
-            logging.info(f"[DEBUG] Blocos encontrados:")
-            for campo, valor in dados.items():
-                if valor and not campo.endswith('_texto'):
-                    logging.info(f"  - {campo}: {valor[:50]}")
+            # Inicia novo bloco
+            bloco_atual = tipo
+            buffer_texto = []
             
-            return None
+            # Referência (já extraída por classificar_linha)
+            dados[f"{bloco_atual}_ref"] = ref
+            
+            logging.info(f"   [BLOCK] {tipo.replace('_', ' ').title()}: {ref}")
+            continue
         
-        # Estatísticas
-        total_chars = sum(len(dados[k]) for k in dados if k.endswith('_texto'))
-        logging.info(f"   [OK] Extraido {total_chars} caracteres de texto liturgico")
+        # Acumula texto do bloco atual
+        if bloco_atual:
+            # Ignora linhas muito curtas ou de navegação
+            if len(texto) > 30 and not any(x in texto.lower() for x in ["compartilhar", "imprimir", "palavra do papa", "mais lidas"]):
+                buffer_texto.append(texto)
+    
+    # Salva último bloco
+    if bloco_atual and buffer_texto:
+        dados[f"{bloco_atual}_texto"] = "\n".join(buffer_texto)
+    
+    # Validação de qualidade
+    campos_obrigatorios = ["evangelho_ref", "evangelho_texto"]
+    if not all(dados[campo] for campo in campos_obrigatorios):
+        logging.warning(f"[VALID] Dados incompletos (falta Evangelho)")
         
-        return dados
+        # DEBUG: Mostra o que foi extraído
+        logging.info(f"[DEBUG] Blocos encontrados:")
+        for campo, valor in dados.items():
+            if valor and not campo.endswith('_texto'):
+                logging.info(f"  - {campo}: {valor[:50]}")
         
-    except requests.exceptions.Timeout:
-        logging.error(f"   [TIMEOUT] Ao acessar {url}")
-        return None
-    except requests.exceptions.RequestException as e:
-        logging.error(f"   [REDE] Erro de rede: {str(e)}")
-        return None
-    except Exception as e:
-        logging.error(f"   [ERRO] Erro inesperado: {str(e)}", exc_info=True)
         return None
+    
+    # Estatísticas
+    total_chars = sum(len(dados[k]) for k in dados if k.endswith('_texto'))
+    logging.info(f"   [OK] Extraido {total_chars} caracteres de texto liturgico")
+    
+    return dados
 
 # =============================================================================
 # WORKFLOW DE MINERAÇÃO
@@ -297,7 +303,7 @@ def workflow_mensal(modo="atual"):
         if resultado:
             try:
                 # Upsert no Supabase
-                response = supabase.table("liturgia_palavra").upsert(
+                response = _criar_cliente().table("liturgia_palavra").upsert(
                     resultado, 
                     on_conflict="data"
                 ).execute()
@@ -352,7 +358,7 @@ def testar_data_especifica(data_str):
         # Tenta salvar no banco
         try:
             logging.info("\n[DB] Tentando salvar no banco...")
-            response = supabase.table("liturgia_palavra").upsert(
+            response = _criar_cliente().table("liturgia_palavra").upsert(
                 resultado, 
                 on_conflict="data"
             ).execute()
@@ -371,6 +377,8 @@ def testar_data_especifica(data_str):
 if __name__ == "__main__":
     import sys
     
+    _configurar_ambiente()
+    
     try:
         # Modo CLI
         if len(sys.argv) > 1:
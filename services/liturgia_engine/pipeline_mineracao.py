@@ -0,0 +1,312 @@
+# =============================================================================
+# MÓDULO: Pipeline de mineração (Sacristia Digital)
+# Encadeia os estágios do minerador com filas limitadas, para que eles se
+# sobreponham: enquanto a página N é extraída, a N+1 está sendo baixada e a
+# linha N-1 está sendo gravada.
+#
+#     baixar (asyncio, 1 thread) ─▶ fila ─▶ extrair + validar (N threads,
+#     pool de processos) ─▶ fila ─▶ gravar (1 thread, GravadorEmLotes)
+#
+# Filas cheias bloqueiam quem produz (contrapressão): um banco lento segura
+# a extração, que segura o download. Cada estágio mede o tempo trabalhando,
+# esperando entrada e bloqueado na saída.
+# =============================================================================
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from coletor_async import ColetorAsync
+from gravador_lotes import GravadorEmLotes
+from resiliencia import falha_transitoria
+
+log = logging.getLogger(__name__)
+
+TAMANHO_FILA = 8
+TRABALHADORES_PADRAO = max(1, min(4, (os.cpu_count() or 2) - 1))
+RECONSTRUCOES_POOL = 2      # vezes que um pool de extração quebrado é refeito antes de desistir
+
+_FIM = object()     # sentinela de fim de fluxo
+_TRANSITORIA = object()     # página que não veio por falha transitória (timeout, 5xx, disjuntor)
+_ERRO_EXTRACAO = object()   # página que veio mas a extração falhou (exceção, pool quebrado)
+
+
+# =============================================================================
+# ESTATÍSTICAS POR ESTÁGIO
+# =============================================================================
+
+class EstatisticasEstagio:
+    """Tempos acumulados de um estágio (somados entre os seus trabalhadores)."""
+
+    def __init__(self, nome: str, trabalhadores: int):
+        self.nome = nome
+        self.trabalhadores = trabalhadores
+        self.itens = 0
+        self.ocupado = 0.0              # trabalhando num item
+        self.espera_entrada = 0.0       # fila de entrada vazia
+        self.espera_saida = 0.0         # fila de saída cheia (contrapressão)
+        self.pico_fila = 0              # maior profundidade da fila de saída
+        self._trava = threading.Lock()
+
+    def registrar(self, ocupado: float = 0.0, espera_entrada: float = 0.0,
+                  espera_saida: float = 0.0, fila: queue.Queue | None = None) -> None:
+        with self._trava:
+            self.itens += 1
+            self.ocupado += ocupado
+            self.espera_entrada += espera_entrada
+            self.espera_saida += espera_saida
+            if fila is not None:
+                self.pico_fila = max(self.pico_fila, fila.qsize())
+
+    def utilizacao(self, duracao: float) -> float:
+        return self.ocupado / (duracao * self.trabalhadores) if duracao > 0 else 0.0
+
+    def linha(self, duracao: float) -> str:
+        return (f"{self.nome:<8} {self.itens:4d} itens · {self.trabalhadores} trab. · "
+                f"utilização {self.utilizacao(duracao):4.0%} · "
+                f"esperando entrada {self.espera_entrada:6.1f}s · "
+                f"bloqueado na saída {self.espera_saida:6.1f}s · pico da fila {self.pico_fila}")
+
+
+def _colocar(fila: queue.Queue, item) -> float:
+    """put bloqueante; devolve quanto tempo ficou bloqueado."""
+    inicio = time.perf_counter()
+    fila.put(item)
+    return time.perf_counter() - inicio
+
+
+def _iniciar_processo(nivel: int, formato: str) -> None:
+    """Processos do pool (spawn) não herdam a configuração de logging."""
+    logging.basicConfig(level=nivel, format=formato)
+
+
+def _formato_log() -> str:
+    raiz = logging.getLogger()
+    if raiz.handlers and raiz.handlers[0].formatter:
+        return raiz.handlers[0].formatter._fmt
+    return logging.BASIC_FORMAT
+
+
+# =============================================================================
+# POOL DE EXTRAÇÃO
+# =============================================================================
+
+class PoolExtracao:
+    """
+    ProcessPoolExecutor (spawn) criado no primeiro uso. Se um processo
+    morrer (BrokenProcessPool), o pool é refeito e a página repetida, até
+    `reconstrucoes` vezes; depois disso `executar` levanta BrokenProcessPool.
+    Pode servir a várias execuções do pipeline (ver `fechar`).
+    """
+
+    def __init__(self, trabalhadores: int = TRABALHADORES_PADRAO, reconstrucoes: int = RECONSTRUCOES_POOL):
+        self.trabalhadores = trabalhadores
+        self.reconstrucoes = reconstrucoes
+        self.quebrado = False
+        self._pool = None
+        self._trava = threading.Lock()
+
+    def _executor(self) -> ProcessPoolExecutor:
+        with self._trava:
+            if self.quebrado:
+                raise BrokenProcessPool("pool de extração desativado após quebras seguidas")
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.trabalhadores,
+                    mp_context=multiprocessing.get_context("spawn"),   # fork + threads pode travar
+                    initializer=_iniciar_processo,
+                    initargs=(logging.getLogger().getEffectiveLevel(), _formato_log()),
+                )
+            return self._pool
+
+    def executar(self, funcao, *args):
+        while True:
+            pool = self._executor()
+            try:
+                return pool.submit(funcao, *args).result()
+            except BrokenProcessPool:
+                with self._trava:
+                    if self._pool is pool:      # a primeira thread a notar descarta o pool
+                        self._pool = None
+                        pool.shutdown(wait=False, cancel_futures=True)
+                        if self.reconstrucoes <= 0:
+                            self.quebrado = True
+                            raise
+                        self.reconstrucoes -= 1
+                        log.warning("   🧨 Processo de extração morreu — recriando o pool")
+
+    def fechar(self) -> None:
+        with self._trava:
+            if self._pool is not None:
+                self._pool.shutdown(cancel_futures=True)
+                self._pool = None
+
+    def __enter__(self) -> "PoolExtracao":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.fechar()
+
+
+# =============================================================================
+# PIPELINE
+# =============================================================================
+
+def executar_pipeline(itens, processar, gravador: GravadorEmLotes, coletor: ColetorAsync,
+                      trabalhadores: int = TRABALHADORES_PADRAO, tamanho_fila: int = TAMANHO_FILA,
+                      processos: bool = True, rotulo=str, pool: PoolExtracao | None = None) -> dict:
+    """
+    `itens` = [(chave, url)] — `url` é o que `coletor.baixar` recebe (a
+    data, no ColetorComHedge). Cada página baixada vira
+    `processar(status, texto, chave, url_respondida)` (função de módulo,
+    para ir ao pool de processos; deve devolver a linha a gravar ou None)
+    e as linhas seguem para `gravador`. Com `processos=False` a extração roda nas próprias
+    threads. `pool` (PoolExtracao) reaproveita um pool entre execuções — quem
+    o passa é quem o fecha. `rotulo(chave)` aparece no log de cada página.
+
+    `sem_dados` conta as páginas que responderam sem leituras (404, página
+    incompleta) — faltas reais; `transitorias`, as que não vieram por
+    timeout, 429/5xx ou disjuntor aberto, mesmo após as retentativas;
+    `erros_extracao`, as que vieram mas a extração levantou exceção. Se o
+    pool de processos quebrar de vez, o pipeline para: as datas que faltavam
+    também contam em `erros_extracao` e `interrompido` fica True.
+
+    Devolve {"com_dados", "sem_dados", "transitorias", "erros_extracao",
+    "interrompido", "duracao", "estagios": [EstatisticasEstagio]}.
+    """
+    chaves = [chave for chave, _ in itens]
+    urls = [url for _, url in itens]
+    fila_paginas = queue.Queue(maxsize=tamanho_fila)
+    fila_linhas = queue.Queue(maxsize=tamanho_fila)
+    est_baixar = EstatisticasEstagio("baixar", coletor.concorrencia_por_host)
+    est_extrair = EstatisticasEstagio("extrair", trabalhadores)
+    est_gravar = EstatisticasEstagio("gravar", 1)
+    totais = {"com_dados": 0, "sem_dados": 0, "transitorias": 0, "erros_extracao": 0}
+    parar = threading.Event()
+
+    proprio = processos and pool is None
+    if proprio:
+        pool = PoolExtracao(trabalhadores)
+    elif not processos:
+        pool = None
+
+    # --- Estágio 1: download (event loop próprio) ----------------------------
+    def entregar(indice, resposta):
+        espera = _colocar(fila_paginas, (chaves[indice], resposta))
+        est_baixar.registrar(espera_saida=espera, fila=fila_paginas)
+
+    def baixar():
+        try:
+            asyncio.run(coletor.entregar_async(urls, entregar,
+                                               em_voo=coletor.concorrencia_por_host + tamanho_fila,
+                                               parar=parar))
+        except Exception as e:
+            log.error(f"   ❌ Estágio de download interrompido: {str(e)}", exc_info=True)
+        finally:
+            est_baixar.ocupado = coletor.tempo_ocupado - ocupado_antes   # vagas de conexão em uso
+            for _ in range(trabalhadores):
+                fila_paginas.put(_FIM)
+
+    # --- Estágio 2: extração + validação (pool) ------------------------------
+    def extrair():
+        while True:
+            inicio = time.perf_counter()
+            item = fila_paginas.get()
+            espera_entrada = time.perf_counter() - inicio
+            if item is _FIM:
+                return
+            chave, resposta = item
+
+            inicio = time.perf_counter()
+            log.info(f"📆 {rotulo(chave)}")
+            if parar.is_set():
+                linha = _ERRO_EXTRACAO
+            elif falha_transitoria(resposta.status):
+                motivo = resposta.erro or f"HTTP {resposta.status}"
+                log.error(f"   ⚡ Sem resposta para {resposta.url}: {motivo}")
+                linha = _TRANSITORIA
+            else:
+                try:
+                    if pool is not None:
+                        linha = pool.executar(processar, resposta.status, resposta.texto, chave,
+                                              resposta.url)
+                    else:
+                        linha = processar(resposta.status, resposta.texto, chave, resposta.url)
+                except BrokenProcessPool as e:
+                    if not parar.is_set():
+                        log.error(f"   ❌ Pool de extração quebrado ({str(e)}) — interrompendo o pipeline")
+                    parar.set()
+                    linha = _ERRO_EXTRACAO
+                except Exception as e:
+                    log.error(f"   ❌ Falha ao extrair {resposta.url}: {str(e)}")
+                    linha = _ERRO_EXTRACAO
+            ocupado = time.perf_counter() - inicio
+
+            espera = _colocar(fila_linhas, linha)
+            est_extrair.registrar(ocupado=ocupado, espera_entrada=espera_entrada,
+                                  espera_saida=espera, fila=fila_linhas)
+
+    # --- Estágio 3: gravação em lotes ----------------------------------------
+    def gravar():
+        while True:
+            inicio = time.perf_counter()
+            try:
+                linha = fila_linhas.get(timeout=gravador.intervalo)
+            except queue.Empty:
+                gravador.talvez_descarregar()   # lote parcial velho não espera a próxima linha
+                est_gravar.espera_entrada += time.perf_counter() - inicio
+                continue
+            espera_entrada = time.perf_counter() - inicio
+            if linha is _FIM:
+                return
+
+            inicio = time.perf_counter()
+            if linha is _TRANSITORIA:
+                totais["transitorias"] += 1
+            elif linha is _ERRO_EXTRACAO:
+                totais["erros_extracao"] += 1
+            elif linha:
+                totais["com_dados"] += 1
+                gravador.adicionar(linha)
+            else:
+                totais["sem_dados"] += 1
+            est_gravar.registrar(ocupado=time.perf_counter() - inicio, espera_entrada=espera_entrada)
+
+    ocupado_antes = coletor.tempo_ocupado
+    inicio = time.perf_counter()
+    extratores = [threading.Thread(target=extrair, name=f"extrair-{i}", daemon=True)
+                  for i in range(trabalhadores)]
+    gravadora = threading.Thread(target=gravar, name="gravar", daemon=True)
+    for thread in [gravadora, *extratores]:
+        thread.start()
+    try:
+        baixar()
+        for thread in extratores:
+            thread.join()
+        fila_linhas.put(_FIM)
+        gravadora.join()
+        inicio_final = time.perf_counter()
+        gravador.descarregar()
+        est_gravar.ocupado += time.perf_counter() - inicio_final
+    finally:
+        if proprio:
+            pool.fechar()
+
+    # Datas que nem chegaram a ser baixadas porque o pipeline parou
+    totais["erros_extracao"] += len(itens) - sum(totais.values())
+    duracao = time.perf_counter() - inicio
+    return {**totais, "interrompido": parar.is_set(), "duracao": duracao,
+            "estagios": [est_baixar, est_extrair, est_gravar]}
+
+
+def log_estagios(resultado: dict) -> None:
+    duracao = resultado["duracao"]
+    log.info(f"⚙️  Pipeline: {duracao:.1f}s")
+    for estagio in resultado["estagios"]:
+        log.info(f"   {estagio.linha(duracao)}")
@@ -0,0 +1,128 @@
+# =============================================================================
+# MÓDULO: Retentativas e disjuntor por host (Sacristia Digital)
+# Falha transitória (timeout, erro de rede, 429/5xx) não deve custar o dia
+# até a próxima execução: a requisição é repetida com backoff exponencial
+# limitado e jitter. E um host que só falha não deve custar 30 s de timeout
+# por data: depois de N falhas seguidas o disjuntor abre e as próximas datas
+# falham na hora, até uma requisição de sonda passar.
+#
+#     politica = PoliticaRetentativa()
+#     disjuntor = politica.disjuntor(url)
+#     if disjuntor.permitir(): ...; disjuntor.registrar(transitoria=...)
+#     time.sleep(politica.espera(tentativa))
+# =============================================================================
+
+import logging
+import random
+import time
+from urllib.parse import urlsplit
+
+log = logging.getLogger(__name__)
+
+# Respostas que valem nova tentativa (além de timeout/erro de rede)
+STATUS_TRANSITORIOS = {408, 425, 429, 500, 502, 503, 504}
+
+TENTATIVAS = 3              # por requisição, contando a primeira
+BACKOFF_BASE = 1.0          # s; a espera da tentativa n é sorteada em [0, base·2ⁿ]
+BACKOFF_TETO = 30.0         # s
+FALHAS_PARA_ABRIR = 5       # falhas transitórias seguidas que abrem o disjuntor
+TEMPO_ABERTO = 60.0         # s até deixar passar uma sonda
+
+
+def falha_transitoria(status: int | None) -> bool:
+    """None (timeout/erro de rede) e STATUS_TRANSITORIOS; 404 e afins são faltas reais."""
+    return status is None or status in STATUS_TRANSITORIOS
+
+
+class Disjuntor:
+    """
+    Circuit breaker de um host. Fechado: tudo passa. Após `falhas_para_abrir`
+    falhas transitórias seguidas, aberto: nada passa por `tempo_aberto` s.
+    Depois, meio-aberto: passa uma sonda por vez; se ela funcionar fecha, se
+    falhar abre de novo.
+    """
+
+    def __init__(self, host: str, falhas_para_abrir: int = FALHAS_PARA_ABRIR,
+                 tempo_aberto: float = TEMPO_ABERTO):
+        self.host = host
+        self.falhas_para_abrir = falhas_para_abrir
+        self.tempo_aberto = tempo_aberto
+        self.falhas_seguidas = 0
+        self.aberto_ate = None              # time.monotonic(); None = fechado
+        self.sonda_em_voo = False
+        self.aberturas = 0
+        self.rejeitadas = 0
+
+    @property
+    def estado(self) -> str:
+        if self.aberto_ate is None:
+            return "fechado"
+        return "aberto" if time.monotonic() < self.aberto_ate else "meio-aberto"
+
+    def permitir(self) -> bool:
+        estado = self.estado
+        if estado == "fechado":
+            return True
+        if estado == "meio-aberto" and not self.sonda_em_voo:
+            self.sonda_em_voo = True
+            return True
+        self.rejeitadas += 1
+        return False
+
+    def registrar(self, transitoria: bool) -> None:
+        """Resultado de uma requisição que `permitir()` deixou passar."""
+        self.sonda_em_voo = False
+        if not transitoria:
+            if self.aberto_ate is not None:
+                log.info(f"🔌 Disjuntor de {self.host} fechado (host voltou a responder)")
+            self.falhas_seguidas = 0
+            self.aberto_ate = None
+            return
+        self.falhas_seguidas += 1
+        estado = self.estado
+        if estado == "aberto":
+            return                          # requisições que já estavam em voo ao abrir
+        if estado == "meio-aberto" or self.falhas_seguidas >= self.falhas_para_abrir:
+            self.aberto_ate = time.monotonic() + self.tempo_aberto
+            self.aberturas += 1
+            log.warning(f"🔌 Disjuntor de {self.host} aberto por {self.tempo_aberto:g}s "
+                        f"({self.falhas_seguidas} falhas seguidas)")
+
+
+class PoliticaRetentativa:
+    """
+    Tentativas, backoff e os disjuntores (um por host), com as contagens
+    da execução: `retentativas`, `recuperadas` (deram certo numa
+    retentativa) e `esgotadas` (falharam em todas).
+    """
+
+    def __init__(self, tentativas: int = TENTATIVAS, base: float = BACKOFF_BASE,
+                 teto: float = BACKOFF_TETO, falhas_para_abrir: int = FALHAS_PARA_ABRIR,
+                 tempo_aberto: float = TEMPO_ABERTO):
+        self.tentativas = max(1, tentativas)
+        self.base = base
+        self.teto = teto
+        self.falhas_para_abrir = falhas_para_abrir
+        self.tempo_aberto = tempo_aberto
+        self.disjuntores: dict[str, Disjuntor] = {}
+        self.retentativas = 0
+        self.recuperadas = 0
+        self.esgotadas = 0
+
+    def disjuntor(self, url: str) -> Disjuntor:
+        host = urlsplit(url).netloc
+        if host not in self.disjuntores:
+            self.disjuntores[host] = Disjuntor(host, self.falhas_para_abrir, self.tempo_aberto)
+        return self.disjuntores[host]
+
+    def espera(self, tentativa: int, minimo: float | None = None) -> float:
+        """Backoff "full jitter" após a `tentativa`-ésima falha (0 = primeira); `minimo` = Retry-After."""
+        espera = random.uniform(0, min(self.teto, self.base * 2 ** tentativa))
+        return max(espera, minimo or 0.0)
+
+    def resumo(self) -> str:
+        aberturas = sum(d.aberturas for d in self.disjuntores.values())
+        rejeitadas = sum(d.rejeitadas for d in self.disjuntores.values())
+        return (f"Retentativas: {self.retentativas} ({self.recuperadas} recuperada(s), "
+                f"{self.esgotadas} esgotada(s)) · disjuntor: {aberturas} abertura(s), "
+                f"{rejeitadas} requisição(ões) barrada(s)")
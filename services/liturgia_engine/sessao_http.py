@@ -0,0 +1,164 @@
+# =============================================================================
+# MÓDULO: Sessão HTTP compartilhada (Sacristia Digital)
+# Uma única camada de conexões para os mineradores (Vatican News e Paulus):
+# pool por host com keep-alive, tamanho de pool configurável por host e
+# contagem de conexões abertas × reaproveitadas.
+#
+# Uso (síncrono, requests):
+#     from sessao_http import obter_sessao, estatisticas
+#     resposta = obter_sessao().get(url, headers=..., timeout=30)
+#
+# Uso (assíncrono, httpx):
+#     async with criar_cliente_async(headers=..., timeout=30) as cliente: ...
+# =============================================================================
+
+import logging
+import threading
+from functools import lru_cache
+from urllib.parse import urlsplit
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+log = logging.getLogger(__name__)
+
+# Conexões mantidas abertas por host (demais hosts usam TAMANHO_POOL_PADRAO)
+TAMANHO_POOL = {
+    "www.vaticannews.va": 4,
+    "www.paulus.com.br": 2,
+}
+TAMANHO_POOL_PADRAO = 4
+
+
+# =============================================================================
+# CONTADOR DE CONEXÕES
+# =============================================================================
+
+class ContadorConexoes:
+    """Requisições e conexões TCP abertas, no total e por host (thread-safe)."""
+
+    def __init__(self):
+        self._trava = threading.Lock()
+        self.zerar()
+
+    def zerar(self) -> None:
+        self.requisicoes = 0
+        self.abertas = 0
+        self.por_host: dict[str, dict[str, int]] = {}
+
+    def _host(self, host: str) -> dict[str, int]:
+        return self.por_host.setdefault(host, {"requisicoes": 0, "abertas": 0})
+
+    def registrar_requisicao(self, host: str) -> None:
+        with self._trava:
+            self.requisicoes += 1
+            self._host(host)["requisicoes"] += 1
+
+    def registrar_abertura(self, host: str) -> None:
+        with self._trava:
+            self.abertas += 1
+            self._host(host)["abertas"] += 1
+
+    @property
+    def reusadas(self) -> int:
+        return max(0, self.requisicoes - self.abertas)
+
+    def resumo(self) -> dict:
+        return {"requisicoes": self.requisicoes, "conexoes_abertas": self.abertas,
+                "conexoes_reusadas": self.reusadas}
+
+
+CONTADOR = ContadorConexoes()
+
+
+def estatisticas() -> dict:
+    """{"requisicoes", "conexoes_abertas", "conexoes_reusadas"} desde o início (ou do último zerar)."""
+    return CONTADOR.resumo()
+
+
+def log_estatisticas() -> None:
+    r = CONTADOR.resumo()
+    log.info(f"🔌 Conexões: {r['conexoes_abertas']} abertas, {r['conexoes_reusadas']} reusadas "
+             f"em {r['requisicoes']} requisições")
+
+
+# =============================================================================
+# SESSÃO SÍNCRONA (requests)
+# =============================================================================
+
+class _PoolHTTPContado(HTTPConnectionPool):
+    def _new_conn(self):
+        CONTADOR.registrar_abertura(self.host)
+        return super()._new_conn()
+
+
+class _PoolHTTPSContado(HTTPSConnectionPool):
+    def _new_conn(self):
+        CONTADOR.registrar_abertura(self.host)
+        return super()._new_conn()
+
+
+class _AdaptadorContado(HTTPAdapter):
+    """HTTPAdapter cujos pools registram cada conexão nova no CONTADOR."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {"http": _PoolHTTPContado,
+                                                   "https": _PoolHTTPSContado}
+
+    def send(self, request, *args, **kwargs):
+        CONTADOR.registrar_requisicao(urlsplit(request.url).hostname or "")
+        return super().send(request, *args, **kwargs)
+
+
+def criar_sessao(tamanho_pool: dict[str, int] | None = None) -> requests.Session:
+    """Session com um adaptador (pool keep-alive) por host de `tamanho_pool`."""
+    sessao = requests.Session()
+    padrao = _AdaptadorContado(pool_connections=8, pool_maxsize=TAMANHO_POOL_PADRAO)
+    sessao.mount("http://", padrao)
+    sessao.mount("https://", padrao)
+    for host, tamanho in (tamanho_pool or TAMANHO_POOL).items():
+        adaptador = _AdaptadorContado(pool_connections=1, pool_maxsize=tamanho)
+        sessao.mount(f"https://{host}/", adaptador)
+        sessao.mount(f"http://{host}/", adaptador)
+    return sessao
+
+
+@lru_cache(maxsize=1)
+def obter_sessao() -> requests.Session:
+    """Sessão única do processo, compartilhada por todos os mineradores."""
+    return criar_sessao()
+
+
+# =============================================================================
+# CLIENTE ASSÍNCRONO (httpx)
+# =============================================================================
+
+class _TransporteContado(httpx.AsyncHTTPTransport):
+    """Transporte httpx que conta requisições e conexões novas (via trace do httpcore)."""
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        CONTADOR.registrar_requisicao(host)
+
+        async def rastrear(evento: str, info: dict) -> None:
+            if evento == "connection.connect_tcp.complete":
+                CONTADOR.registrar_abertura(host)
+
+        request.extensions = {**request.extensions, "trace": rastrear}
+        return await super().handle_async_request(request)
+
+
+def criar_cliente_async(headers: dict | None = None, timeout: float = 30.0,
+                        tamanho_pool: dict[str, int] | None = None) -> httpx.AsyncClient:
+    """AsyncClient com um transporte (pool keep-alive) por host de `tamanho_pool`."""
+    def transporte(tamanho: int) -> _TransporteContado:
+        return _TransporteContado(limits=httpx.Limits(max_connections=tamanho,
+                                                      max_keepalive_connections=tamanho))
+
+    montagens = {f"all://{host}": transporte(tamanho)
+                 for host, tamanho in (tamanho_pool or TAMANHO_POOL).items()}
+    return httpx.AsyncClient(headers=headers, timeout=timeout, follow_redirects=True,
+                             transport=transporte(TAMANHO_POOL_PADRAO), mounts=montagens)
@@ -0,0 +1,158 @@
+# =============================================================================
+# MÓDULO: Substituto local do Vatican News (Sacristia Digital)
+# Servidor HTTP em memória que responde às URLs de palavra-do-dia, para medir
+# o coletor sem rede e sem sobrecarregar o site real.
+#
+# Uso:
+#     with ServidorVaticanLocal(latencia=0.3) as srv:
+#         minerar_lista(datas, url_base=srv.url, sb=sb)      # miner_liturgia
+#         srv.requisicoes, srv.pico_simultaneas, srv.instantes
+# =============================================================================
+
+import hashlib
+import os
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+_ROTA = re.compile(r"^/pt/palavra-do-dia/(\d{4})/(\d{2})/(\d{2})\.html$")
+_PAGINA_PADRAO = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                              "..", "..", "debug_vatican.html")
+
+
+class ServidorVaticanLocal:
+    """
+    Responde `GET /pt/palavra-do-dia/AAAA/MM/DD.html` com `html` (padrão: a
+    página salva em debug_vatican.html). Datas em `ausentes` ("AAAA-MM-DD")
+    e qualquer outra rota devolvem 404; `latencia` atrasa cada resposta.
+    As páginas levam ETag e `If-None-Match` igual recebe 304 (contado em
+    `nao_modificadas`). Com `limite_taxa`, a requisição que passar de
+    `limite_taxa` no último segundo recebe 429 com `Retry-After` (contada
+    em `recusadas`), como um site com rate limit. As próximas
+    `falhar_proximas` requisições recebem 503 (falha transitória).
+    """
+
+    def __init__(self, host: str = "127.0.0.1", porta: int = 0, latencia: float = 0.0,
+                 html: bytes | None = None, ausentes: set[str] | None = None,
+                 limite_taxa: float | None = None, retry_after: int = 1):
+        if html is None:
+            with open(_PAGINA_PADRAO, "rb") as f:
+                html = f.read()
+        self.html = html
+        self.latencia = latencia
+        self.ausentes = ausentes or set()
+        self.limite_taxa = limite_taxa
+        self.retry_after = retry_after
+        self.recusadas = 0                          # respostas 429
+        self.falhar_proximas = 0                    # quantas das próximas recebem 503
+        self.requisicoes = 0
+        self.conexoes = 0                           # conexões TCP aceitas
+        self.nao_modificadas = 0                    # respostas 304
+        self.simultaneas = 0
+        self.pico_simultaneas = 0
+        self.instantes: list[float] = []          # time.monotonic() de cada chegada
+        self._trava = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, porta), self._criar_handler())
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, porta = self._httpd.server_address[:2]
+        return f"http://{host}:{porta}"
+
+    def __enter__(self) -> "ServidorVaticanLocal":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def zerar_contadores(self) -> None:
+        with self._trava:
+            self.requisicoes = self.conexoes = self.nao_modificadas = self.pico_simultaneas = 0
+            self.recusadas = 0
+            self.instantes = []
+
+    def taxa_maxima(self, janela: float = 1.0) -> int:
+        """Maior número de requisições recebidas em qualquer janela de `janela` segundos."""
+        instantes = sorted(self.instantes)
+        maior = inicio = 0
+        for fim, t in enumerate(instantes):
+            while t - instantes[inicio] >= janela:
+                inicio += 1
+            maior = max(maior, fim - inicio + 1)
+        return maior
+
+    # -------------------------------------------------------------------------
+    # HTTP
+    # -------------------------------------------------------------------------
+
+    def _criar_handler(self):
+        servidor = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                super().setup()
+                with servidor._trava:
+                    servidor.conexoes += 1
+
+            def _responder(self, status: int, corpo: bytes, etag: str = "", cabecalhos=()) -> None:
+                self.send_response(status)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                if etag:
+                    self.send_header("ETag", etag)
+                for nome, valor in cabecalhos:
+                    self.send_header(nome, valor)
+                self.send_header("Content-Length", str(len(corpo)))
+                self.end_headers()
+                self.wfile.write(corpo)
+
+            def do_GET(self):
+                with servidor._trava:
+                    agora = time.monotonic()
+                    servidor.requisicoes += 1
+                    recusar = (servidor.limite_taxa is not None and
+                               sum(1 for t in servidor.instantes[-int(servidor.limite_taxa) - 1:]
+                                   if agora - t < 1.0) >= servidor.limite_taxa)
+                    falhar = servidor.falhar_proximas > 0
+                    if falhar:
+                        servidor.falhar_proximas -= 1
+                    if recusar:
+                        servidor.recusadas += 1
+                    else:
+                        servidor.instantes.append(agora)
+                    servidor.simultaneas += 1
+                    servidor.pico_simultaneas = max(servidor.pico_simultaneas, servidor.simultaneas)
+                try:
+                    if recusar:
+                        self._responder(429, b"<html><body>Too Many Requests</body></html>",
+                                        cabecalhos=[("Retry-After", str(servidor.retry_after))])
+                        return
+                    time.sleep(servidor.latencia)
+                    if falhar:
+                        self._responder(503, b"<html><body>Service Unavailable</body></html>")
+                        return
+                    rota = _ROTA.match(self.path)
+                    if not rota or "-".join(rota.groups()) in servidor.ausentes:
+                        self._responder(404, b"<html><body>Not found</body></html>")
+                    else:
+                        etag = f'"{hashlib.sha256(servidor.html).hexdigest()[:16]}"'
+                        if self.headers.get("If-None-Match") == etag:
+                            with servidor._trava:
+                                servidor.nao_modificadas += 1
+                            self._responder(304, b"", etag)
+                        else:
+                            self._responder(200, servidor.html, etag)
+                finally:
+                    with servidor._trava:
+                        servidor.simultaneas -= 1
+
+            def log_message(self, *args):
+                pass
+
+        return Handler